@@ -0,0 +1,71 @@
+"""
+AI ajan grafiği karşılaştırması: istek başına derleme vs süreç başına tek derleme.
+
+Eski akışta her soru build_app_graph ile StateGraph'ı kurup compile() ediyordu;
+şimdi derlenmiş graf paylaşılır ve executor config üzerinden verilir. LLM ve
+Oracle sahte (anında dönen) nesnelerle değiştirilir; ölçülen fark yalnız grafın
+kurulum/derleme maliyetidir.
+
+Çalıştırma (backend dizininden):
+    python -m benchmarks.bench_agent_graph
+"""
+import time
+
+import services.llm.graph as agent_graph
+from core.config import settings
+from services.llm.service import _config, _initial_state
+
+REPEAT = 200
+
+
+class _StubMessage:
+    content = '{"sql": "SELECT COUNT(CALISAN_ID) FROM IFSAPP.PERSONEL_ORG_AGACI_MV"}'
+
+
+class _StubLLM:
+    def invoke(self, messages):
+        return _StubMessage()
+
+
+class _StubExecutor:
+    def connect(self):
+        pass
+
+    def execute_query(self, sql_query, params=None):
+        return [{"COUNT": 4821}]
+
+    def close(self):
+        pass
+
+
+def _ms_per_call(fn):
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+    return best / REPEAT * 1000
+
+
+def main():
+    agent_graph.get_llm = lambda: _StubLLM()
+    # Soru→SQL cache'i açıkken ikinci turdan itibaren LLM düğümü atlanır; iki akış aynı işi yapmalı
+    settings.SQL_CACHE_ENABLED = False
+    inputs = _initial_state("Kaç aktif çalışan var?", "şema")
+    config = _config(_StubExecutor)
+    shared = agent_graph.get_app_graph()
+
+    build_ms = _ms_per_call(agent_graph.build_app_graph)
+    before_ms = _ms_per_call(lambda: agent_graph.build_app_graph().invoke(inputs, config=config))
+    after_ms = _ms_per_call(lambda: shared.invoke(inputs, config=config))
+
+    print(f"{'adım':<34}{'ms/istek':>10}")
+    print(f"{'graf kurulum + compile':<34}{build_ms:>10.3f}")
+    print(f"{'önce: derle + invoke':<34}{before_ms:>10.3f}")
+    print(f"{'sonra: paylaşılan graf invoke':<34}{after_ms:>10.3f}")
+    print(f"{'kazanç':<34}{before_ms - after_ms:>10.3f}  ({before_ms / after_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
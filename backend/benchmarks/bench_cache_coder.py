@@ -0,0 +1,95 @@
+"""
+Cache coder karşılaştırması: JsonCoder vs MsgpackCoder (msgpack + zstd).
+
+Dashboard endpoint'lerinin döndürdüğü satır yapısına benzeyen sentetik veriyle
+kodlama/çözme süresini ve Redis'e yazılacak boyutu ölçer.
+
+Çalıştırma (backend dizininden):
+    python -m benchmarks.bench_cache_coder
+"""
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from fastapi_cache.coder import JsonCoder
+
+from services.cache.coder import MsgpackCoder
+
+REPEAT = 5
+
+
+def _envelope(value):
+    # decorator.compute_and_store ile aynı zarf yapısı
+    return {"stored_at": time.time(), "expire": 300, "value": value}
+
+
+def kpi_payload():
+    return [{"TOTAL_EMPLOYEES": 4821, "AVG_AGE": 38.4, "FEMALE_RATIO": 41.2}]
+
+
+def grouped_payload(n=400):
+    rows = []
+    for i in range(n):
+        rows.append({
+            "POZISYON": f"POZISYON_{i % 80}",
+            "CINSIYET": random.choice(["Erkek", "Kadın"]),
+            "YAS_GRUBU": random.choice(["18-25", "26-35", "36-45", "46-55", "56+"]),
+            "SAYI": random.randint(1, 500),
+        })
+    return rows
+
+
+def dataset_payload(n=20000):
+    rows = []
+    base = datetime.datetime(2015, 1, 1)
+    for i in range(n):
+        rows.append({
+            "CALISAN_ID": str(100000 + i),
+            "AD_SOYAD": f"Personel {i}",
+            "DIREKTORLUK": f"Direktörlük {i % 12}",
+            "MUDURLUK": f"Müdürlük {i % 60}",
+            "POZISYON": f"Pozisyon {i % 150}",
+            "YAS": random.randint(20, 64),
+            "ISE_GIRIS_TARIHI": base + datetime.timedelta(days=i % 3650),
+            "MAAS_KATSAYI": Decimal(f"{random.uniform(1, 5):.4f}"),
+            "AKTIF_CALISAN": 1,
+        })
+    return rows
+
+
+def _json_safe(rows):
+    # JsonCoder Decimal/datetime'ı string'e çevirir; karşılaştırma aynı girdi üzerinden yapılır
+    return JsonCoder.decode(JsonCoder.encode(rows))
+
+
+def bench(coder, value):
+    best_enc = best_dec = float("inf")
+    raw = b""
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        raw = coder.encode(value)
+        t1 = time.perf_counter()
+        coder.decode(raw)
+        t2 = time.perf_counter()
+        best_enc = min(best_enc, t1 - t0)
+        best_dec = min(best_dec, t2 - t1)
+    return len(raw), best_enc * 1000, best_dec * 1000
+
+
+def main():
+    random.seed(42)
+    cases = [
+        ("kpi", kpi_payload()),
+        ("grouped (400 satır)", grouped_payload()),
+        ("dataset (20k satır)", dataset_payload()),
+    ]
+    print(f"{'payload':<22}{'coder':<14}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}")
+    for name, rows in cases:
+        for coder, value in ((JsonCoder, _json_safe(rows)), (MsgpackCoder, rows)):
+            size, enc, dec = bench(coder, _envelope(value))
+            print(f"{name:<22}{coder.__name__:<14}{size:>12}{enc:>12.2f}{dec:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
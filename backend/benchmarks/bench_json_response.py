@@ -0,0 +1,130 @@
+"""
+Yanıt serileştirme karşılaştırması: FastAPI varsayılan yolu vs GatewayJSONResponse.
+
+Varsayılan yol, handler'ın döndürdüğü değeri jsonable_encoder'dan (response_model
+varsa önce pydantic doğrulamasından) geçirip stdlib json ile yazar. Gateway yolu
+değeri doğrudan orjson'a verir; Decimal/datetime gibi Oracle tipleri aynı çıktıyı
+üretir. En büyük endpoint'lere benzeyen sentetik veriyle ölçülür.
+
+Çalıştırma (backend dizininden):
+    python -m benchmarks.bench_json_response
+"""
+import datetime
+import json
+import random
+import time
+from decimal import Decimal
+
+import oracledb
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.responses import GatewayJSONResponse
+from models.schemas import APIResponse
+from services.oracle import shape_result
+
+REPEAT = 5
+
+
+def grouped_payload(n=400):
+    # /api/age/position-gender benzeri group-by sonucu
+    rows = []
+    for i in range(n):
+        rows.append({
+            "POZISYON": f"POZISYON_{i % 80}",
+            "CINSIYET": random.choice(["ERKEK", "KADIN"]),
+            "SAYI": random.randint(1, 500),
+        })
+    return rows
+
+
+# /api/location/table/employee-list benzeri detay tablosu: cursor.description + satırlar (Oracle tipleriyle)
+EMPLOYEE_DESCRIPTION = [
+    ("CALISAN_ID", oracledb.DB_TYPE_VARCHAR),
+    ("AD_SOYAD", oracledb.DB_TYPE_VARCHAR),
+    ("DEPARTMAN_ADI", oracledb.DB_TYPE_VARCHAR),
+    ("POZISYON", oracledb.DB_TYPE_VARCHAR),
+    ("SEHIR", oracledb.DB_TYPE_VARCHAR),
+    ("YAS", oracledb.DB_TYPE_NUMBER),
+    ("ISE_GIRIS_TARIHI", oracledb.DB_TYPE_DATE),
+    ("CALISMA_SURESI", oracledb.DB_TYPE_NUMBER),
+]
+
+
+def employee_rows(n=20000):
+    rows = []
+    base = datetime.datetime(2015, 1, 1)
+    for i in range(n):
+        rows.append((
+            str(100000 + i),
+            f"Personel {i}",
+            f"Müdürlük {i % 60}",
+            f"Pozisyon {i % 150}",
+            random.choice(["ANKARA", "İSTANBUL", "İZMİR"]),
+            Decimal(random.randint(20, 64)),
+            base + datetime.timedelta(days=i % 3650),
+            Decimal(f"{random.uniform(0, 30):.2f}"),
+        ))
+    return rows
+
+
+def employee_list_payload(n=20000):
+    return shape_result(EMPLOYEE_DESCRIPTION, employee_rows(n))
+
+
+def columnar_payload(n=20000):
+    # ?format=columnar: endpoint'in döndürdüğü {"columns": [...], "data": [[kolon değerleri], ...]}
+    return shape_result(EMPLOYEE_DESCRIPTION, employee_rows(n), "columnar")
+
+
+def ask_ai_payload(n=5000):
+    return {
+        "user_question": "Şehirlere göre çalışan listesi",
+        "generated_sql": "SELECT ...",
+        "explanation": "LangGraph ajanı tarafından optimize edilerek çalıştırıldı.",
+        "data": employee_list_payload(n),
+    }
+
+
+def default_path(value, model=None):
+    if model is not None:
+        value = model(**value)
+    return JSONResponse(jsonable_encoder(value)).body
+
+
+def gateway_path(value, model=None):
+    return GatewayJSONResponse(value).body
+
+
+def bench(fn, value, model):
+    best = float("inf")
+    body = b""
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        body = fn(value, model)
+        best = min(best, time.perf_counter() - t0)
+    return body, best * 1000
+
+
+def main():
+    random.seed(42)
+    cases = [
+        ("grouped (400 satır)", grouped_payload(), None),
+        ("employee-list (20k)", employee_list_payload(), None),
+        ("columnar (20k)", columnar_payload(), None),
+        ("ask-ai (5k satır)", ask_ai_payload(), APIResponse),
+    ]
+    print(f"{'payload':<22}{'path':<10}{'bytes':>12}{'ms':>10}{'speedup':>10}")
+    for name, value, model in cases:
+        before, before_ms = bench(default_path, value, model)
+        after, after_ms = bench(gateway_path, value, model)
+        # Aynı JSON'u ürettiklerini doğrula (boşluk/escape farkları hariç). Pydantic
+        # Decimal'i string yazar; gateway dashboard endpoint'leri gibi sayı yazar
+        if model is None:
+            assert json.loads(before) == json.loads(after), name
+        print(f"{name:<22}{'default':<10}{len(before):>12}{before_ms:>10.2f}{'':>10}")
+        print(f"{name:<22}{'orjson':<10}{len(after):>12}{after_ms:>10.2f}{before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
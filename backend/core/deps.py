@@ -1,18 +1,43 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Literal
+
+from fastapi import Query
 
 from services.oracle import OracleService
 from services.db.base import QueryExecutor, SchemaProvider
+from services.db.schema import schema_provider
 
 
 def get_oracle_service() -> Generator[OracleService, None, None]:
+    # Bağlantı burada alınmaz; ilk execute_query çağrısında havuzdan çekilir
     svc = OracleService()
     try:
-        svc.connect()
         yield svc
     finally:
         svc.close()
 
 
+async def get_async_oracle_service(
+    result_format: Literal["rows", "columnar", "grafana"] = Query(
+        "rows",
+        alias="format",
+        description="rows: satır listesi, columnar: kolon bazlı, grafana: Grafana data frame",
+    ),
+) -> AsyncGenerator[OracleService, None]:
+    # Dashboard endpoint'leri için: sorgular event loop'u bloklamadan çalışır.
+    # @cache hit olursa handler hiç çalışmaz ve havuzdan bağlantı alınmaz.
+    # ?format= query string'in parçası olduğu için her format ayrı cache anahtarı alır.
+    svc = OracleService(result_format=result_format)
+    try:
+        yield svc
+    finally:
+        await svc.close_async()
+
+
+def get_schema_provider() -> SchemaProvider:
+    # Şema özeti önbellekten gelir; AI isteği LLM beklerken bağlantı tutmaz
+    return schema_provider
+
+
 def get_executor_factory():
     # Varsayılan olarak Oracle executor döndürür; ileride kolayca değiştirilebilir.
     return OracleService
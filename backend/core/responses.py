@@ -0,0 +1,41 @@
+import datetime
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# numpy skalerleri/dizileri (analitik motoru) ve int anahtarlı sözlükler doğrudan yazılır
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def json_default(value: Any) -> Any:
+    """
+    orjson'un yerel desteklemediği Oracle tipleri. NUMBER -> Decimal, FastAPI'nin
+    jsonable_encoder'ı ile aynı kuralla int/float'a çevrilir; DATE/TIMESTAMP
+    (datetime) orjson tarafından yerel yazılır, alt sınıfları (pd.Timestamp) buraya düşer.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=json_default, option=ORJSON_OPTIONS)
+
+
+class GatewayJSONResponse(ORJSONResponse):
+    """
+    Uygulamanın varsayılan yanıt sınıfı. Handler'ın döndürdüğü Response nesneleri
+    FastAPI'nin jsonable_encoder / response_model doğrulamasından geçmez; büyük
+    satır listeleri bu sınıfla doğrudan orjson'a verilir.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
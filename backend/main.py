@@ -2,8 +2,22 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routers import ai
 from routers import dashboard
+from routers import monitoring
 from core.errors import register_exception_handlers
-from services.oracle import init_pool, close_pool
+from core.responses import GatewayJSONResponse
+from services.oracle import init_pool, close_pool, init_async_pool, close_async_pool
+from services.cache import (
+    gateway_key_builder,
+    get_coder_class,
+    CacheStatsMiddleware,
+    mview_tracker,
+    cache_warmer,
+    invalidation_listener,
+    push_hub,
+)
+from services.analytics import stores, fusion_planner
+from services.llm.graph import get_app_graph, get_async_app_graph
+from core.config import settings
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
@@ -11,8 +25,9 @@ from redis import asyncio as aioredis
 # --- LIFESPAN: Uygulama Başlangıç/Bitiş Yönetimi ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 1. Oracle Havuzunu Başlat
+    # 1. Oracle Havuzlarını Başlat (senkron: AI ajanı, async: dashboard endpoint'leri)
     init_pool()
+    init_async_pool()
     
     # 2. Redis Cache'i Başlat
     # Docker içinde Redis servis adı 'redis' olduğu için host='redis'
@@ -21,24 +36,65 @@ async def lifespan(app: FastAPI):
         # fastapi-cache2'nin RedisBackend'i kendi encode/decode işlemini yapar
         # Bu sayede cache'den dönen değer her zaman bytes olur ve coder.decode() güvenli çalışır
         redis = aioredis.from_url("redis://redis:6379", encoding="utf8", decode_responses=False)
-        FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+        # Anahtar: route path + query + şema versiyonu (inject edilen bağımlılıklar hariç)
+        # Değerler msgpack + zstd ile saklanır (CACHE_CODER=json ile eski davranış)
+        FastAPICache.init(
+            RedisBackend(redis),
+            prefix="fastapi-cache",
+            coder=get_coder_class(settings.CACHE_CODER),
+            key_builder=gateway_key_builder,
+        )
+        # Diğer replikaların yazdığı anahtarları L1 cache'ten düşür
+        invalidation_listener.start()
         print("Redis Cache Başlatıldı.")
     except Exception as e:
         print(f"Redis başlatılamadı: {e}")
 
+    # 3. MV yenileme takibi (cache anahtarlarındaki versiyon)
+    mview_tracker.start()
+
+    # 4. MV'lerin bellekteki küp ve kolon bazlı snapshot'ları (group-by'lar Oracle'a gitmeden)
+    for store in stores:
+        store.start()
+
+    # 5. Sabit raporların cache'ini arka planda ısıt
+    if settings.CACHE_WARM_ENABLED:
+        cache_warmer.start(app)
+
+    # 6. SSE abonelerine MV yenilemesinde sonuçları it
+    push_hub.start(app)
+
+    # 7. AI ajan grafikleri bir kez derlenir; istekler derlenmiş grafı paylaşır
+    get_app_graph()
+    get_async_app_graph()
+
     yield
     
-    # 3. Kapanış İşlemleri
+    # 8. Kapanış İşlemleri
+    push_hub.stop()
+    await cache_warmer.stop()
+    for store in stores:
+        await store.stop()
+    await fusion_planner.stop()
+    await mview_tracker.stop()
+    await invalidation_listener.stop()
+    await close_async_pool()
     close_pool()
 
 app = FastAPI(
     title="Oracle AI Analytics Gateway",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson: Oracle NUMBER/DATE tipleri ve büyük satır listeleri stdlib json'dan hızlı yazılır
+    default_response_class=GatewayJSONResponse,
 )
 
 app.include_router(ai.router, prefix="/api", tags=["AI Chat"])
 app.include_router(dashboard.router, prefix="/api", tags=["Fixed Reports"])
+app.include_router(monitoring.router, prefix="/api", tags=["Monitoring"])
+
+# Cache hit/miss sayaçları (/api/monitoring/cache)
+app.add_middleware(CacheStatsMiddleware)
 
 register_exception_handlers(app)
 
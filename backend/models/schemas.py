@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 
 class UserQuestion(BaseModel):
@@ -17,4 +17,10 @@ class APIResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
 
-    detail: str
\ No newline at end of file
+    detail: str
+
+
+class BatchRequest(BaseModel):
+
+    # Tam route path'leri, query string dahil (ör. "/api/blood/distribution?format=grafana")
+    paths: List[str]
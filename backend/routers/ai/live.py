@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from models.schemas import UserQuestion, APIResponse
-from services.llm import run_agent
+from services.llm import arun_agent
 from services.logger import logger as audit_logger
-from core.deps import get_oracle_service, get_executor_factory
+from core.deps import get_schema_provider, get_executor_factory
+from core.responses import GatewayJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,10 +12,11 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+# async: LLM ve Oracle beklemeleri threadpool worker'ı değil coroutine tutar
 @router.post("/ask-ai", response_model=APIResponse)
-def ask_ai_endpoint(
+async def ask_ai_endpoint(
     request: UserQuestion,
-    oracle=Depends(get_oracle_service),
+    schema_provider=Depends(get_schema_provider),
     executor_factory=Depends(get_executor_factory),
 ):
     generated_sql = None
@@ -23,11 +26,11 @@ def ask_ai_endpoint(
     explanation = None
 
     try:
-        schema_info = oracle.get_schema_info()
+        schema_info = schema_provider.get_schema_info()
 
         logger.info(f"Kullanıcı Sorusu: {request.user_question}")
 
-        graph_result = run_agent(
+        graph_result = await arun_agent(
             request.user_question,
             schema_info,
             executor_factory=executor_factory,
@@ -43,16 +46,21 @@ def ask_ai_endpoint(
         if not generated_sql:
             raise ValueError("AI SQL üretemedi.")
 
-        explanation = "LangGraph ajanı tarafından optimize edilerek çalıştırıldı."
+        if graph_result.get("cached"):
+            explanation = "Daha önce başarıyla çalışmış SQL önbellekten kullanıldı (LLM atlandı)."
+        else:
+            explanation = "LangGraph ajanı tarafından optimize edilerek çalıştırıldı."
         success = True
         logger.info(f"Başarılı İşlem! SQL: {generated_sql}")
 
-        return APIResponse(
-            user_question=request.user_question,
-            generated_sql=generated_sql,
-            explanation=explanation,
-            data=data,
-        )
+        # response_model yalnızca dokümantasyon için: satırlar APIResponse doğrulamasına
+        # ve jsonable_encoder'a girmeden doğrudan serileştirilir
+        return GatewayJSONResponse({
+            "user_question": request.user_question,
+            "generated_sql": generated_sql,
+            "explanation": explanation,
+            "data": data,
+        })
 
     except Exception as e:
         error_msg = str(e)
@@ -61,7 +69,9 @@ def ask_ai_endpoint(
 
     finally:
         row_count = len(data) if isinstance(data, list) else 0
-        audit_logger.log_interaction(
+        # pymongo senkron: event loop'u bloklamasın
+        await run_in_threadpool(
+            audit_logger.log_interaction,
             user_question=request.user_question,
             sql_generated=generated_sql,
             success=success,
@@ -13,6 +13,8 @@ from routers.dashboard import (
     hr_training,
     deneme,
     dataset,
+    batch,
+    push,
 )
 
 # API key authentication tüm dashboard endpoint'leri için zorunlu
@@ -29,4 +31,6 @@ router.include_router(engagement.router)
 router.include_router(turnover.router)
 router.include_router(family.router)
 router.include_router(interns.router)
-router.include_router(hr_training.router)
\ No newline at end of file
+router.include_router(hr_training.router)
+router.include_router(batch.router)
+router.include_router(push.router)
\ No newline at end of file
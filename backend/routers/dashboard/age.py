@@ -1,145 +1,100 @@
-from fastapi import APIRouter, Depends
-from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter
+from services.cache import ORG_TREE_MV
+from services.analytics import (
+    AggregateQuery, Dimension, Measure, Order, Condition,
+    ACTIVE_STAFF, COUNT, BY_COUNT_DESC, register_metric,
+)
 
 # Endpoint prefix ve tag'i
 router = APIRouter(tags=["Age"])
 
+# Metrikler tanımlarından üretilir (services.analytics.metrics): SQL derlenir,
+# sonuç önce küpten / snapshot'tan, olmazsa Oracle'dan hesaplanır.
+
 # ----------------------------------------------------------------
 # 1. KPI KARTLARI
 # ----------------------------------------------------------------
 
-@router.get("/age/kpi-summary")
-@cache(expire=300)
-async def get_age_kpi_summary(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        -- 1. Ortalama Yaş
-        ROUND(AVG(YAS), 1) as "avg_age",
-        
-        -- 2. 15-18 Yaş
-        SUM(CASE WHEN YAS_ARALIGI = '15-18' THEN 1 ELSE 0 END) as "age_15_18",
-        
-        -- 3. 19-29 Yaş
-        SUM(CASE WHEN YAS_ARALIGI = '19-29' THEN 1 ELSE 0 END) as "age_19_29",
-        
-        -- 4. 30-39 Yaş
-        SUM(CASE WHEN YAS_ARALIGI = '30-39' THEN 1 ELSE 0 END) as "age_30_39",
-        
-        -- 5. 40-49 Yaş
-        SUM(CASE WHEN YAS_ARALIGI = '40-49' THEN 1 ELSE 0 END) as "age_40_49",
-        
-        -- 6. 50+ Yaş
-        SUM(CASE WHEN YAS_ARALIGI = '50+' THEN 1 ELSE 0 END) as "age_50_plus"
-
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1'
-      -- CTURS filtresi bazı sorgularda vardı, genele ekliyoruz:
-      AND CTURS = 1
-    """
-    return oracle.execute_query(sql)
+AGE_KPI = register_metric(router, "/age/kpi-summary", AggregateQuery(
+    ORG_TREE_MV,
+    measures=(
+        Measure("avg_age", "avg", "YAS", round=1),
+        Measure("age_15_18", "count_if", where=(Condition("YAS_ARALIGI", value="15-18"),)),
+        Measure("age_19_29", "count_if", where=(Condition("YAS_ARALIGI", value="19-29"),)),
+        Measure("age_30_39", "count_if", where=(Condition("YAS_ARALIGI", value="30-39"),)),
+        Measure("age_40_49", "count_if", where=(Condition("YAS_ARALIGI", value="40-49"),)),
+        Measure("age_50_plus", "count_if", where=(Condition("YAS_ARALIGI", value="50+"),)),
+    ),
+    filters=ACTIVE_STAFF,
+))
 
 # ----------------------------------------------------------------
 # 2. GRAFİKLER (PIE & HEATMAP)
 # ----------------------------------------------------------------
 
 # Metrik 9: Genel Yaş Dağılımı (Pie Chart)
-@router.get("/age/distribution")
-@cache(expire=300)
-async def get_age_distribution(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(YAS_ARALIGI, 'Bilinmiyor') as "age_group", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-    GROUP BY YAS_ARALIGI 
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+AGE_DIST = register_metric(router, "/age/distribution", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("YAS_ARALIGI", "age_group", default="Bilinmiyor"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # Metrik 8: Şirket Bazlı Yaş Heatmap
-@router.get("/age/company-heatmap")
-@cache(expire=300)
-async def get_company_age_heatmap(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", 
-        NVL(YAS_ARALIGI, 'Diğer') as "age_group", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-    GROUP BY SIRKET, YAS_ARALIGI 
-    ORDER BY SIRKET ASC, YAS_ARALIGI ASC
-    """
-    return oracle.execute_query(sql)
+COMPANY_AGE_HEATMAP = register_metric(router, "/age/company-heatmap", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("YAS_ARALIGI", "age_group", default="Diğer"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=(Order("company"), Order("age_group")),
+))
 
 # ----------------------------------------------------------------
 # 3. DETAYLI TABLOLAR
 # ----------------------------------------------------------------
 
 # Metrik 7: Yönetime Bağlı Birimler (Departman & Lokasyon)
-@router.get("/age/department-location")
-@cache(expire=300)
-async def get_table_dept_location(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        ISYERI_ADI as "location",
-        DEPARTMAN_ADI as "department",
-        NVL(YAS_ARALIGI, 'Bilinmiyor') as "age_group",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-    GROUP BY ISYERI_ADI, DEPARTMAN_ADI, YAS_ARALIGI
-    ORDER BY ISYERI_ADI, DEPARTMAN_ADI, YAS_ARALIGI DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+DEPT_LOCATION_AGE = register_metric(router, "/age/department-location", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("DEPARTMAN_ADI", "department"),
+        Dimension("YAS_ARALIGI", "age_group", default="Bilinmiyor"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=(Order("location"), Order("department"), Order("age_group", descending=True)),
+    limit=1000,
+))
 
 # Metrik 10: İşyeri ve Cinsiyet Bazlı
-@router.get("/age/location-gender")
-@cache(expire=300)
-async def get_table_location_gender(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        ISYERI_ADI as "location",
-        CINSIYET as "gender",
-        NVL(YAS_ARALIGI, 'Bilinmiyor') as "age_group",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-    GROUP BY ISYERI_ADI, CINSIYET, YAS_ARALIGI
-    ORDER BY ISYERI_ADI, YAS_ARALIGI ASC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+LOCATION_GENDER_AGE = register_metric(router, "/age/location-gender", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("CINSIYET", "gender"),
+        Dimension("YAS_ARALIGI", "age_group", default="Bilinmiyor"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=(Order("location"), Order("age_group")),
+    limit=1000,
+))
 
 # Metrik 11: Pozisyon ve Cinsiyet Bazlı
-@router.get("/age/position-gender")
-@cache(expire=300)
-async def get_table_position_gender(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(POZISYON, 'POZİSYON BİLGİSİ BOŞ') as "position",
-        NVL(YAS_ARALIGI, 'Bilinmiyor') as "age_group",
-        CINSIYET as "gender",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-    GROUP BY NVL(POZISYON, 'POZİSYON BİLGİSİ BOŞ'), YAS_ARALIGI, CINSIYET
-    ORDER BY POZISYON, YAS_ARALIGI DESC
-    FETCH FIRST 100000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
\ No newline at end of file
+POSITION_GENDER_AGE = register_metric(router, "/age/position-gender", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("POZISYON", "position", default="POZİSYON BİLGİSİ BOŞ"),
+        Dimension("YAS_ARALIGI", "age_group", default="Bilinmiyor"),
+        Dimension("CINSIYET", "gender"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=(Order("position"), Order("age_group", descending=True)),
+    limit=100000,
+))
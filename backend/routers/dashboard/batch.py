@@ -0,0 +1,14 @@
+from fastapi import APIRouter, HTTPException, Request
+from core.config import settings
+from models.schemas import BatchRequest
+from services.cache import resolve_batch
+
+router = APIRouter(tags=["Batch"])
+
+
+# Grafana panellerini tek istekte çöz: cache'tekiler tek MGET ile, kalanlar paralel hesaplanır
+@router.post("/dashboard/batch")
+async def run_dashboard_batch(body: BatchRequest, request: Request):
+    if len(body.paths) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"En fazla {settings.BATCH_MAX_ITEMS} path gönderilebilir")
+    return {"results": await resolve_batch(request.app, body.paths)}
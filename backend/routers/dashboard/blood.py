@@ -1,141 +1,99 @@
-from fastapi import APIRouter, Depends
-from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter
+from services.cache import ORG_TREE_MV
+from services.analytics import (
+    AggregateQuery, Dimension, Measure, Order, Condition,
+    ACTIVE_STAFF, COUNT, BY_COUNT_DESC, register_metric,
+)
 
 router = APIRouter(tags=["Blood"])
 
+# Metrikler tanımlarından üretilir (services.analytics.metrics): SQL derlenir,
+# sonuç önce küpten / snapshot'tan, olmazsa Oracle'dan hesaplanır.
+
 # ----------------------------------------------------------------
 # 1. KPI KARTLARI (TÜM STATLAR TEK SORGUDA)
 # ----------------------------------------------------------------
-@router.get("/blood/kpi-summary")
-@cache(expire=300)
-async def get_blood_kpi(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        -- Toplam Çalışan
-        COUNT(CALISAN_ID) as "total",
-        
-        -- Pozitif Gruplar
-        SUM(CASE WHEN KAN_GRUBU = 'A+' THEN 1 ELSE 0 END) as "a_pos",
-        SUM(CASE WHEN KAN_GRUBU = 'B+' THEN 1 ELSE 0 END) as "b_pos",
-        SUM(CASE WHEN KAN_GRUBU = 'AB+' THEN 1 ELSE 0 END) as "ab_pos",
-        SUM(CASE WHEN KAN_GRUBU = 'O+' THEN 1 ELSE 0 END) as "o_pos",
-        
-        -- Negatif Gruplar
-        SUM(CASE WHEN KAN_GRUBU = 'A-' THEN 1 ELSE 0 END) as "a_neg",
-        SUM(CASE WHEN KAN_GRUBU = 'B-' THEN 1 ELSE 0 END) as "b_neg",
-        SUM(CASE WHEN KAN_GRUBU = 'AB-' THEN 1 ELSE 0 END) as "ab_neg",
-        SUM(CASE WHEN KAN_GRUBU = 'O-' THEN 1 ELSE 0 END) as "o_neg",
-        
-        -- Bilgi Girilmemiş (Null veya Boş)
-        SUM(CASE WHEN KAN_GRUBU IS NULL OR KAN_GRUBU = 'BİLGİ GİRİLMEMİŞ!!' THEN 1 ELSE 0 END) as "unknown"
-        
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-    """
-    return oracle.execute_query(sql)
+BLOOD_KPI = register_metric(router, "/blood/kpi-summary", AggregateQuery(
+    ORG_TREE_MV,
+    measures=(
+        Measure("total"),
+        Measure("a_pos", "count_if", where=(Condition("KAN_GRUBU", value="A+"),)),
+        Measure("b_pos", "count_if", where=(Condition("KAN_GRUBU", value="B+"),)),
+        Measure("ab_pos", "count_if", where=(Condition("KAN_GRUBU", value="AB+"),)),
+        Measure("o_pos", "count_if", where=(Condition("KAN_GRUBU", value="O+"),)),
+        Measure("a_neg", "count_if", where=(Condition("KAN_GRUBU", value="A-"),)),
+        Measure("b_neg", "count_if", where=(Condition("KAN_GRUBU", value="B-"),)),
+        Measure("ab_neg", "count_if", where=(Condition("KAN_GRUBU", value="AB-"),)),
+        Measure("o_neg", "count_if", where=(Condition("KAN_GRUBU", value="O-"),)),
+        Measure("unknown", "count_if", where=(Condition("KAN_GRUBU", "in", ("BİLGİ GİRİLMEMİŞ!!",), include_null=True),)),
+    ),
+    filters=ACTIVE_STAFF,
+))
 
 # ----------------------------------------------------------------
 # 2. GRAFİKLER (Pie, Bar, Heatmap)
 # ----------------------------------------------------------------
 
 # Grafik 1: Kan Grubu Dağılımı (Pie Chart)
-@router.get("/blood/distribution")
-@cache(expire=300)
-async def get_blood_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(KAN_GRUBU, 'Bilinmiyor') as "blood_type", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-    GROUP BY KAN_GRUBU 
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+BLOOD_DIST = register_metric(router, "/blood/distribution", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("KAN_GRUBU", "blood_type", default="Bilinmiyor"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # Grafik 2: Cinsiyet Dağılımı (Bar Chart)
-@router.get("/blood/gender-distribution")
-@cache(expire=300)
-async def get_gender_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        CINSIYET as "gender", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-    GROUP BY CINSIYET
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+GENDER_DIST = register_metric(router, "/blood/gender-distribution", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("CINSIYET", "gender"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # Grafik 3: Kan Grubu ve Yaş Aralığı (Grouped Bar Chart)
-@router.get("/blood/age-distribution")
-@cache(expire=300)
-async def get_blood_age_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        KAN_GRUBU as "blood_type",
-        NVL(YAS_ARALIGI, 'Bilinmiyor') as "age_group",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-      -- GÜNCELLENEN KISIM: Hem boşlukları temizliyoruz hem de NULL kontrolü yapıyoruz
-      AND TRIM(KAN_GRUBU) <> 'BİLGİ GİRİLMEMİŞ!!' 
-      AND KAN_GRUBU IS NOT NULL
-    GROUP BY KAN_GRUBU, NVL(YAS_ARALIGI, 'Bilinmiyor')
-    ORDER BY "blood_type", "age_group"
-    """
-    return oracle.execute_query(sql)
+BLOOD_AGE_DIST = register_metric(router, "/blood/age-distribution", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("KAN_GRUBU", "blood_type"),
+        Dimension("YAS_ARALIGI", "age_group", default="Bilinmiyor"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF + (
+        Condition("KAN_GRUBU", "ne", "BİLGİ GİRİLMEMİŞ!!", trim=True),
+        Condition("KAN_GRUBU", "not_null"),
+    ),
+    order_by=(Order("blood_type"), Order("age_group")),
+))
 
 # Grafik 4: Şirket Bazlı Kan Grubu (Heatmap)
-@router.get("/blood/company-heatmap")
-@cache(expire=300)
-async def get_company_blood_heatmap(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company",
-        NVL(KAN_GRUBU, 'Bilinmiyor') as "blood_type",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-    GROUP BY SIRKET, NVL(KAN_GRUBU, 'Bilinmiyor')
-    ORDER BY SIRKET, "count" DESC
-    """
-    return oracle.execute_query(sql)
+COMPANY_BLOOD_HEATMAP = register_metric(router, "/blood/company-heatmap", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("KAN_GRUBU", "blood_type", default="Bilinmiyor"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=(Order("company"), Order("count", descending=True)),
+))
 
 # ----------------------------------------------------------------
 # 3. DETAYLI TABLO
 # ----------------------------------------------------------------
 
 # Tablo: İşyeri, Kan Grubu ve Cinsiyet Kırılımı
-@router.get("/blood/table-details")
-@cache(expire=300)
-async def get_blood_table(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company",
-        ISYERI_ADI as "location",
-        NVL(KAN_GRUBU, 'Bilinmiyor') as "blood_type",
-        CINSIYET as "gender",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-    GROUP BY SIRKET, ISYERI_ADI, KAN_GRUBU, CINSIYET
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
\ No newline at end of file
+BLOOD_TABLE = register_metric(router, "/blood/table-details", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("KAN_GRUBU", "blood_type", default="Bilinmiyor"),
+        Dimension("CINSIYET", "gender"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
@@ -1,16 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from services.streaming import stream_query
+from services.arrow import negotiate_binary_format, arrow_response, stream_arrow
+from core.deps import get_async_oracle_service
+from services.cache import cache
 
 router = APIRouter(tags=["Dataset"])
 
-
-@router.get("/dataset/full")
-@cache(expire=30) 
-async def get_full_dataset(oracle: OracleService = Depends(get_oracle_service)):
-
-    sql = """
+FULL_DATASET_SQL = """
     SELECT 
         t.*, 
         
@@ -22,7 +21,42 @@ async def get_full_dataset(oracle: OracleService = Depends(get_oracle_service)):
     WHERE t.DIREKTORLUK_REF = '1'
       AND t.AKTIF_CALISAN = 1 
       AND t.CTURS = 1
-      
+    """
+
+
+# MV versiyonuna bağlanmaz: DBMS_RANDOM kolonları her MV yenilemesinde değil,
+# kısa expire ile yenilenmeli
+@router.get("/dataset/full")
+@cache(expire=30)
+async def get_full_dataset(request: Request, oracle: OracleService = Depends(get_async_oracle_service)):
+
+    sql = FULL_DATASET_SQL + """
      FETCH FIRST 2000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
\ No newline at end of file
+    # Accept: application/vnd.apache.arrow.stream | application/vnd.apache.parquet
+    # ise satırlar Python nesnesine çevrilmeden Arrow üzerinden döner (cache'lenmez)
+    binary_format = negotiate_binary_format(request)
+    if binary_format:
+        return arrow_response(await oracle.fetch_arrow_async(sql), binary_format)
+    return await oracle.execute_query_async(sql)
+
+
+# Endpoint: /api/dataset/full/stream?format=ndjson|csv
+# Satır limiti yok; sonuç parti parti akar, cache'lenmez.
+# Accept ile Arrow IPC stream veya Parquet de istenebilir.
+@router.get("/dataset/full/stream")
+async def stream_full_dataset(
+    request: Request,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+):
+    binary_format = negotiate_binary_format(request)
+    if binary_format == "arrow":
+        return stream_arrow(FULL_DATASET_SQL)
+    if binary_format == "parquet":
+        # Parquet footer'ı sona yazıldığı için parça parça gönderilemez
+        oracle = OracleService()
+        try:
+            return arrow_response(await oracle.fetch_arrow_async(FULL_DATASET_SQL), "parquet")
+        finally:
+            await oracle.close_async()
+    return stream_query(FULL_DATASET_SQL, fmt, filename="dataset_full")
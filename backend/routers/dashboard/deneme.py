@@ -1,17 +1,14 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from services.streaming import stream_query
+from core.deps import get_async_oracle_service
+from services.cache import cache, ORG_TREE_MV
 
 router = APIRouter(tags=["Performance Test"])
 
-# Endpoint: /api/deneme/heavy-data
-@router.get("/deneme/heavy-data")
-@cache(expire=60)
-async def get_heavy_data_dump(oracle: OracleService = Depends(get_oracle_service)):
-    # t.* ifadesi tablodaki TÜM kolonları (Adres, TC, Telefon, Kodlar vb.) çeker.
-
-    sql = """
+HEAVY_DATA_SQL = """
     SELECT 
         t.*, 
         
@@ -26,4 +23,21 @@ async def get_heavy_data_dump(oracle: OracleService = Depends(get_oracle_service
       
     -- FETCH FIRST 200000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
\ No newline at end of file
+
+# Endpoint: /api/deneme/heavy-data
+@router.get("/deneme/heavy-data")
+@cache(expire=60, mviews=[ORG_TREE_MV])
+async def get_heavy_data_dump(oracle: OracleService = Depends(get_async_oracle_service)):
+    # t.* ifadesi tablodaki TÜM kolonları (Adres, TC, Telefon, Kodlar vb.) çeker.
+
+    sql = HEAVY_DATA_SQL
+    return await oracle.execute_query_async(sql)
+
+
+# Endpoint: /api/deneme/heavy-data/stream?format=ndjson|csv
+# Aynı dump'ı fetchmany partileriyle akıtır; bellek kullanımı satır sayısından bağımsız
+@router.get("/deneme/heavy-data/stream")
+async def stream_heavy_data_dump(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+):
+    return stream_query(HEAVY_DATA_SQL, fmt, filename="heavy_data")
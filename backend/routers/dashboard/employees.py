@@ -1,19 +1,26 @@
 from fastapi import APIRouter, Depends
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from core.deps import get_async_oracle_service
+from services.cache import cache, ORG_TREE_MV
+from services.analytics import (
+    AggregateQuery, Bucket, Dimension, Measure, Order, Condition,
+    ACTIVE_STAFF, COUNT, BY_COUNT_DESC, register_metric,
+)
 
 # Endpointlerin tag'i
 router = APIRouter(tags=["Employees"])
 
+# Metrikler tanımlarından üretilir (services.analytics.metrics): SQL derlenir,
+# sonuç önce küpten / snapshot'tan, olmazsa Oracle'dan hesaplanır.
+
 # ----------------------------------------------------------------
 # 1. KPI KARTLARI (ÖZET METRİKLER)
 # ----------------------------------------------------------------
 
 
 @router.get("/employees/kpi-summary")
-@cache(expire=300)
-async def get_kpi_summary(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV])
+async def get_kpi_summary(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         -- 1. Toplam Çalışan
@@ -48,291 +55,188 @@ async def get_kpi_summary(oracle: OracleService = Depends(get_oracle_service)):
     WHERE DIREKTORLUK_REF = '1' 
       AND CTURS = 1
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # ----------------------------------------------------------------
 # 2. GRAFİKLER VE DAĞILIMLAR
 # ----------------------------------------------------------------
 
 # Metrik 8: Pozisyonlara Göre Dağılım
-@router.get("/employees/distribution/position")
-@cache(expire=300)
-async def get_dist_position(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        POZISYON as "position", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY POZISYON 
-    ORDER BY "count" DESC
-    FETCH FIRST 100 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+POSITION_DIST = register_metric(router, "/employees/distribution/position", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("POZISYON", "position"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=100,
+))
 
 # Metrik 9 & 13: İşyeri Bazlı Dağılım
-@router.get("/employees/distribution/location")
-@cache(expire=300)
-async def get_dist_location(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        ISYERI_ADI as "location", 
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY ISYERI_ADI 
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+LOCATION_DIST = register_metric(router, "/employees/distribution/location", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("ISYERI_ADI", "location"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # Metrik 10 & 12: Şirket Bazlı Dağılım
-@router.get("/employees/distribution/company")
-@cache(expire=300)
-async def get_dist_company(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", 
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY SIRKET 
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+COMPANY_DIST = register_metric(router, "/employees/distribution/company", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("SIRKET", "company"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # EK Metrik: Yaka Dağılımı (Mavi/Beyaz)
-@router.get("/employees/distribution/collar")
-@cache(expire=300)
-async def get_dist_collar(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(GRUP_ACIKLAMA, 'Diğer') as "collar_type",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1
-    GROUP BY GRUP_ACIKLAMA
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+COLLAR_DIST = register_metric(router, "/employees/distribution/collar", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("GRUP_ACIKLAMA", "collar_type", default="Diğer"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # EK Metrik: Medeni Durum
-@router.get("/employees/distribution/marital")
-@cache(expire=300)
-async def get_dist_marital(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(MEDENI_DURUM, 'Bilinmiyor') as "status",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1
-    GROUP BY MEDENI_DURUM
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+MARITAL_DIST = register_metric(router, "/employees/distribution/marital", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("MEDENI_DURUM", "status", default="Bilinmiyor"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # EK Metrik: Çalışma Statüsü (Kadrolu/Sözleşmeli)
-@router.get("/employees/distribution/employment-status")
-@cache(expire=300)
-async def get_dist_employment_status(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(STATU, 'Diğer') as "status",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1
-    GROUP BY STATU
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+EMPLOYMENT_STATUS_DIST = register_metric(router, "/employees/distribution/employment-status", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("STATU", "status", default="Diğer"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # ----------------------------------------------------------------
 # 3. DETAYLI TABLOLAR (SEARCH BAR İÇERENLER)
 # ----------------------------------------------------------------
 
 # Metrik 7: İşyeri Bazlı Engelli Personel Detayı
-@router.get("/employees/details/disabled")
-@cache(expire=300)
-async def get_details_disabled(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        ISYERI_ADI as "location", 
-        DEPARTMAN_ADI as "department", 
-        POZISYON as "position", 
-        ENGEL_DERECESI as "disability_degree", 
-        CINSIYET as "gender", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND ENGELLI_PERSONEL = 1 
-      AND CTURS = 1 
-    GROUP BY ISYERI_ADI, DEPARTMAN_ADI, POZISYON, ENGEL_DERECESI, CINSIYET 
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+DISABLED_DETAILS = register_metric(router, "/employees/details/disabled", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("DEPARTMAN_ADI", "department"),
+        Dimension("POZISYON", "position"),
+        Dimension("ENGEL_DERECESI", "disability_degree"),
+        Dimension("CINSIYET", "gender"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF + (Condition("ENGELLI_PERSONEL", value=1),),
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
 
 # Metrik 11: Görev Yeri Bazlı Çalışanlar
-@router.get("/employees/details/duty-place")
-@cache(expire=300)
-async def get_details_duty_place(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(GOREV_YERI, 'GÖREV YERİ BİLGİSİ YOK') as "duty_place", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY NVL(GOREV_YERI, 'GÖREV YERİ BİLGİSİ YOK') 
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+DUTY_PLACE_DETAILS = register_metric(router, "/employees/details/duty-place", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("GOREV_YERI", "duty_place", default="GÖREV YERİ BİLGİSİ YOK"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
 
 # Metrik 14: Şirket ve Pozisyon Bazlı
-@router.get("/employees/details/company-position")
-@cache(expire=300)
-async def get_details_company_position(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", 
-        ISYERI_ADI as "location", 
-        NVL(POZISYON, 'POZISYON BİLGİSİ YOK') as "position", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY SIRKET, ISYERI_ADI, NVL(POZISYON, 'POZISYON BİLGİSİ YOK') 
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+COMPANY_POSITION_DETAILS = register_metric(router, "/employees/details/company-position", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("POZISYON", "position", default="POZISYON BİLGİSİ YOK"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
 
 # Metrik 15: Şirket, Cinsiyet ve Eğitim
-@router.get("/employees/details/demographics-basic")
-@cache(expire=300)
-async def get_details_demographics_basic(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", 
-        ISYERI_ADI as "location", 
-        NVL(EGITIM_DURUMU, 'EĞİTİM BİLGİSİ BOŞ') as "education", 
-        CINSIYET as "gender", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY SIRKET, ISYERI_ADI, NVL(EGITIM_DURUMU, 'EĞİTİM BİLGİSİ BOŞ'), CINSIYET 
-    ORDER BY SIRKET, "education" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+DEMOGRAPHICS_BASIC = register_metric(router, "/employees/details/demographics-basic", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("EGITIM_DURUMU", "education", default="EĞİTİM BİLGİSİ BOŞ"),
+        Dimension("CINSIYET", "gender"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=(Order("company"), Order("education", descending=True)),
+    limit=1000,
+))
 
 # Metrik 16: Şirket, Pozisyon, Cinsiyet ve Eğitim (En Detaylı)
-@router.get("/employees/details/demographics-full")
-@cache(expire=300)
-async def get_details_demographics_full(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", 
-        ISYERI_ADI as "location", 
-        NVL(POZISYON, 'POZISYON BİLGİSİ BOŞ') as "position", 
-        CINSIYET as "gender", 
-        NVL(EGITIM_DURUMU, 'EĞİTİM BİLGİSİ BOŞ') as "education", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTURS = 1 
-    GROUP BY SIRKET, ISYERI_ADI, NVL(POZISYON, 'POZISYON BİLGİSİ BOŞ'), CINSIYET, NVL(EGITIM_DURUMU, 'EĞİTİM BİLGİSİ BOŞ') 
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
-
+DEMOGRAPHICS_FULL = register_metric(router, "/employees/details/demographics-full", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("POZISYON", "position", default="POZISYON BİLGİSİ BOŞ"),
+        Dimension("CINSIYET", "gender"),
+        Dimension("EGITIM_DURUMU", "education", default="EĞİTİM BİLGİSİ BOŞ"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
+
+
+# Aşağıdaki raporlar taban filtre yerine sadece AKTIF_CALISAN = 1 kullanır (tüm direktörlükler)
+ACTIVE_ALL = (Condition("AKTIF_CALISAN", value=1),)
+ACTIVE_COUNT = Measure("value", "sum", "AKTIF_CALISAN")
+BY_VALUE_DESC = (Order("value", descending=True),)
+
+# YAS_ARALIGI boşsa YAS kolonundan hesaplanan aralık
+AGE_BUCKETS = (
+    Bucket("20 Altı", high=20),
+    Bucket("20-29 Yaş", 20, 30),
+    Bucket("30-39 Yaş", 30, 40),
+    Bucket("40-49 Yaş", 40, 50),
+    Bucket("50 Üzeri", low=50),
+)
 
 # --- RAPOR 1: DEPARTMAN DAĞILIMI ---
-@router.get("/employees/details/department-stats")
-@cache(expire=300) # 5 dakika cache
-async def get_department_stats(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        DEPARTMAN_ADI as "category", 
-        SUM(AKTIF_CALISAN) as "value"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1
-    GROUP BY DEPARTMAN_ADI
-    ORDER BY "value" DESC
-    FETCH FIRST 15 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
-
+DEPARTMENT_STATS = register_metric(router, "/employees/details/department-stats", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("DEPARTMAN_ADI", "category"),),
+    measures=(ACTIVE_COUNT,),
+    filters=ACTIVE_ALL,
+    order_by=BY_VALUE_DESC,
+    limit=15,
+))
 
 # --- RAPOR 3: YAŞ ARALIĞI ---
-@router.get("/employees/details/age-stats")
-@cache(expire=300)
-async def get_age_stats(oracle: OracleService = Depends(get_oracle_service)):
-    # YAS_ARALIGI kolonu doluysa onu kullanır, boşsa YAS kolonundan biz hesaplarız
-    sql = """
-    SELECT 
-        NVL(YAS_ARALIGI, 
-            CASE 
-                WHEN YAS < 20 THEN '20 Altı'
-                WHEN YAS BETWEEN 20 AND 29 THEN '20-29 Yaş'
-                WHEN YAS BETWEEN 30 AND 39 THEN '30-39 Yaş'
-                WHEN YAS BETWEEN 40 AND 49 THEN '40-49 Yaş'
-                WHEN YAS >= 50 THEN '50 Üzeri'
-                ELSE 'Bilinmiyor'
-            END
-        ) as "category",
-        SUM(AKTIF_CALISAN) as "value"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1
-    GROUP BY NVL(YAS_ARALIGI, 
-            CASE 
-                WHEN YAS < 20 THEN '20 Altı'
-                WHEN YAS BETWEEN 20 AND 29 THEN '20-29 Yaş'
-                WHEN YAS BETWEEN 30 AND 39 THEN '30-39 Yaş'
-                WHEN YAS BETWEEN 40 AND 49 THEN '40-49 Yaş'
-                WHEN YAS >= 50 THEN '50 Üzeri'
-                ELSE 'Bilinmiyor'
-            END)
-    ORDER BY "category"
-    """
-    return oracle.execute_query(sql)
-
-
+AGE_STATS = register_metric(router, "/employees/details/age-stats", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("YAS_ARALIGI", "category", default="Bilinmiyor", buckets=AGE_BUCKETS, bucket_column="YAS"),
+    ),
+    measures=(ACTIVE_COUNT,),
+    filters=ACTIVE_ALL,
+    order_by=(Order("category"),),
+))
 
 # --- RAPOR 5: İKAMET EDİLEN İL ---
-@router.get("/employees/details/city-stats")
-@cache(expire=300)
-async def get_city_stats(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(IKAMET_IL, 'Bilinmiyor') as "category",
-        SUM(AKTIF_CALISAN) as "value"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1
-    -- "BİLGİ GİRİLMEMİŞ!!" olan satırları hariç tutuyoruz:
-    AND IKAMET_IL <> 'BİLGİ GİRİLMEMİŞ!!' 
-    AND IKAMET_IL IS NOT NULL
-    GROUP BY IKAMET_IL
-    ORDER BY "value" DESC
-    FETCH FIRST 10 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
\ No newline at end of file
+CITY_STATS = register_metric(router, "/employees/details/city-stats", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("IKAMET_IL", "category", default="Bilinmiyor"),),
+    measures=(ACTIVE_COUNT,),
+    # "BİLGİ GİRİLMEMİŞ!!" olan satırları hariç tutuyoruz:
+    filters=ACTIVE_ALL + (
+        Condition("IKAMET_IL", "ne", "BİLGİ GİRİLMEMİŞ!!"),
+        Condition("IKAMET_IL", "not_null"),
+    ),
+    order_by=BY_VALUE_DESC,
+    limit=10,
+))
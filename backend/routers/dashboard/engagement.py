@@ -1,112 +1,80 @@
 from fastapi import APIRouter, Depends
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from core.deps import get_async_oracle_service
+from services.cache import cache, ENGAGEMENT_MV
+from services.analytics import (
+    AggregateQuery, Dimension, Measure, Order,
+    ENGAGEMENT_BASE, register_metric,
+)
 
 router = APIRouter(tags=["Engagement"])
 
+# Bağlılık MV'sindeki metrikler snapshot'tan, olmazsa derlenmiş SQL ile Oracle'dan hesaplanır
+ENGAGEMENT_MEASURES = (
+    Measure("avg_work_duration", "avg", "CALISMA_SURESI", default=0),
+    Measure("avg_leave_duration", "avg", "AYRILMA_SURESI", default=0),
+)
+BY_WORK_DURATION_DESC = (Order("avg_work_duration", descending=True),)
+
 # 1. KPI Kartları: Ortalama Süreler
-@router.get("/engagement/kpi-summary")
-@cache(expire=300)
-async def get_engagement_kpi(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        -- Ortalama Çalışma Süresi (Yıl/Ay cinsinden olabilir)
-        NVL(AVG(CALISMA_SURESI), 0) as "avg_work_duration",
-        
-        -- Ortalama Ayrılma Süresi
-        NVL(AVG(AYRILMA_SURESI), 0) as "avg_leave_duration"
-    FROM IFSAPP.PERSONEL_CALISAN_BAGLILIGI_MV
-    WHERE DIREKTORLUK_REF = '1'
-    """
-    return oracle.execute_query(sql)
+ENGAGEMENT_KPI = register_metric(router, "/engagement/kpi-summary", AggregateQuery(
+    ENGAGEMENT_MV,
+    measures=ENGAGEMENT_MEASURES,
+    filters=ENGAGEMENT_BASE,
+))
 
 # 2. Grafik: İşyerlerine Göre Bağlılık
-@router.get("/engagement/by-location")
-@cache(expire=300)
-async def get_engagement_by_location(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        ISYERI_ADI as "location",
-        NVL(AVG(CALISMA_SURESI), 0) as "avg_work_duration",
-        NVL(AVG(AYRILMA_SURESI), 0) as "avg_leave_duration"
-    FROM IFSAPP.PERSONEL_CALISAN_BAGLILIGI_MV
-    WHERE DIREKTORLUK_REF = '1'
-    GROUP BY ISYERI_ADI
-    ORDER BY "avg_work_duration" DESC
-    FETCH FIRST 100 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+ENGAGEMENT_BY_LOCATION = register_metric(router, "/engagement/by-location", AggregateQuery(
+    ENGAGEMENT_MV,
+    dimensions=(Dimension("ISYERI_ADI", "location"),),
+    measures=ENGAGEMENT_MEASURES,
+    filters=ENGAGEMENT_BASE,
+    order_by=BY_WORK_DURATION_DESC,
+    limit=100,
+))
 
 # 3. Grafik: Departmanlara Göre Bağlılık
-@router.get("/engagement/by-department")
-@cache(expire=300)
-async def get_engagement_by_department(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        DEPARTMAN_ADI as "department",
-        NVL(AVG(CALISMA_SURESI), 0) as "avg_work_duration",
-        NVL(AVG(AYRILMA_SURESI), 0) as "avg_leave_duration"
-    FROM IFSAPP.PERSONEL_CALISAN_BAGLILIGI_MV
-    WHERE DIREKTORLUK_REF = '1'
-    GROUP BY DEPARTMAN_ADI
-    ORDER BY "avg_work_duration" DESC
-    FETCH FIRST 100 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+ENGAGEMENT_BY_DEPARTMENT = register_metric(router, "/engagement/by-department", AggregateQuery(
+    ENGAGEMENT_MV,
+    dimensions=(Dimension("DEPARTMAN_ADI", "department"),),
+    measures=ENGAGEMENT_MEASURES,
+    filters=ENGAGEMENT_BASE,
+    order_by=BY_WORK_DURATION_DESC,
+    limit=100,
+))
 
 # 4. Grafik: Medeni Duruma Göre
-@router.get("/engagement/by-marital")
-@cache(expire=300)
-async def get_engagement_by_marital(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        MEDENI_DURUM as "status",
-        NVL(AVG(CALISMA_SURESI), 0) as "avg_work_duration",
-        NVL(AVG(AYRILMA_SURESI), 0) as "avg_leave_duration"
-    FROM IFSAPP.PERSONEL_CALISAN_BAGLILIGI_MV
-    WHERE DIREKTORLUK_REF = '1'
-    GROUP BY MEDENI_DURUM
-    ORDER BY "avg_work_duration" DESC
-    """
-    return oracle.execute_query(sql)
+ENGAGEMENT_BY_MARITAL = register_metric(router, "/engagement/by-marital", AggregateQuery(
+    ENGAGEMENT_MV,
+    dimensions=(Dimension("MEDENI_DURUM", "status"),),
+    measures=ENGAGEMENT_MEASURES,
+    filters=ENGAGEMENT_BASE,
+    order_by=BY_WORK_DURATION_DESC,
+))
 
 # 5. Grafik: Yaş Aralıklarına Göre
-@router.get("/engagement/by-age-group")
-@cache(expire=300)
-async def get_engagement_by_age(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        YAS_ARALIGI as "age_group",
-        NVL(AVG(CALISMA_SURESI), 0) as "avg_work_duration",
-        NVL(AVG(AYRILMA_SURESI), 0) as "avg_leave_duration"
-    FROM IFSAPP.PERSONEL_CALISAN_BAGLILIGI_MV
-    WHERE DIREKTORLUK_REF = '1'
-    GROUP BY YAS_ARALIGI
-    ORDER BY "avg_work_duration" DESC
-    """
-    return oracle.execute_query(sql)
+ENGAGEMENT_BY_AGE = register_metric(router, "/engagement/by-age-group", AggregateQuery(
+    ENGAGEMENT_MV,
+    dimensions=(Dimension("YAS_ARALIGI", "age_group"),),
+    measures=ENGAGEMENT_MEASURES,
+    filters=ENGAGEMENT_BASE,
+    order_by=BY_WORK_DURATION_DESC,
+))
 
 # 6. Grafik: Eğitim Durumuna Göre
-@router.get("/engagement/by-education")
-@cache(expire=300)
-async def get_engagement_by_education(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        EGITIM_DURUMU as "education",
-        NVL(AVG(CALISMA_SURESI), 0) as "avg_work_duration",
-        NVL(AVG(AYRILMA_SURESI), 0) as "avg_leave_duration"
-    FROM IFSAPP.PERSONEL_CALISAN_BAGLILIGI_MV
-    WHERE DIREKTORLUK_REF = '1'
-    GROUP BY EGITIM_DURUMU
-    ORDER BY "avg_work_duration" DESC
-    """
-    return oracle.execute_query(sql)
+ENGAGEMENT_BY_EDUCATION = register_metric(router, "/engagement/by-education", AggregateQuery(
+    ENGAGEMENT_MV,
+    dimensions=(Dimension("EGITIM_DURUMU", "education"),),
+    measures=ENGAGEMENT_MEASURES,
+    filters=ENGAGEMENT_BASE,
+    order_by=BY_WORK_DURATION_DESC,
+))
 
 # 7. Detay Tablosu: Personel Listesi
+# MV'de sicil kolonu yok: satır anahtarı kurum + kişi + pozisyon kolonlarından oluşur
 @router.get("/engagement/details-table")
-@cache(expire=300)
-async def get_engagement_details(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ENGAGEMENT_MV], row_key=("company", "location", "dept_code", "name", "position"))
+async def get_engagement_details(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         SIRKET as "company",
@@ -125,7 +93,7 @@ async def get_engagement_details(oracle: OracleService = Depends(get_oracle_serv
     ORDER BY CALISMA_SURESI DESC
     FETCH FIRST 5000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 
 
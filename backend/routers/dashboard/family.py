@@ -1,90 +1,56 @@
-from fastapi import APIRouter, Depends
-from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter
+from services.cache import ORG_TREE_MV
+from services.analytics import (
+    AggregateQuery, Dimension, Measure, Order, Condition,
+    ACTIVE_STAFF, COUNT, BY_COUNT_DESC, register_metric,
+)
 
 router = APIRouter(tags=["Family & Marital Status"])
 
+# Metrikler tanımlarından üretilir (services.analytics.metrics): SQL derlenir,
+# sonuç önce küpten / snapshot'tan, olmazsa Oracle'dan hesaplanır.
+
 # 1. KPI Kartları: Genel Sayılar (Çocuklu, Çocuksuz vb.)
-@router.get("/family/kpi-summary")
-@cache(expire=300)
-async def get_family_kpi(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        COUNT(CALISAN_ID) as "total_employees",
-        SUM(CASE WHEN COCUK_DURUMU = '1' THEN 1 ELSE 0 END) as "has_children",
-        SUM(CASE WHEN COCUK_DURUMU = '0' THEN 1 ELSE 0 END) as "no_children"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-    """
-    return oracle.execute_query(sql)
+FAMILY_KPI = register_metric(router, "/family/kpi-summary", AggregateQuery(
+    ORG_TREE_MV,
+    measures=(
+        Measure("total_employees"),
+        Measure("has_children", "count_if", where=(Condition("COCUK_DURUMU", value="1"),)),
+        Measure("no_children", "count_if", where=(Condition("COCUK_DURUMU", value="0"),)),
+    ),
+    filters=ACTIVE_STAFF,
+))
 
 # 2. Grafik: Medeni Durum Dağılımı (Sadece Bilinenler)
 # İsteğine uygun olarak sayı yerine Chart verisi hazırlıyoruz.
-@router.get("/family/distribution/marital-status")
-@cache(expire=300)
-async def get_marital_distribution(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        MEDENI_DURUM as "status",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-      AND MEDENI_DURUM IN ('EVLİ', 'BEKAR') -- Sadece bu ikisi istendi
-    GROUP BY MEDENI_DURUM
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+MARITAL_DIST = register_metric(router, "/family/distribution/marital-status", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("MEDENI_DURUM", "status"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF + (Condition("MEDENI_DURUM", "in", ("EVLİ", "BEKAR")),),
+    order_by=BY_COUNT_DESC,
+))
 
 # 3. Grafik: Cinsiyete Göre Medeni Durum
-@router.get("/family/distribution/gender-marital")
-@cache(expire=300)
-async def get_gender_marital_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        CINSIYET as "gender",
-        MEDENI_DURUM as "status",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1
-      AND MEDENI_DURUM IN ('EVLİ', 'BEKAR')
-    GROUP BY CINSIYET, MEDENI_DURUM
-    ORDER BY CINSIYET, "count" DESC
-    """
-    return oracle.execute_query(sql)
+GENDER_MARITAL_DIST = register_metric(router, "/family/distribution/gender-marital", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("CINSIYET", "gender"), Dimension("MEDENI_DURUM", "status"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF + (Condition("MEDENI_DURUM", "in", ("EVLİ", "BEKAR")),),
+    order_by=(Order("gender"), Order("count", descending=True)),
+))
 
 # 4. Grafik: Cinsiyete Göre Çocuk Durumu
-@router.get("/family/distribution/gender-children")
-@cache(expire=300)
-async def get_gender_children_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        CINSIYET as "gender", 
-        CASE 
-            WHEN COCUK_DURUMU = '1' THEN 'Çocuk Var'
-            WHEN COCUK_DURUMU = '0' THEN 'Çocuk Yok'
-            ELSE 'Bilinmiyor'
-        END AS "child_status", 
-        COUNT(CALISAN_ID) AS "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTURS = 1 
-    GROUP BY CINSIYET, 
-        CASE 
-            WHEN COCUK_DURUMU = '1' THEN 'Çocuk Var'
-            WHEN COCUK_DURUMU = '0' THEN 'Çocuk Yok'
-            ELSE 'Bilinmiyor'
-        END 
-    ORDER BY COUNT(CALISAN_ID) DESC
-    """
-    return oracle.execute_query(sql)
+GENDER_CHILDREN_DIST = register_metric(router, "/family/distribution/gender-children", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("CINSIYET", "gender"),
+        Dimension("COCUK_DURUMU", "child_status", default="Bilinmiyor", mapping=(("1", "Çocuk Var"), ("0", "Çocuk Yok"))),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 
 
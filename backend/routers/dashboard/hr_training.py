@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from core.deps import get_async_oracle_service
+from services.cache import cache
 
 router = APIRouter(tags=["HR Training"])
 
@@ -81,7 +81,7 @@ MAIN_DATA AS (
 # 1. KPI Kartları (Tek Sorguda Toplamalar)
 @router.get("/hr_training/kpi-summary")
 @cache(expire=300)
-async def get_training_kpi(oracle: OracleService = Depends(get_oracle_service)):
+async def get_training_kpi(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = BASE_TRAINING_CTE + """
     SELECT 
         -- 1. Toplam Katılımcı (Unique ID bazlı)
@@ -118,24 +118,24 @@ async def get_training_kpi(oracle: OracleService = Depends(get_oracle_service)):
 
     FROM MAIN_DATA
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 2. Eğitim İstatistikleri (Toplam Eğitim Sayısı vb.)
 @router.get("/hr_training/stats/counts")
 @cache(expire=300)
-async def get_training_counts(oracle: OracleService = Depends(get_oracle_service)):
+async def get_training_counts(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = BASE_TRAINING_CTE + """
     SELECT 
         COUNT(DISTINCT EGITIM_ID) as "total_trainings_count"
     FROM MAIN_DATA
     WHERE IPTAL_TARIHI IS NULL
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 3. Grafik: En Çok Verilen Eğitimler (Top 10)
 @router.get("/hr_training/charts/top-trainings")
 @cache(expire=300)
-async def get_top_trainings(oracle: OracleService = Depends(get_oracle_service)):
+async def get_top_trainings(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = BASE_TRAINING_CTE + """
     SELECT 
         EGITIM_ADI as "training_name",
@@ -146,12 +146,12 @@ async def get_top_trainings(oracle: OracleService = Depends(get_oracle_service))
     ORDER BY "count" DESC
     FETCH FIRST 10 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 4. Grafik: Aylara Göre Eğitim Sayısı
 @router.get("/hr_training/charts/monthly-trend")
 @cache(expire=300)
-async def get_monthly_training_trend(oracle: OracleService = Depends(get_oracle_service)):
+async def get_monthly_training_trend(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = BASE_TRAINING_CTE + """
     SELECT 
         TO_CHAR(TRUNC(EGITIM_BASLANGIC_TARIHI, 'MONTH'), 'YYYY-MM') as "month",
@@ -162,12 +162,12 @@ async def get_monthly_training_trend(oracle: OracleService = Depends(get_oracle_
     ORDER BY "month" DESC
     FETCH FIRST 24 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 5. Tablolar: Kırılımlar (Pozisyon, Departman, Kategori, Alan, Grup)
 @router.get("/hr_training/breakdown/{category}")
 @cache(expire=300)
-async def get_training_breakdown(category: str, oracle: OracleService = Depends(get_oracle_service)):
+async def get_training_breakdown(category: str, oracle: OracleService = Depends(get_async_oracle_service)):
     # Kategoriye göre dinamik kolon seçimi
     col_map = {
         "position": "KATILIMCI_UNVAN",
@@ -193,12 +193,12 @@ async def get_training_breakdown(category: str, oracle: OracleService = Depends(
     ORDER BY "participant_count" DESC
     FETCH FIRST 100 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 6. Liste: Eğitim Takvimi (Gelecek Eğitimler)
 @router.get("/hr_training/calendar")
 @cache(expire=300)
-async def get_training_calendar(oracle: OracleService = Depends(get_oracle_service)):
+async def get_training_calendar(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = BASE_TRAINING_CTE + """
     SELECT DISTINCT
         TRUNC(EGITIM_BASLANGIC_TARIHI) as "start_date",
@@ -212,12 +212,12 @@ async def get_training_calendar(oracle: OracleService = Depends(get_oracle_servi
     ORDER BY "start_date" ASC
     FETCH FIRST 50 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 7. Liste: Eğitim Almayan Personeller
 @router.get("/hr_training/no-training-list")
 @cache(expire=300)
-async def get_no_training_employees(oracle: OracleService = Depends(get_oracle_service)):
+async def get_no_training_employees(oracle: OracleService = Depends(get_async_oracle_service)):
     # Bu sorgu farklı bir mantıkta olduğu için CTE kullanmıyoruz, direkt view'den joinliyoruz
     sql = """
     SELECT 
@@ -235,12 +235,12 @@ async def get_no_training_employees(oracle: OracleService = Depends(get_oracle_s
     ORDER BY P.SIRKET, P.DEPARTMAN_ADI
     FETCH FIRST 1000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 7.1 Eğitim Almayan Personel Sayısı
 @router.get("/hr_training/no-training-count")
 @cache(expire=300)
-async def get_no_training_count(oracle: OracleService = Depends(get_oracle_service)):
+async def get_no_training_count(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT COUNT(DISTINCT P.CALISAN_ID) as "count"
     FROM PERSONEL_ORG_AGACI_MV P    
@@ -249,18 +249,18 @@ async def get_no_training_count(oracle: OracleService = Depends(get_oracle_servi
       AND P.DIREKTORLUK_REF = '1'
       AND P.AKTIF_CALISAN = 1
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 8. Full Detay Tablosu (Infinity Table için)
 @router.get("/hr_training/full-details")
 @cache(expire=300)
-async def get_full_training_details(oracle: OracleService = Depends(get_oracle_service)):
+async def get_full_training_details(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = BASE_TRAINING_CTE + """
     SELECT * FROM MAIN_DATA
     ORDER BY EGITIM_BASLANGIC_TARIHI DESC
     FETCH FIRST 2000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 
 
@@ -1,49 +1,42 @@
-from fastapi import APIRouter, Depends
-from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter
+from services.cache import ORG_TREE_MV
+from services.analytics import (
+    AggregateQuery, Dimension, Measure, Condition,
+    ORG_TREE_BASE, COUNT, BY_COUNT_DESC, register_metric,
+)
 
 router = APIRouter(tags=["Intern & Apprentice"])
 
+# Stajyer/çırak metrikleri de personel snapshot'ından hesaplanır (CTURS filtresi yok)
+
 # 1. KPI Kartları: Stajyer ve Çırak Sayıları
-@router.get("/intern/kpi-summary")
-@cache(expire=300)
-async def get_intern_kpi(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SUM(CASE WHEN CTUR = 'Stajyer' THEN 1 ELSE 0 END) as "intern_count",
-        SUM(CASE WHEN CTUR = 'Çırak' THEN 1 ELSE 0 END) as "apprentice_count",
-        COUNT(CALISAN_ID) as "total_students"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE AKTIF_CALISAN = 1 
-      AND DIREKTORLUK_REF = '1' 
-      AND CTUR IN ('Stajyer', 'Çırak')
-    """
-    return oracle.execute_query(sql)
+INTERN_KPI = register_metric(router, "/intern/kpi-summary", AggregateQuery(
+    ORG_TREE_MV,
+    measures=(
+        Measure("intern_count", "count_if", where=(Condition("CTUR", value="Stajyer"),)),
+        Measure("apprentice_count", "count_if", where=(Condition("CTUR", value="Çırak"),)),
+        Measure("total_students"),
+    ),
+    filters=ORG_TREE_BASE + (Condition("CTUR", "in", ("Stajyer", "Çırak")),),
+))
 
 # 2. Detaylı Tablo: İşyeri, Departman vb. Kırılımlı Liste
-@router.get("/intern/details-table")
-@cache(expire=300)
-async def get_intern_table(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        ISYERI_ADI as "location",
-        DEPARTMAN_ADI as "department",
-        CTUR as "type", -- Stajyer/Çırak
-        CINSIYET as "gender",
-        NVL(KAN_GRUBU, '-') as "blood_type",
-        YAS_ARALIGI as "age_group",
-        NVL(EGITIM_DURUMU, '-') as "education",
-        COUNT(CALISAN_ID) as "count"
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV
-    WHERE DIREKTORLUK_REF = '1' 
-      AND AKTIF_CALISAN = 1 
-      AND CTUR IN ('Stajyer', 'Çırak')
-    GROUP BY ISYERI_ADI, DEPARTMAN_ADI, CTUR, CINSIYET, KAN_GRUBU, YAS_ARALIGI, EGITIM_DURUMU
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+INTERN_TABLE = register_metric(router, "/intern/details-table", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("DEPARTMAN_ADI", "department"),
+        Dimension("CTUR", "type"),
+        Dimension("CINSIYET", "gender"),
+        Dimension("KAN_GRUBU", "blood_type", default="-"),
+        Dimension("YAS_ARALIGI", "age_group"),
+        Dimension("EGITIM_DURUMU", "education", default="-"),
+    ),
+    measures=(COUNT,),
+    filters=ORG_TREE_BASE + (Condition("CTUR", "in", ("Stajyer", "Çırak")),),
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
 
 
 
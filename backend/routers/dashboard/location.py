@@ -1,14 +1,21 @@
 from fastapi import APIRouter, Depends
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from core.deps import get_async_oracle_service
+from services.cache import cache, ORG_TREE_MV
+from services.analytics import (
+    AggregateQuery, Dimension,
+    ACTIVE_STAFF, COUNT, BY_COUNT_DESC, register_metric,
+)
 
 router = APIRouter(tags=["Location"])
 
+# Metrikler tanımlarından üretilir (services.analytics.metrics): SQL derlenir,
+# sonuç önce küpten / snapshot'tan, olmazsa Oracle'dan hesaplanır.
+
 # 1. Harita Verisi (İkamet İli - TR Kodlu)
 @router.get("/location/map/residence")
-@cache(expire=300)
-async def get_map_residence(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV])
+async def get_map_residence(oracle: OracleService = Depends(get_async_oracle_service)):
     # TR-XX kodları Geomap için gereklidir
     sql = """
     SELECT 
@@ -33,12 +40,12 @@ async def get_map_residence(oracle: OracleService = Depends(get_oracle_service))
     GROUP BY IKAMET_IL
     HAVING COUNT(CALISAN_ID) > 0
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 2. Harita Verisi (Görev İli - TR Kodlu)
 @router.get("/location/map/duty")
-@cache(expire=300)
-async def get_map_duty(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV])
+async def get_map_duty(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         CASE 
@@ -57,88 +64,73 @@ async def get_map_duty(oracle: OracleService = Depends(get_oracle_service)):
     GROUP BY SEHIR
     HAVING COUNT(CALISAN_ID) > 0
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 3. İkamet İli Dağılımı (Sütun Grafik & Tablo)
-@router.get("/location/residence-dist")
-@cache(expire=300)
-async def get_residence_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(IKAMET_IL, 'Bilinmiyor') as "province", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' AND AKTIF_CALISAN = 1 AND CTURS = 1 
-    GROUP BY IKAMET_IL 
-    ORDER BY "count" DESC
-    FETCH FIRST 100 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+RESIDENCE_DIST = register_metric(router, "/location/residence-dist", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("IKAMET_IL", "province", default="Bilinmiyor"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=100,
+))
 
 # 4. İşyeri Bazlı İkamet (Tablo)
-@router.get("/location/table/residence-company")
-@cache(expire=300)
-async def get_table_residence(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", ISYERI_ADI as "location", 
-        DEPARTMAN_ADI as "department", IKAMET_IL as "province", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' AND AKTIF_CALISAN = 1 AND CTURS = 1 
-    GROUP BY SIRKET, ISYERI_ADI, DEPARTMAN_ADI, IKAMET_IL 
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+RESIDENCE_COMPANY_TABLE = register_metric(router, "/location/table/residence-company", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("DEPARTMAN_ADI", "department"),
+        Dimension("IKAMET_IL", "province"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
 
 # 5. Görev Yeri Dağılımı (Sütun Grafik)
-@router.get("/location/duty-dist")
-@cache(expire=300)
-async def get_duty_dist(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        NVL(SEHIR, 'Bilinmiyor') as "city", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' AND AKTIF_CALISAN = 1 AND CTURS = 1 
-    GROUP BY SEHIR 
-    ORDER BY "count" DESC
-    """
-    return oracle.execute_query(sql)
+DUTY_DIST = register_metric(router, "/location/duty-dist", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(Dimension("SEHIR", "city", default="Bilinmiyor"),),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+))
 
 # 6. İşyeri Bazlı Görev Yeri (Tablo)
-@router.get("/location/table/duty-company")
-@cache(expire=300)
-async def get_table_duty(oracle: OracleService = Depends(get_oracle_service)):
-    sql = """
-    SELECT 
-        SIRKET as "company", ISYERI_ADI as "location", 
-        DEPARTMAN_ADI as "department", SEHIR as "city", 
-        COUNT(CALISAN_ID) as "count" 
-    FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
-    WHERE DIREKTORLUK_REF = '1' AND AKTIF_CALISAN = 1 AND CTURS = 1 
-    GROUP BY SIRKET, ISYERI_ADI, DEPARTMAN_ADI, SEHIR 
-    ORDER BY "count" DESC
-    FETCH FIRST 1000 ROWS ONLY
-    """
-    return oracle.execute_query(sql)
+DUTY_COMPANY_TABLE = register_metric(router, "/location/table/duty-company", AggregateQuery(
+    ORG_TREE_MV,
+    dimensions=(
+        Dimension("SIRKET", "company"),
+        Dimension("ISYERI_ADI", "location"),
+        Dimension("DEPARTMAN_ADI", "department"),
+        Dimension("SEHIR", "city"),
+    ),
+    measures=(COUNT,),
+    filters=ACTIVE_STAFF,
+    order_by=BY_COUNT_DESC,
+    limit=1000,
+))
 
 # 7. Büyük Çalışan Listesi (Full Tablo)
+# Satırlar sicil numarasıyla anahtarlanır: ?delta_from=<ETag> yalnız değişenleri döndürür
 @router.get("/location/table/employee-list")
-@cache(expire=300)
-async def get_employee_list(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV], row_key=("emp_id",))
+async def get_employee_list(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
-        SIRKET as "company", CALISAN_ADI as "name", ISYERI_ADI as "location", 
+        CALISAN_ID as "emp_id", SIRKET as "company", CALISAN_ADI as "name", ISYERI_ADI as "location", 
         DEPARTMAN_ADI as "department", POZISYON as "position", 
         SEHIR as "duty_city", IKAMET_IL as "residence_city", IKAMET_MAHALLE as "district"
     FROM IFSAPP.PERSONEL_ORG_AGACI_MV 
     WHERE DIREKTORLUK_REF = '1' AND AKTIF_CALISAN = 1 AND CTURS = 1
-    ORDER BY SIRKET, CALISAN_ADI
+    ORDER BY SIRKET, CALISAN_ADI, CALISAN_ID
     FETCH FIRST 5000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 
 
@@ -0,0 +1,32 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from services.cache import push_hub
+from services.cache.batch import match_route
+
+router = APIRouter(tags=["Push"])
+
+
+# Server-Sent Events: panel path'lerine abone ol, MV yenilendiğinde yeni sonuç itilir (poll gerekmez)
+@router.get("/dashboard/subscribe")
+async def subscribe_dashboard(
+    request: Request,
+    paths: List[str] = Query(..., alias="path", description="Tam route path'i, query string dahil (tekrarlanabilir)"),
+):
+    if len(paths) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"En fazla {settings.BATCH_MAX_ITEMS} path gönderilebilir")
+    # Route bulunamayan path'e abone olunursa hiçbir yenileme itilmez; baştan reddedilir
+    unknown = [path for path in paths if match_route(request.app, path)[0] is None]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cache'li dashboard endpoint'i bulunamadı: {', '.join(unknown)}")
+    if not push_hub.accepts():
+        raise HTTPException(status_code=503, detail="Abone sınırına ulaşıldı")
+    return StreamingResponse(
+        push_hub.stream(request.app, paths),
+        media_type="text/event-stream",
+        # Nginx gibi proxy'ler olayları tamponlamasın
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from core.deps import get_async_oracle_service
+from services.cache import cache, ORG_TREE_MV
 
 router = APIRouter(tags=["Blood"])
 
 # 1. KPI KARTLARI (Tüm Kan Grupları Tek Sorguda)
 @router.get("/blood/kpi-summary")
-@cache(expire=300)
-async def get_blood_kpi(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV])
+async def get_blood_kpi(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         COUNT(CALISAN_ID) as "total",
@@ -25,12 +25,12 @@ async def get_blood_kpi(oracle: OracleService = Depends(get_oracle_service)):
       AND DIREKTORLUK_REF = '1' 
       AND CTURS = 1
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 2. Kan Grubu Dağılımı (Pie Chart)
 @router.get("/blood/distribution")
-@cache(expire=300)
-async def get_blood_dist(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV])
+async def get_blood_dist(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         NVL(KAN_GRUBU, 'Bilinmiyor') as "blood_type", 
@@ -42,12 +42,12 @@ async def get_blood_dist(oracle: OracleService = Depends(get_oracle_service)):
     GROUP BY KAN_GRUBU 
     ORDER BY "count" DESC
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 3. Detaylı Tablo (İşyeri & Cinsiyet & Kan Grubu)
 @router.get("/blood/table-details")
-@cache(expire=300)
-async def get_blood_table(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MV])
+async def get_blood_table(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         SIRKET as "company",
@@ -63,7 +63,7 @@ async def get_blood_table(oracle: OracleService = Depends(get_oracle_service)):
     ORDER BY "count" DESC
     FETCH FIRST 1000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 
 
@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends
 from services.oracle import OracleService
-from core.deps import get_oracle_service
-from fastapi_cache.decorator import cache
+from core.deps import get_async_oracle_service
+from services.cache import cache, ORG_TREE_MONTHLY_MV
 
 router = APIRouter(tags=["Turnover"])
 
 # 1. Aylara Göre Hareket Grafiği (İşe Giriş / Çıkış / Bölüm Değişikliği)
 # Bu endpoint Metrik 1, 2, 3, 4 ve 6'yı TEK SEFERDE getirir.
 @router.get("/turnover/timeline")
-@cache(expire=300)
-async def get_turnover_timeline(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MONTHLY_MV])
+async def get_turnover_timeline(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         YILAY as "year_month",
@@ -21,12 +21,12 @@ async def get_turnover_timeline(oracle: OracleService = Depends(get_oracle_servi
     GROUP BY YILAY
     ORDER BY YILAY ASC
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 # 2. Detaylı Hareket Tablosu (Metrik 5)
 @router.get("/turnover/details")
-@cache(expire=300)
-async def get_turnover_details(oracle: OracleService = Depends(get_oracle_service)):
+@cache(expire=300, mviews=[ORG_TREE_MONTHLY_MV])
+async def get_turnover_details(oracle: OracleService = Depends(get_async_oracle_service)):
     sql = """
     SELECT 
         YILAY as "period",
@@ -46,6 +46,6 @@ async def get_turnover_details(oracle: OracleService = Depends(get_oracle_servic
     ORDER BY YILAY DESC, SIRKET
     FETCH FIRST 1000 ROWS ONLY
     """
-    return oracle.execute_query(sql)
+    return await oracle.execute_query_async(sql)
 
 
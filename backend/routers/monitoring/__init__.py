@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Depends
+from core.security import get_api_key
+from routers.monitoring import cache, analytics, ai
+
+router = APIRouter(dependencies=[Depends(get_api_key)])
+
+router.include_router(cache.router)
+router.include_router(analytics.router)
+router.include_router(ai.router)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from services.llm.sql_cache import sql_cache
+from services.llm.result_cache import ai_result_cache
+
+router = APIRouter(tags=["Monitoring"])
+
+
+# Soru -> SQL önbelleği: LLM'siz yanıtlanan soru oranı
+@router.get("/monitoring/ai/sql-cache")
+async def get_sql_cache_stats():
+    return sql_cache.snapshot()
+
+
+# AI SQL sonuç cache'i (Redis): isabet, yazılan ve boyut sınırını aşan sonuçlar
+@router.get("/monitoring/ai/result-cache")
+async def get_ai_result_cache_stats():
+    return ai_result_cache.snapshot()
+
+
+# Şema ya da prompt değiştiğinde önbellekteki SQL'leri elle boşalt
+@router.post("/monitoring/ai/sql-cache/clear")
+async def clear_sql_cache():
+    sql_cache.clear()
+    return sql_cache.snapshot()
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from services.analytics import stores, oracle_fallbacks, fusion_planner
+
+router = APIRouter(tags=["Monitoring"])
+
+
+# Bellekteki küp ve MV snapshot'ları: versiyon, boyut, buradan yanıtlanan sorgular;
+# Oracle'a düşen sorguların ne kadarının birleştirildiği
+@router.get("/monitoring/snapshots")
+async def get_snapshot_stats():
+    return {
+        "stores": [store.snapshot() for store in stores],
+        "oracle_fallbacks": oracle_fallbacks["count"],
+        "fusion": fusion_planner.snapshot(),
+    }
+
+
+# Küp ve snapshot'ları MV yenilemesini beklemeden yeniden yükle
+@router.post("/monitoring/snapshots/reload")
+async def reload_snapshots():
+    for store in stores:
+        await store.reload()
+    return await get_snapshot_stats()
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Request
+from services.cache import cache_stats, cache_warmer, local_cache, push_hub
+
+router = APIRouter(tags=["Monitoring"])
+
+
+# Endpoint bazında cache hit/miss sayaçları (bu replika için)
+@router.get("/monitoring/cache")
+async def get_cache_stats():
+    return cache_stats.snapshot()
+
+
+# L1 (süreç içi) / L2 (Redis) isabet oranları
+@router.get("/monitoring/cache/tiers")
+async def get_cache_tier_stats():
+    return local_cache.snapshot()
+
+
+@router.post("/monitoring/cache/reset")
+async def reset_cache_stats():
+    cache_stats.reset()
+    return {"status": "success"}
+
+
+# Son ısıtma turlarında endpoint bazında süre ve durum
+@router.get("/monitoring/cache/warmup")
+async def get_warmup_stats():
+    return cache_warmer.stats
+
+
+# SSE aboneleri: path başına abone sayısı ve gönderilen güncelleme sayısı
+@router.get("/monitoring/cache/push")
+async def get_push_stats():
+    return push_hub.snapshot()
+
+
+# Tüm sabit raporları şimdi yeniden hesapla (cache'teki girdinin ömrüne bakmadan)
+@router.post("/monitoring/cache/warmup")
+async def run_warmup(request: Request):
+    return await cache_warmer.warm(cache_warmer.targets(app=request.app), min_remaining=float("inf"))
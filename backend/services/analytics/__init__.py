@@ -0,0 +1,47 @@
+from .query import AggregateQuery, Bucket, Condition, Dimension, Measure, Order
+from .compiler import compile_sql
+from .snapshot import (
+    ColumnarSnapshot,
+    personnel_snapshot,
+    engagement_snapshot,
+    snapshots,
+    ORG_TREE_BASE,
+    ACTIVE_STAFF,
+    ENGAGEMENT_BASE,
+)
+from .cube import OlapCube, personnel_cube, cubes, PERSONNEL_DIMENSIONS
+from .fusion import FusionPlanner, fusion_planner
+from .routing import stores, register_query, answer_query, oracle_fallbacks
+from .metrics import Metric, metrics, register_metric, COUNT, BY_COUNT_DESC
+
+__all__ = [
+    "AggregateQuery",
+    "Bucket",
+    "Condition",
+    "Dimension",
+    "Measure",
+    "Order",
+    "compile_sql",
+    "ColumnarSnapshot",
+    "personnel_snapshot",
+    "engagement_snapshot",
+    "snapshots",
+    "OlapCube",
+    "personnel_cube",
+    "cubes",
+    "PERSONNEL_DIMENSIONS",
+    "FusionPlanner",
+    "fusion_planner",
+    "stores",
+    "register_query",
+    "answer_query",
+    "oracle_fallbacks",
+    "Metric",
+    "metrics",
+    "register_metric",
+    "COUNT",
+    "BY_COUNT_DESC",
+    "ORG_TREE_BASE",
+    "ACTIVE_STAFF",
+    "ENGAGEMENT_BASE",
+]
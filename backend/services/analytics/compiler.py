@@ -0,0 +1,136 @@
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core.config import settings
+from services.analytics.query import (
+    AggregateQuery,
+    Condition,
+    Dimension,
+    Measure,
+    ROWS,
+    primitive_name,
+)
+
+# AggregateQuery -> Oracle SQL. Filtre değerleri bind değişkeni olur; boyut
+# ifadelerindeki sabitler (NVL/CASE etiketleri) ise satır içine yazılır, çünkü
+# Oracle GROUP BY ifadesinin SELECT'teki ifadeyle birebir aynı olmasını ister.
+
+
+def literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return repr(value)
+
+
+def condition_sql(conditions: Iterable[Condition], binds: Dict[str, Any]) -> List[str]:
+    """Koşulları bind değişkenli SQL parçalarına çevirir; bind değerleri binds'e eklenir."""
+    parts = []
+    for cond in conditions:
+        column = f"TRIM({cond.column})" if cond.trim else cond.column
+        if cond.op == "not_null":
+            expr = f"{cond.column} IS NOT NULL"
+        elif cond.op == "in":
+            names = []
+            for value in cond.value:
+                name = f"b{len(binds)}"
+                binds[name] = value
+                names.append(f":{name}")
+            expr = f"{column} IN ({', '.join(names)})"
+        else:
+            name = f"b{len(binds)}"
+            binds[name] = cond.value
+            expr = f"{column} {'<>' if cond.op == 'ne' else '='} :{name}"
+        if cond.include_null:
+            expr = f"({cond.column} IS NULL OR {expr})"
+        parts.append(expr)
+    return parts
+
+
+def dimension_sql(dim: Dimension) -> str:
+    expr = dim.column
+    if dim.buckets:
+        whens = []
+        for bucket in dim.buckets:
+            bounds = []
+            if bucket.low is not None:
+                bounds.append(f"{dim.bucket_column} >= {literal(bucket.low)}")
+            if bucket.high is not None:
+                bounds.append(f"{dim.bucket_column} < {literal(bucket.high)}")
+            whens.append(f"WHEN {' AND '.join(bounds)} THEN {literal(bucket.label)}")
+        expr = f"NVL({expr}, CASE {' '.join(whens)} END)"
+    if dim.mapping:
+        whens = " ".join(f"WHEN {literal(k)} THEN {literal(v)}" for k, v in dim.mapping)
+        return f"CASE {expr} {whens} ELSE {literal(dim.default)} END"
+    if dim.default is not None:
+        return f"NVL({expr}, {literal(dim.default)})"
+    return expr
+
+
+def measure_sql(measure: Measure, binds: Dict[str, Any]) -> str:
+    if measure.func == "count_if":
+        expr = f"SUM(CASE WHEN {' AND '.join(condition_sql(measure.where, binds))} THEN 1 ELSE 0 END)"
+    else:
+        expr = f"{measure.func.upper()}({measure.column})"
+    if measure.round is not None:
+        expr = f"ROUND({expr}, {measure.round})"
+    if measure.default is not None:
+        expr = f"NVL({expr}, {literal(measure.default)})"
+    return expr
+
+
+def _where(filters: Iterable[Condition], binds: Dict[str, Any]) -> str:
+    return " AND ".join(condition_sql(filters, binds)) or "1 = 1"
+
+
+def compile_sql(query: AggregateQuery, owner: str = settings.MVIEW_OWNER) -> Tuple[str, Dict[str, Any]]:
+    """Sorgunun Oracle karşılığı; snapshot/küp yanıtlayamadığında çalıştırılır. Dönüş: (sql, binds)."""
+    binds: Dict[str, Any] = {}
+    dims = [dimension_sql(d) for d in query.dimensions]
+    select = [f'{expr} AS "{d.alias}"' for expr, d in zip(dims, query.dimensions)]
+    select += [f'{measure_sql(m, binds)} AS "{m.alias}"' for m in query.measures]
+    sql = f"""
+        SELECT {", ".join(select)}
+        FROM {owner}.{query.source}
+        WHERE {_where(query.filters, binds)}"""
+    if dims:
+        sql += f"""
+        GROUP BY {", ".join(dims)}"""
+    if query.order_by:
+        # Bellekteki motorla aynı: NULL'lar her iki yönde de sonda
+        order = ", ".join(f'"{o.alias}"{" DESC NULLS LAST" if o.descending else ""}' for o in query.order_by)
+        sql += f"""
+        ORDER BY {order}"""
+    if query.limit is not None:
+        sql += f"""
+        FETCH FIRST {int(query.limit)} ROWS ONLY"""
+    return sql, binds
+
+
+def grouping_sets_sql(
+    source: str,
+    filters: Iterable[Condition],
+    sets: Iterable[FrozenSet[str]],
+    primitives: Iterable[Tuple[str, str]],
+    binds: Dict[str, Any],
+    owner: Optional[str] = settings.MVIEW_OWNER,
+) -> Tuple[str, List[str]]:
+    """
+    Birden çok gruplamayı tek taramada hesaplayan GROUPING SETS sorgusu. Her satır
+    GID kolonundaki GROUPING_ID ile hangi kümeye ait olduğunu belirtir.
+    Dönüş: (sql, GROUPING_ID kolon sırası).
+    """
+    sets = sorted({frozenset(s) for s in sets}, key=lambda s: (len(s), sorted(s)))
+    columns = sorted(set().union(*sets))
+    select = [f"GROUPING_ID({', '.join(columns)}) AS GID" if columns else "0 AS GID", *columns]
+    select.append(f'COUNT(*) AS "{ROWS}"')
+    for func, column in sorted(set(primitives)):
+        select.append(f'{func.upper()}({column}) AS "{primitive_name(func, column)}"')
+    groups = ", ".join(f"({', '.join(sorted(s))})" for s in sets)
+    table = f"{owner}.{source}" if owner else source
+    return f"""
+        SELECT {", ".join(select)}
+        FROM {table}
+        WHERE {_where(filters, binds)}
+        GROUP BY GROUPING SETS ({groups})
+        """, columns
@@ -0,0 +1,130 @@
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import settings
+from services.oracle import OracleService
+from services.cache.mview import ORG_TREE_MV
+from services.analytics.query import AggregateQuery, Condition, grouping_columns, measure_primitives
+from services.analytics.compiler import grouping_sets_sql
+from services.analytics.engine import rollup, split_grouping_sets
+from services.analytics.snapshot import ACTIVE_STAFF
+from services.analytics.store import MViewStore
+
+logger = logging.getLogger(__name__)
+
+# Dashboard'ların kesitlediği personel boyutları; küp sadece bunlar üzerinden kurulur
+PERSONNEL_DIMENSIONS = (
+    "SIRKET",
+    "ISYERI_ADI",
+    "DEPARTMAN_ADI",
+    "POZISYON",
+    "CINSIYET",
+    "EGITIM_DURUMU",
+    "YAS_ARALIGI",
+    "MEDENI_DURUM",
+    "KAN_GRUBU",
+    "IKAMET_IL",
+)
+
+
+class OlapCube(MViewStore):
+    """
+    MV üzerinde ön-toplanmış küp. Register edilen sorguların ihtiyaç duyduğu
+    boyut kümeleri (cuboid) MV yenilemesi başına tek GROUPING SETS sorgusuyla
+    hesaplanır; her hücre COUNT(*), COUNT/SUM/MIN/MAX parçalarını tutar.
+    Sorgu, boyutlarını kapsayan en küçük cuboid'den roll-up ile yanıtlanır.
+    """
+
+    name = "cube"
+
+    def __init__(self, mview: str, base_filters: Sequence[Condition], dimensions: Sequence[str],
+                 owner: str = settings.MVIEW_OWNER):
+        super().__init__(mview, base_filters, settings.CUBE_ENABLED, owner)
+        self.dimensions = tuple(dimensions)
+        self._cuboids: Set[FrozenSet[str]] = set()
+        self._primitives: Set[Tuple[str, str]] = set()
+        self._cells: Dict[FrozenSet[str], Any] = {}
+        self._built_primitives: Set[Tuple[str, str]] = set()
+
+    def required(self, query: AggregateQuery) -> Optional[FrozenSet[str]]:
+        """Sorgunun hücrelerde görmesi gereken boyutlar; küpten yanıtlanamıyorsa None."""
+        if query.source != self.mview or not all(c in query.filters for c in self.base_filters):
+            return None
+        dims = grouping_columns(query, self.base_filters)
+        if not dims <= set(self.dimensions):
+            return None
+        return frozenset(dims)
+
+    def register(self, *queries: AggregateQuery) -> None:
+        for query in queries:
+            dims = self.required(query)
+            if dims is None:
+                continue
+            self._cuboids.add(dims)
+            for measure in query.measures:
+                self._primitives.update(measure_primitives(measure))
+
+    def nearest(self, query: AggregateQuery) -> Optional[FrozenSet[str]]:
+        """Sorguyu kapsayan en az hücreli cuboid."""
+        dims = self.required(query)
+        if dims is None:
+            return None
+        needed = {p for m in query.measures for p in measure_primitives(m)}
+        if not needed <= self._built_primitives:
+            return None
+        candidates = [c for c in self._cells if dims <= c]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda c: (len(self._cells[c]), len(c)))
+
+    async def build(self) -> Optional[int]:
+        if not self._cuboids:
+            return 0
+        primitives = set(self._primitives)
+        binds: Dict[str, Any] = {}
+        sql, columns = grouping_sets_sql(
+            self.mview, self.base_filters, self._cuboids, primitives, binds, self.owner
+        )
+        oracle = OracleService()
+        try:
+            table = await oracle.fetch_arrow_async(sql, binds)
+        finally:
+            await oracle.close_async()
+        if isinstance(table, dict):
+            logger.warning(f"Küp kurulamadı ({self.mview}): {table.get('error')}")
+            return None
+
+        frame = await run_in_threadpool(table.to_pandas, strings_to_categorical=True)
+        self._cells = await run_in_threadpool(split_grouping_sets, frame, columns, self._cuboids, primitives)
+        self._built_primitives = primitives
+        return sum(len(cells) for cells in self._cells.values())
+
+    async def evaluate(self, query: AggregateQuery) -> Optional[Tuple[List[str], List[List[Any]], List[str]]]:
+        """Sorguyu en yakın cuboid'den hesaplar; küp bayat veya sorguyu kapsamıyorsa None."""
+        if self.required(query) is None or not self.ensure_fresh():
+            return None
+        cuboid = self.nearest(query)
+        if cuboid is None:
+            return None
+        try:
+            result = await run_in_threadpool(rollup, self._cells[cuboid], query, self.base_filters)
+        except Exception as e:
+            logger.warning(f"Küp sorgu hatası ({self.mview}): {e}")
+            return None
+        self.hits += 1
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = super().snapshot()
+        stats.update({
+            "memory_bytes": sum(int(c.memory_usage(deep=True).sum()) for c in self._cells.values()),
+            "cuboids": {",".join(sorted(c)) or "()": len(cells) for c, cells in self._cells.items()},
+            "registered_cuboids": len(self._cuboids),
+        })
+        return stats
+
+
+personnel_cube = OlapCube(ORG_TREE_MV, ACTIVE_STAFF, PERSONNEL_DIMENSIONS)
+cubes = (personnel_cube,)
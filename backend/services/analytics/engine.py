@@ -0,0 +1,258 @@
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.analytics.query import (
+    AggregateQuery,
+    Bucket,
+    Condition,
+    Dimension,
+    Measure,
+    ROWS,
+    grouping_id,
+    primitive_name,
+)
+
+# AggregateQuery'yi bellekteki kolon bazlı çerçeve üzerinde vektörel olarak çalıştırır.
+# Semantik Oracle ile aynı tutulur: COUNT(kolon) NULL saymaz, NULL'lar da bir grup oluşturur.
+
+_AGG_FUNCS = {"count": "sum", "count_if": "sum", "sum": "sum", "avg": "mean", "min": "min", "max": "max"}
+
+
+def _is_categorical(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def _match(values: pd.Series, cond: Condition) -> pd.Series:
+    if cond.trim:
+        values = values.str.strip()
+    if cond.op == "in":
+        return values.isin(list(cond.value))
+    if cond.op == "ne":
+        return values.notna() & (values != cond.value)
+    return values == cond.value
+
+
+def condition_mask(frame: pd.DataFrame, cond: Condition) -> pd.Series:
+    series = frame[cond.column]
+    if cond.op == "not_null":
+        mask = series.notna()
+    elif _is_categorical(series):
+        # Koşul satır başına değil kategori başına bir kez değerlendirilir
+        categories = pd.Series(series.cat.categories)
+        mask = series.isin(categories[_match(categories, cond).to_numpy()])
+    else:
+        mask = _match(series, cond)
+    if cond.include_null:
+        mask = mask | series.isna()
+    return mask
+
+
+def _all_mask(frame: pd.DataFrame, conditions: Sequence[Condition]) -> pd.Series:
+    mask = pd.Series(True, index=frame.index)
+    for cond in conditions:
+        mask &= condition_mask(frame, cond)
+    return mask
+
+
+def _fill(series: pd.Series, value: Any) -> pd.Series:
+    if _is_categorical(series):
+        if value not in series.cat.categories:
+            series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def _bucket_values(series: pd.Series, buckets: Sequence[Bucket]) -> np.ndarray:
+    conditions = []
+    for bucket in buckets:
+        cond = np.ones(len(series), dtype=bool)
+        if bucket.low is not None:
+            cond &= (series >= bucket.low).to_numpy()
+        if bucket.high is not None:
+            cond &= (series < bucket.high).to_numpy()
+        conditions.append(cond)
+    return np.select(conditions, [b.label for b in buckets], default=None)
+
+
+def _dimension_values(frame: pd.DataFrame, dim: Dimension) -> pd.Series:
+    series = frame[dim.column]
+    if dim.buckets:
+        fallback = pd.Series(_bucket_values(frame[dim.bucket_column], dim.buckets), index=frame.index)
+        series = series.astype(object).where(series.notna(), fallback)
+    if dim.mapping:
+        series = series.map(dict(dim.mapping))
+        if not isinstance(series, pd.Series):
+            series = pd.Series(series, index=frame.index)
+    if dim.default is not None:
+        series = _fill(series, dim.default)
+    return series
+
+
+def _measure_input(frame: pd.DataFrame, measure: Measure) -> pd.Series:
+    if measure.func == "count":
+        return frame[measure.column].notna().astype(np.int64)
+    if measure.func == "count_if":
+        return _all_mask(frame, measure.where).astype(np.int64)
+    series = frame[measure.column]
+    if _is_categorical(series):
+        series = series.astype(object)
+    return series
+
+
+def _oracle_number(value: Any) -> Any:
+    # python-oracledb NUMBER'ı tam sayıysa int, değilse float döndürür; Oracle yolundaki
+    # yanıtla (ve ETag'iyle) birebir aynı olmak için 12.0 -> 12
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _to_list(series: pd.Series) -> List[Any]:
+    # numpy skalerlerini Python tiplerine, NaN'ı None'a çevirir (JSON / msgpack uyumu)
+    if series.dtype.kind in "iub":
+        return series.tolist()
+    series = series.astype(object)
+    return [_oracle_number(v) for v in series.where(series.notna(), None).tolist()]
+
+
+def _field_type(series: pd.Series) -> str:
+    return "number" if series.dtype.kind in "iuf" else "string"
+
+
+def _group(work: pd.DataFrame, keys: List[str], aggs: Dict[str, str]) -> pd.DataFrame:
+    # Oracle'da SUM yalnız NULL'lardan oluşan grupta NULL'dır; pandas 0 verir.
+    # Her toplam için NULL olmayan değer sayısı da toplanır, sıfırsa sonuç NULL yapılır
+    sums = [name for name, func in aggs.items() if func == "sum" and work[name].dtype.kind not in "iub"]
+    aggs = dict(aggs)
+    for name in sums:
+        work[f"{name}_nn"] = work[name].notna().astype(np.int64)
+        aggs[f"{name}_nn"] = "sum"
+    if keys:
+        result = work.groupby(keys, sort=False, dropna=False, observed=True).agg(aggs).reset_index()
+        # Sıralama kategori sırasına göre değil değere göre yapılmalı
+        for name in keys:
+            result[name] = result[name].astype(object)
+    else:
+        result = pd.DataFrame({name: [work[name].agg(func)] for name, func in aggs.items()})
+    for name in sums:
+        result[name] = result[name].where(result.pop(f"{name}_nn") > 0)
+    return result
+
+
+def _finish(result: pd.DataFrame, query: AggregateQuery) -> Tuple[List[str], List[List[Any]], List[str]]:
+    for i, measure in enumerate(query.measures):
+        name = f"_m{i}"
+        if measure.round is not None:
+            result[name] = result[name].round(measure.round)
+        if measure.default is not None:
+            result[name] = result[name].fillna(measure.default)
+
+    aliases = {f"_d{i}": d.alias for i, d in enumerate(query.dimensions)}
+    aliases.update({f"_m{i}": m.alias for i, m in enumerate(query.measures)})
+    result = result.rename(columns=aliases)
+
+    if query.order_by:
+        result = result.sort_values(
+            by=[o.alias for o in query.order_by],
+            ascending=[not o.descending for o in query.order_by],
+            kind="mergesort",
+            na_position="last",
+        )
+    if query.limit is not None:
+        result = result.head(query.limit)
+
+    ordered = [d.alias for d in query.dimensions] + [m.alias for m in query.measures]
+    return (
+        query.output_columns(),
+        [_to_list(result[alias]) for alias in ordered],
+        [_field_type(result[alias]) for alias in ordered],
+    )
+
+
+def _dimension_frame(frame: pd.DataFrame, query: AggregateQuery) -> Tuple[pd.DataFrame, List[str]]:
+    work = pd.DataFrame(index=frame.index)
+    keys = []
+    for i, dim in enumerate(query.dimensions):
+        name = f"_d{i}"
+        work[name] = _dimension_values(frame, dim)
+        keys.append(name)
+    return work, keys
+
+
+def evaluate(frame: pd.DataFrame, query: AggregateQuery, applied: Sequence[Condition] = ()) -> Tuple[List[str], List[List[Any]], List[str]]:
+    """
+    Sorguyu çerçeve üzerinde çalıştırır. applied: çerçeveye zaten uygulanmış
+    (snapshot yüklenirken) filtreler; tekrar değerlendirilmez.
+    Dönüş: (kolon adları, kolon bazlı değerler, Grafana alan tipleri).
+    """
+    pending = [c for c in query.filters if c not in applied]
+    if pending:
+        frame = frame[_all_mask(frame, pending)]
+
+    work, keys = _dimension_frame(frame, query)
+    aggs = {}
+    for i, measure in enumerate(query.measures):
+        name = f"_m{i}"
+        work[name] = _measure_input(frame, measure)
+        aggs[name] = _AGG_FUNCS[measure.func]
+
+    return _finish(_group(work, keys, aggs), query)
+
+
+def split_grouping_sets(
+    frame: pd.DataFrame,
+    columns: List[str],
+    sets: Iterable[FrozenSet[str]],
+    primitives: Iterable[Tuple[str, str]],
+) -> Dict[FrozenSet[str], pd.DataFrame]:
+    """GROUPING SETS sonucunu (GID kolonlu) küme başına hücre çerçevelerine ayırır."""
+    primitives = list(primitives)
+    counts = [ROWS] + [primitive_name(f, c) for f, c in primitives if f == "count"]
+    values = [primitive_name(f, c) for f, c in primitives if f != "count"]
+    for name in counts:
+        frame[name] = frame[name].fillna(0).astype(np.int64)
+    for name in values:
+        if _is_categorical(frame[name]):
+            # MIN/MAX metin kolonlarda: roll-up'ta değer sırasıyla karşılaştırılmalı
+            frame[name] = frame[name].astype(object)
+    cells = {}
+    for dims in sets:
+        part = frame[frame["GID"] == grouping_id(columns, dims)]
+        cells[dims] = part[sorted(dims) + counts + values].reset_index(drop=True)
+    return cells
+
+
+def rollup(cells: pd.DataFrame, query: AggregateQuery, applied: Sequence[Condition] = ()) -> Tuple[List[str], List[List[Any]], List[str]]:
+    """
+    Sorguyu daha ince bir cuboid'in hücrelerinden hesaplar: COUNT/SUM toplanır,
+    MIN/MAX'ın min/max'ı alınır, AVG = SUM / COUNT. Filtre ve count_if koşul
+    kolonları cuboid'in boyutları arasında olmalıdır. Dönüş evaluate ile aynıdır.
+    """
+    pending = [c for c in query.filters if c not in applied]
+    if pending:
+        cells = cells[_all_mask(cells, pending)]
+
+    work, keys = _dimension_frame(cells, query)
+    aggs = {}
+    for i, measure in enumerate(query.measures):
+        name = f"_m{i}"
+        if measure.func == "count_if":
+            work[name] = cells[ROWS].where(_all_mask(cells, measure.where), 0)
+            aggs[name] = "sum"
+        elif measure.func == "avg":
+            work[name] = cells[primitive_name("sum", measure.column)]
+            work[f"{name}_n"] = cells[primitive_name("count", measure.column)]
+            aggs[name] = "sum"
+            aggs[f"{name}_n"] = "sum"
+        else:
+            work[name] = cells[primitive_name(measure.func, measure.column)]
+            aggs[name] = "sum" if measure.func in ("count", "sum") else measure.func
+
+    result = _group(work, keys, aggs)
+    for i, measure in enumerate(query.measures):
+        name = f"_m{i}"
+        if measure.func == "avg":
+            counts = result.pop(f"{name}_n")
+            result[name] = (result[name] / counts).where(counts > 0)
+    return _finish(result, query)
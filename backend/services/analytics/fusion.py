@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import settings
+from services.oracle import OracleService
+from services.analytics.query import AggregateQuery, Condition, grouping_columns, measure_primitives
+from services.analytics.compiler import grouping_sets_sql
+from services.analytics.engine import rollup, split_grouping_sets
+
+logger = logging.getLogger(__name__)
+
+Result = Tuple[List[str], List[List[Any]], List[str]]
+FusionKey = Tuple[str, Tuple[Condition, ...]]
+
+
+class _Pending(NamedTuple):
+    query: AggregateQuery
+    dims: FrozenSet[str]
+    future: asyncio.Future
+
+
+class FusionPlanner:
+    """
+    Oracle'da çalışacak sorguları kısa bir pencere boyunca bekletir. Aynı MV ve
+    aynı filtreyi paylaşan sorgular tek GROUPING SETS sorgusunda birleşir; sonuç
+    GROUPING_ID ile kümelere ayrılıp her sorgu kendi kümesinden roll-up ile
+    hesaplanır. Pencerede tek sorgu kalırsa ya da birleşik sorgu hata verirse
+    her istek kendi SQL'ini çalıştırır.
+
+    Pencere yalnız aynı anahtarda yakın zamanda (son pencere içinde) başka sorgu
+    geldiyse açılır: tek başına gelen istek beklemeden kendi SQL'ini çalıştırır,
+    dashboard yüklemesi gibi ani yığılmalarda ilk sorgudan sonrakiler birleşir.
+    """
+
+    def __init__(self, window_ms: int = settings.FUSION_WINDOW_MS, owner: str = settings.MVIEW_OWNER):
+        self.window = window_ms / 1000
+        self.owner = owner
+        self._pending: Dict[FusionKey, List[_Pending]] = {}
+        self._last_seen: Dict[FusionKey, float] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.fused_queries = 0
+        self.solo_queries = 0
+        self.failures = 0
+
+    def _recent(self, key: FusionKey, now: float) -> bool:
+        """Bu anahtarda son pencere içinde başka sorgu geldi mi (yığılma var mı)?"""
+        last = self._last_seen.get(key)
+        self._last_seen[key] = now
+        if len(self._last_seen) > 1024:
+            self._last_seen = {k: t for k, t in self._last_seen.items() if now - t <= self.window}
+        return last is not None and now - last <= self.window
+
+    async def submit(self, query: AggregateQuery) -> Optional[Result]:
+        """Sorguyu bekleyen gruba ekler; birleşik sorgudan hesaplanamazsa None döner."""
+        if self.window <= 0:
+            return None
+        loop = asyncio.get_running_loop()
+        key = (query.source, query.filters)
+        batch = self._pending.get(key)
+        recent = self._recent(key, loop.time())
+        if batch is None:
+            if not recent:
+                self.solo_queries += 1
+                return None
+            batch = self._pending[key] = []
+            # Event loop görevlere zayıf referans tutar; çöpe gidip bekleyenleri asmasın
+            task = asyncio.create_task(self._flush(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        future = loop.create_future()
+        batch.append(_Pending(query, grouping_columns(query, query.filters), future))
+        return await future
+
+    async def _flush(self, key: FusionKey) -> None:
+        results: Dict[int, Optional[Result]] = {}
+        batch: List[_Pending] = []
+        try:
+            await asyncio.sleep(self.window)
+            batch = self._pending.pop(key)
+            if len(batch) > 1:
+                try:
+                    results = await self._execute(key, batch)
+                except Exception as e:
+                    self.failures += 1
+                    logger.warning(f"Birleşik sorgu hatası ({key[0]}): {e}")
+        finally:
+            # İptalde (kapanış) de bekleyen istekler serbest kalır ve kendi SQL'ine döner
+            for i, item in enumerate(batch or self._pending.pop(key, [])):
+                if not item.future.done():
+                    item.future.set_result(results.get(i))
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _execute(self, key: FusionKey, batch: List[_Pending]) -> Dict[int, Optional[Result]]:
+        source, filters = key
+        sets = {item.dims for item in batch}
+        primitives = {p for item in batch for m in item.query.measures for p in measure_primitives(m)}
+        binds: Dict[str, Any] = {}
+        sql, columns = grouping_sets_sql(source, filters, sets, primitives, binds, self.owner)
+
+        oracle = OracleService()
+        try:
+            table = await oracle.fetch_arrow_async(sql, binds)
+        finally:
+            await oracle.close_async()
+        if isinstance(table, dict):
+            raise RuntimeError(table.get("error"))
+
+        def _demux() -> Dict[int, Result]:
+            frame = table.to_pandas(strings_to_categorical=True)
+            cells = split_grouping_sets(frame, columns, sets, primitives)
+            return {i: rollup(cells[item.dims], item.query, filters) for i, item in enumerate(batch)}
+
+        results = await run_in_threadpool(_demux)
+        self.batches += 1
+        self.fused_queries += len(batch)
+        return results
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "window_ms": int(self.window * 1000),
+            "batches": self.batches,
+            "fused_queries": self.fused_queries,
+            # Birleşik sorgu olmasa çalışacak Oracle sorgusu sayısı farkı
+            "statements_saved": self.fused_queries - self.batches,
+            # Yığılma olmadığı için pencere beklemeden doğrudan Oracle'a giden sorgular
+            "solo_queries": self.solo_queries,
+            "failures": self.failures,
+            "pending": sum(len(b) for b in self._pending.values()),
+        }
+
+
+fusion_planner = FusionPlanner()
@@ -0,0 +1,44 @@
+import re
+from typing import Any, Dict, NamedTuple
+
+from fastapi import APIRouter, Depends
+
+from core.deps import get_async_oracle_service
+from services.oracle import OracleService
+from services.cache.decorator import cache
+from services.analytics.query import AggregateQuery, Measure, Order
+from services.analytics.compiler import compile_sql
+from services.analytics.routing import register_query, answer_query
+
+# Routerlarda tekrar eden ölçü ve sıralamalar
+COUNT = Measure("count")
+BY_COUNT_DESC = (Order("count", descending=True),)
+
+
+class Metric(NamedTuple):
+    path: str
+    query: AggregateQuery
+    sql: str
+    binds: Dict[str, Any]
+
+
+# Router path'i -> metrik tanımı (derlenmiş SQL ile birlikte)
+metrics: Dict[str, Metric] = {}
+
+
+def register_metric(router: APIRouter, path: str, query: AggregateQuery, expire: int = 300) -> AggregateQuery:
+    """
+    Sorgu tanımından GET endpoint'i üretir: MV versiyonlu cache, küp/snapshot
+    yönlendirmesi ve gerektiğinde Oracle'da çalışacak derlenmiş SQL.
+    Handler adı path'ten türetilir (/blood/distribution -> get_blood_distribution).
+    """
+    register_query(query)
+    sql, binds = compile_sql(query)
+
+    async def endpoint(oracle: OracleService = Depends(get_async_oracle_service)):
+        return await answer_query(query, oracle, sql, binds)
+
+    endpoint.__name__ = endpoint.__qualname__ = "get_" + re.sub(r"\W+", "_", path.strip("/"))
+    router.get(path)(cache(expire=expire, mviews=[query.source])(endpoint))
+    metrics[path] = Metric(path, query, sql, binds)
+    return query
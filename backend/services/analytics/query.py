@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Dashboard sorgularının yapısal tanımı: aynı MV üzerinde taban filtre + GROUP BY +
+# COUNT/SUM/AVG kalıbındaki sorgular SQL string'i yerine bu nesnelerle ifade edilir.
+# Böylece sonuç Oracle'a gitmeden bellekteki snapshot'tan da hesaplanabilir.
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    Tek kolonlu filtre. op:
+      eq       -> KOLON = value
+      ne       -> KOLON <> value   (NULL'lar elenir)
+      in       -> KOLON IN (value...)
+      not_null -> KOLON IS NOT NULL
+    trim=True ise karşılaştırma TRIM(KOLON) üzerinden yapılır.
+    include_null=True ise koşul "KOLON IS NULL OR ..." olarak genişler.
+    """
+
+    column: str
+    op: str = "eq"
+    value: Any = None
+    include_null: bool = False
+    trim: bool = False
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """Sayısal kolon aralığı: low <= KOLON < high (None: o uç açık)."""
+
+    label: str
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """
+    GROUP BY kolonu. default verilirse NVL(KOLON, default); mapping verilirse
+    CASE WHEN KOLON = k THEN v ... ELSE default END olarak gruplanır.
+    buckets verilirse KOLON NULL olan satırlar bucket_column'un düştüğü aralığın
+    etiketini alır (NVL(KOLON, CASE WHEN ... END)); mapping/default bundan sonra uygulanır.
+    """
+
+    column: str
+    alias: str
+    default: Optional[str] = None
+    mapping: Tuple[Tuple[Any, str], ...] = ()
+    buckets: Tuple[Bucket, ...] = ()
+    bucket_column: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Measure:
+    """
+    Toplama ifadesi. func:
+      count    -> COUNT(column)
+      count_if -> SUM(CASE WHEN <where> THEN 1 ELSE 0 END)
+      sum / avg / min / max -> SUM(column) ...
+    round -> ROUND(..., n), default -> NVL(..., default)
+    """
+
+    alias: str
+    func: str = "count"
+    column: Optional[str] = "CALISAN_ID"
+    where: Tuple[Condition, ...] = ()
+    round: Optional[int] = None
+    default: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Order:
+    alias: str
+    descending: bool = False
+
+
+@dataclass(frozen=True)
+class AggregateQuery:
+    source: str
+    dimensions: Tuple[Dimension, ...] = ()
+    measures: Tuple[Measure, ...] = ()
+    filters: Tuple[Condition, ...] = ()
+    order_by: Tuple[Order, ...] = ()
+    limit: Optional[int] = None
+
+    def columns(self) -> Set[str]:
+        """Sorgunun okuduğu kaynak kolonlar."""
+        cols = {c.column for c in self.filters}
+        cols.update(d.column for d in self.dimensions)
+        cols.update(d.bucket_column for d in self.dimensions if d.buckets)
+        for m in self.measures:
+            if m.column:
+                cols.add(m.column)
+            cols.update(c.column for c in m.where)
+        return cols
+
+    def output_columns(self) -> List[str]:
+        # OracleService kolon adlarını büyük harfe çevirdiği için aynı isimler üretilir
+        return [d.alias.upper() for d in self.dimensions] + [m.alias.upper() for m in self.measures]
+
+
+# --- Ön-toplama parçaları (küp hücreleri) ---
+# Ölçüler hücrelerde birleştirilebilir parçalar olarak tutulur: ROWS = COUNT(*),
+# COUNT__X = COUNT(X), SUM__X, MIN__X, MAX__X. AVG = SUM / COUNT olarak geri kurulur.
+
+ROWS = "ROWS"
+
+
+def primitive_name(func: str, column: str) -> str:
+    return f"{func.upper()}__{column}"
+
+
+def measure_primitives(measure: Measure) -> List[Tuple[str, str]]:
+    """Ölçüyü hücrelerden yeniden kurmak için gereken (func, kolon) parçaları; count_if ROWS'tan kurulur."""
+    if measure.func == "avg":
+        return [("sum", measure.column), ("count", measure.column)]
+    if measure.func == "count_if":
+        return []
+    return [(measure.func, measure.column)]
+
+
+def grouping_columns(query: AggregateQuery, applied: Iterable[Condition] = ()) -> FrozenSet[str]:
+    """
+    Sorguyu hücrelerden (roll-up) hesaplamak için gruplanması gereken ham kolonlar:
+    boyutlar, bucket kolonları, count_if koşulları ve applied dışındaki filtreler.
+    """
+    applied = tuple(applied)
+    cols = {d.column for d in query.dimensions}
+    cols.update(d.bucket_column for d in query.dimensions if d.buckets)
+    cols.update(c.column for c in query.filters if c not in applied)
+    for measure in query.measures:
+        cols.update(c.column for c in measure.where)
+    return frozenset(cols)
+
+
+def grouping_id(columns: List[str], dims: Iterable[str]) -> int:
+    """GROUPING_ID(columns...) değeri: grupta olmayan (toplanmış) kolonun biti 1, ilk kolon en yüksek bit."""
+    dims = set(dims)
+    return sum(1 << (len(columns) - 1 - i) for i, col in enumerate(columns) if col not in dims)
@@ -0,0 +1,38 @@
+from typing import Any, Dict, Optional
+
+from services.oracle import OracleService, shape_columns
+from services.analytics.query import AggregateQuery
+from services.analytics.cube import cubes
+from services.analytics.snapshot import snapshots
+from services.analytics.fusion import fusion_planner
+
+# Sorgular bu sırayla denenir: ön-toplanmış küp, satır bazlı snapshot, Oracle (fusion planner)
+stores = (*cubes, *snapshots)
+oracle_fallbacks = {"count": 0}
+
+
+def register_query(query: AggregateQuery) -> AggregateQuery:
+    """Sorguyu küp/snapshot'lara bildirir (modül seviyesinde, ilk yüklemeden önce çağrılır)."""
+    for store in stores:
+        store.register(query)
+    return query
+
+
+async def answer_query(query: AggregateQuery, oracle: OracleService, sql: str,
+                       params: Optional[Dict[str, Any]] = None):
+    """
+    Sorguyu küpten, olmazsa MV snapshot'ından yanıtlar. İkisi de olmazsa (bayat
+    yapılar MV yenilemesinden sonra arka planda kurulurken beklenmez) Oracle'a
+    gider: aynı anda gelen benzer sorgularla birleştirilir, tek kaldıysa sql çalışır.
+    """
+    for store in stores:
+        result = await store.evaluate(query)
+        if result is not None:
+            break
+    else:
+        oracle_fallbacks["count"] += 1
+        result = await fusion_planner.submit(query)
+        if result is None:
+            return await oracle.execute_query_async(sql, params)
+    columns, data, types = result
+    return shape_columns(columns, data, oracle.result_format, types)
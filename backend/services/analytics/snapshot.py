@@ -0,0 +1,104 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import settings
+from services.oracle import OracleService
+from services.cache.mview import ORG_TREE_MV, ENGAGEMENT_MV
+from services.analytics.query import AggregateQuery, Condition
+from services.analytics.compiler import condition_sql
+from services.analytics.engine import evaluate
+from services.analytics.store import MViewStore
+
+logger = logging.getLogger(__name__)
+
+# Dashboard sorgularının ortak taban filtreleri
+ORG_TREE_BASE = (
+    Condition("DIREKTORLUK_REF", value="1"),
+    Condition("AKTIF_CALISAN", value=1),
+)
+# Aktif kadrolu personel (stajyer/çırak hariç): çoğu dashboard sorgusunun filtresi
+ACTIVE_STAFF = ORG_TREE_BASE + (Condition("CTURS", value=1),)
+ENGAGEMENT_BASE = (Condition("DIREKTORLUK_REF", value="1"),)
+
+
+class ColumnarSnapshot(MViewStore):
+    """
+    Bir MV'nin taban filtreli halini MV yenilemesi başına bir kez belleğe alır
+    (pandas, string kolonlar dictionary-encoded categorical). Bu MV'ye ait
+    AggregateQuery'ler vektörel group-by ile süreç içinde yanıtlanır; snapshot
+    MV'nin güncel versiyonuna ait değilse sorgu Oracle'da çalışır.
+    Sadece register edilen sorguların kolonları yüklenir.
+    """
+
+    name = "snapshot"
+
+    def __init__(self, mview: str, base_filters: Sequence[Condition], owner: str = settings.MVIEW_OWNER):
+        super().__init__(mview, base_filters, settings.SNAPSHOT_ENABLED, owner)
+        self._columns: Set[str] = set()
+        self._frame = None
+
+    def register(self, *queries: AggregateQuery) -> None:
+        for query in queries:
+            if query.source == self.mview:
+                self._columns.update(query.columns())
+
+    def covers(self, query: AggregateQuery) -> bool:
+        """Sorgu bu snapshot'tan hesaplanabilir mi (aynı MV, taban filtreyi içeriyor, kolonlar yüklü)."""
+        return (
+            self._frame is not None
+            and query.source == self.mview
+            and all(c in query.filters for c in self.base_filters)
+            and query.columns() <= set(self._frame.columns)
+        )
+
+    async def build(self) -> Optional[int]:
+        binds: Dict[str, Any] = {}
+        where = condition_sql(self.base_filters, binds)
+        columns = sorted(self._columns - {c.column for c in self.base_filters})
+        sql = f"""
+        SELECT {", ".join(columns)}
+        FROM {self.owner}.{self.mview}
+        WHERE {" AND ".join(where)}
+        """
+        oracle = OracleService()
+        try:
+            table = await oracle.fetch_arrow_async(sql, binds)
+        finally:
+            await oracle.close_async()
+        if isinstance(table, dict):
+            logger.warning(f"Snapshot yüklenemedi ({self.mview}): {table.get('error')}")
+            return None
+
+        frame = await run_in_threadpool(table.to_pandas, strings_to_categorical=True)
+        # Taban filtre kolonları sabit değerli; sorgular eşleşme için bunları da okuyabilir
+        for cond in self.base_filters:
+            frame[cond.column] = cond.value
+        self._frame = frame
+        return len(frame)
+
+    async def evaluate(self, query: AggregateQuery) -> Optional[Tuple[List[str], List[List[Any]], List[str]]]:
+        """Sorguyu snapshot'tan hesaplar; snapshot bayat veya sorguyu kapsamıyorsa None."""
+        if query.source != self.mview or not self.ensure_fresh() or not self.covers(query):
+            return None
+        try:
+            result = await run_in_threadpool(evaluate, self._frame, query, self.base_filters)
+        except Exception as e:
+            logger.warning(f"Snapshot sorgu hatası ({self.mview}): {e}")
+            return None
+        self.hits += 1
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = super().snapshot()
+        stats.update({
+            "memory_bytes": 0 if self._frame is None else int(self._frame.memory_usage(deep=True).sum()),
+            "columns": sorted(self._columns),
+        })
+        return stats
+
+
+personnel_snapshot = ColumnarSnapshot(ORG_TREE_MV, ORG_TREE_BASE)
+engagement_snapshot = ColumnarSnapshot(ENGAGEMENT_MV, ENGAGEMENT_BASE)
+snapshots = (personnel_snapshot, engagement_snapshot)
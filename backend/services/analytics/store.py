@@ -0,0 +1,128 @@
+import asyncio
+import datetime
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Sequence, Set
+
+from core.config import settings
+from services.cache.mview import mview_tracker
+from services.analytics.query import Condition
+
+logger = logging.getLogger(__name__)
+
+
+class MViewStore(ABC):
+    """
+    Bir MV'den türetilen ve MV yenilemesi başına bir kez kurulan bellek içi yapı
+    (snapshot, küp). Versiyonu MViewVersionTracker'daki versiyonla eşleşmiyorsa
+    bayattır; bayat yapı sorgu yanıtlamaz, yeniden kurulması arka planda
+    tetiklenir ve istek beklemeden Oracle'a düşer.
+    Alt sınıflar build() ile veriyi kurar ve satır/hücre sayısını döndürür.
+    """
+
+    name = "store"
+
+    def __init__(self, mview: str, base_filters: Sequence[Condition], enabled: bool, owner: str = settings.MVIEW_OWNER):
+        self.mview = mview
+        self.owner = owner
+        self.base_filters = tuple(base_filters)
+        self.enabled = enabled
+        self.version: Optional[str] = None
+        self.size = 0
+        self.loaded_at: Optional[str] = None
+        self.load_ms: Optional[float] = None
+        self._failed_at: Optional[float] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+
+    @abstractmethod
+    async def build(self) -> Optional[int]:
+        """Veriyi kurar; satır/hücre sayısını, hata olursa None döndürür."""
+
+    def is_fresh(self) -> bool:
+        current = mview_tracker.version_for([self.mview])
+        return current is not None and current == self.version
+
+    async def load(self) -> None:
+        version = mview_tracker.version_for([self.mview])
+        started = time.perf_counter()
+        size = await self.build()
+        if size is None:
+            self._failed_at = time.monotonic()
+            return
+        self.version = version
+        self.size = size
+        self._failed_at = None
+        self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.loaded_at = datetime.datetime.utcnow().isoformat()
+        logger.info(f"{self.name} yüklendi: {self.mview} v{version}, {size} satır, {self.load_ms} ms")
+
+    def reload(self) -> asyncio.Task:
+        """Yükleme sürmüyorsa başlatır; eşzamanlı çağrılar aynı yüklemeyi paylaşır."""
+        if self._loading is None or self._loading.done():
+            self._loading = asyncio.create_task(self._load_logged())
+        return self._loading
+
+    async def _load_logged(self) -> None:
+        # Arka plan görevi: hatayı kimse await etmeyebilir, burada loglanır
+        try:
+            await self.load()
+        except Exception as e:
+            self._failed_at = time.monotonic()
+            logger.warning(f"{self.name} yükleme hatası ({self.mview}): {e}")
+
+    def ensure_fresh(self) -> bool:
+        """
+        Taze mi? Bayatsa yeniden yüklemeyi arka planda başlatır ama beklemez: tam MV
+        taraması sürerken istek Oracle'a düşer, sonraki istekler yeni veriyi kullanır.
+        """
+        if not self.enabled:
+            return False
+        if self.is_fresh():
+            return True
+        if mview_tracker.version_for([self.mview]) is None:
+            return False
+        if self._failed_at is not None and time.monotonic() - self._failed_at < settings.MVIEW_POLL_INTERVAL:
+            return False  # Son yükleme yeni başarısız oldu; her istekte tam tarama yapma
+        self.reload()
+        return False
+
+    async def on_mview_refresh(self, changed: Set[str]) -> None:
+        if self.enabled and self.mview in changed:
+            await self.reload()
+
+    async def _run(self) -> None:
+        await mview_tracker.wait_ready(timeout=30)
+        if mview_tracker.version_for([self.mview]) is not None:
+            await self.reload()
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            mview_tracker.add_listener(self.on_mview_refresh)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._loading):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._loading = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "kind": self.name,
+            "mview": self.mview,
+            "enabled": self.enabled,
+            "version": self.version,
+            "fresh": self.is_fresh(),
+            "size": self.size,
+            "loaded_at": self.loaded_at,
+            "load_ms": self.load_ms,
+            "hits": self.hits,
+        }
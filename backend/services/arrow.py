@@ -0,0 +1,110 @@
+import io
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from fastapi.responses import Response, StreamingResponse
+from starlette.requests import Request
+
+from services.oracle import OracleService
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Accept başlığındaki medya tipi -> ikili format
+BINARY_FORMATS = {
+    ARROW_STREAM_MEDIA_TYPE: "arrow",
+    PARQUET_MEDIA_TYPE: "parquet",
+    "application/x-parquet": "parquet",
+}
+MEDIA_TYPES = {
+    "arrow": ARROW_STREAM_MEDIA_TYPE,
+    "parquet": PARQUET_MEDIA_TYPE,
+}
+
+
+def negotiate_binary_format(request: Optional[Request]) -> Optional[str]:
+    """Accept başlığı Arrow IPC veya Parquet istiyorsa formatı ("arrow" / "parquet"), yoksa None döner."""
+    if request is None:
+        return None
+    accept = request.headers.get("accept", "")
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type in BINARY_FORMATS:
+            return BINARY_FORMATS[media_type]
+    return None
+
+
+def table_to_bytes(table: pa.Table, fmt: str) -> bytes:
+    sink = io.BytesIO()
+    if fmt == "parquet":
+        pq.write_table(table, sink, compression="zstd")
+    else:
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
+
+
+def arrow_response(result: Any, fmt: str) -> Any:
+    """OracleService.fetch_arrow* sonucunu ikili Response'a çevirir; hata sözlükleri olduğu gibi döner."""
+    if not isinstance(result, pa.Table):
+        return result
+    return Response(
+        content=table_to_bytes(result, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Vary": "Accept"},
+    )
+
+
+# Akış yarıda kesilirse son mesaj: bu custom_metadata anahtarını taşıyan boş parti
+ARROW_ERROR_METADATA_KEY = "error"
+
+
+async def _arrow_ipc_chunks(sql: str, params: Optional[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    # Akış kendi bağlantısını alır (bkz. services.streaming); her parti ayrı IPC mesajı olarak gider
+    oracle = OracleService()
+    sink = io.BytesIO()
+    writer = schema = None
+    try:
+        try:
+            async for table in oracle.iter_arrow_async(sql, params):
+                if writer is None:
+                    schema = table.schema
+                    writer = ipc.new_stream(sink, schema)
+                elif table.schema != schema:
+                    table = table.cast(schema)
+                writer.write_table(table)
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        except Exception as e:
+            # Başlıklar gönderildi; NDJSON/CSV'deki gibi hata son mesaj olarak yazılır:
+            # metadata'sında "error" olan boş parti (read_next_batch_with_custom_metadata)
+            logger.error(f"Arrow stream hatası: {e}")
+            if writer is None:
+                schema = pa.schema([])
+                writer = ipc.new_stream(sink, schema)
+            writer.write_batch(
+                pa.RecordBatch.from_pylist([], schema=schema),
+                custom_metadata={ARROW_ERROR_METADATA_KEY: str(e)},
+            )
+        if writer is None:
+            # Sorgu kolon döndürmedi: yine de geçerli (boş) bir stream gönderilir
+            writer = ipc.new_stream(sink, pa.schema([]))
+        writer.close()
+        yield sink.getvalue()
+    finally:
+        await oracle.close_async()
+
+
+def stream_arrow(sql: str, params: Optional[Dict[str, Any]] = None) -> StreamingResponse:
+    """Sorgu sonucunu fetch_df_batches partileriyle Arrow IPC stream olarak gönderir (cache'lenmez)."""
+    return StreamingResponse(
+        _arrow_ipc_chunks(sql, params),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={"Vary": "Accept"},
+    )
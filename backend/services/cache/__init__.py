@@ -0,0 +1,28 @@
+from .keys import gateway_key_builder
+from .coder import MsgpackCoder, get_coder_class
+from .stats import cache_stats, CacheStatsMiddleware
+from .mview import mview_tracker, ORG_TREE_MV, ORG_TREE_MONTHLY_MV, ENGAGEMENT_MV
+from .local import local_cache
+from .invalidation import invalidation_listener
+from .decorator import cache
+from .warmer import cache_warmer
+from .batch import resolve_batch
+from .push import push_hub
+
+__all__ = [
+    "gateway_key_builder",
+    "MsgpackCoder",
+    "get_coder_class",
+    "cache_stats",
+    "CacheStatsMiddleware",
+    "mview_tracker",
+    "ORG_TREE_MV",
+    "ORG_TREE_MONTHLY_MV",
+    "ENGAGEMENT_MV",
+    "cache",
+    "local_cache",
+    "cache_warmer",
+    "resolve_batch",
+    "push_hub",
+    "invalidation_listener",
+]
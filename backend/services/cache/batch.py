@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+from services.cache.decorator import (
+    CachedEndpoint,
+    ResolvedKey,
+    cache_ready,
+    cached_routes,
+    invoke_endpoint,
+    is_error_result,
+    read_entries,
+)
+from services.cache.singleflight import flights
+
+logger = logging.getLogger(__name__)
+
+
+def match_route(app: FastAPI, path: str) -> Tuple[Optional[CachedEndpoint], Optional[Request]]:
+    """Path'i cache'li bir GET route'una eşler; handler'a verilecek sentetik isteği kurar."""
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": url.path,
+        "query_string": url.query.encode(),
+        "headers": [],
+    }
+    for route, spec in cached_routes(app):
+        match, child = route.matches(scope)
+        if match is Match.FULL:
+            return spec, Request({**scope, **child})
+    return None, None
+
+
+def _response_body(response: Response) -> Any:
+    """Endpoint Response döndürdüyse batch öğesine konacak JSON gövdesi; JSON değilse ValueError."""
+    body = getattr(response, "body", None)
+    if body is None or "json" not in (response.media_type or ""):
+        raise ValueError(f"Batch yalnız JSON yanıtları birleştirir ({response.media_type or type(response).__name__})")
+    return orjson.loads(body)
+
+
+async def resolve_batch(app: FastAPI, paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Dashboard path'lerini tek istekte çözer: anahtarlar çıkarılır, cache'tekiler
+    tek MGET ile okunur, olmayanlar eşzamanlı hesaplanır (aynı anahtar tek sorgu).
+    Her öğe için durum (HIT / STALE / MISS / ERROR) ve süre döner.
+    """
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = [{"path": path} for path in paths]
+    pending = []
+    for i, path in enumerate(paths):
+        spec, request = match_route(app, path)
+        try:
+            kwargs = spec.default_kwargs(request) if spec is not None else None
+        except ValueError as e:  # geçersiz ?format=
+            results[i].update(status="ERROR", error=str(e))
+            continue
+        if kwargs is None:
+            results[i].update(status="ERROR", error="Cache'li dashboard endpoint'i bulunamadı")
+            continue
+        pending.append((i, spec, kwargs, await spec.resolve_key(request, None, (), kwargs)))
+
+    def _elapsed() -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    async def _miss(i: int, spec: CachedEndpoint, kwargs: Dict[str, Any], resolved: Optional[ResolvedKey]) -> None:
+        try:
+            if resolved is None:
+                value = await invoke_endpoint(spec.func, (), kwargs)
+            else:
+                value = (await flights.do(resolved.key, lambda: spec.compute(resolved, (), kwargs))).value
+            if isinstance(value, Response):
+                # Ör. Arrow/Parquet veya stream: Response nesnesi batch gövdesine serileştirilemez
+                value = _response_body(value)
+        except Exception as e:
+            logger.warning(f"Batch öğesi hesaplanamadı ({results[i]['path']}): {e}")
+            value = {"error": str(e)}
+        if not is_error_result(value):
+            results[i].update(status="MISS" if resolved else "BYPASS", data=value, elapsed_ms=_elapsed())
+            return
+        if resolved is not None and resolved.fallback_key:
+            # Decorator ile aynı: MV yenilendi ama yeni sonuç hesaplanamadı, önceki versiyon sunulur
+            (entry, _), = await read_entries([resolved.fallback_key])
+            if entry is not None:
+                logger.warning(f"Oracle hatası, stale cache sunuluyor ({resolved.key}): {value['error']}")
+                results[i].update(status="STALE-ERROR", data=entry["value"], elapsed_ms=_elapsed())
+                return
+        results[i].update(status="ERROR", error=value["error"], elapsed_ms=_elapsed())
+
+    if not cache_ready():
+        await asyncio.gather(*(_miss(i, spec, kwargs, None) for i, spec, kwargs, _ in pending))
+        return results
+
+    entries = await read_entries([resolved.key for *_, resolved in pending])
+    misses = []
+    for (i, spec, kwargs, resolved), (entry, _) in zip(pending, entries):
+        if entry is None:
+            misses.append(_miss(i, spec, kwargs, resolved))
+            continue
+        status = "HIT"
+        if time.time() - entry["stored_at"] >= entry["expire"]:
+            # Decorator ile aynı: eski değer hemen döner, yenisi arka planda hesaplanır
+            flights.launch(resolved.key, lambda s=spec, r=resolved, k=kwargs: s.compute(r, (), k))
+            status = "STALE"
+        results[i].update(status=status, data=entry["value"], elapsed_ms=_elapsed())
+    await asyncio.gather(*misses)
+    return results
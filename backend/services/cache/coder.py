@@ -0,0 +1,80 @@
+import datetime
+import json
+from decimal import Decimal
+from typing import Any
+
+import msgpack
+import zstandard
+from fastapi_cache.coder import Coder, JsonCoder
+
+from core.config import settings
+
+# Oracle'dan gelen ve msgpack'in doğrudan desteklemediği tipler için ext kodları
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+
+# İlk bayt formatı belirtir; JSON girdileri '{' / '[' ile başladığı için karışmaz
+_FORMAT_PLAIN = b"\x00"
+_FORMAT_ZSTD = b"\x01"
+
+_compressor = zstandard.ZstdCompressor(level=settings.CACHE_COMPRESS_LEVEL)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, datetime.datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, datetime.date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    raise TypeError(f"msgpack ile kodlanamayan tip: {type(obj)!r}")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_DATETIME:
+        return datetime.datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return datetime.date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCoder(Coder):
+    """
+    Cache girdileri için msgpack + zstd coder. CACHE_COMPRESS_THRESHOLD baytı
+    aşan girdiler sıkıştırılır; küçük KPI sonuçları sıkıştırma maliyeti ödemez.
+    Eski JsonCoder ile yazılmış girdiler de okunabilir (geçiş dönemi için).
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        packed = msgpack.packb(value, default=_default, use_bin_type=True)
+        if len(packed) >= settings.CACHE_COMPRESS_THRESHOLD:
+            return _FORMAT_ZSTD + _compressor.compress(packed)
+        return _FORMAT_PLAIN + packed
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        head, body = value[:1], value[1:]
+        if head == _FORMAT_ZSTD:
+            body = _decompressor.decompress(body)
+        elif head != _FORMAT_PLAIN:
+            return JsonCoder.decode(value)
+        return msgpack.unpackb(body, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Any = None) -> Any:
+        return cls.decode(value)
+
+
+CODERS = {
+    "json": JsonCoder,
+    "msgpack": MsgpackCoder,
+}
+
+
+def get_coder_class(name: str):
+    return CODERS.get(name.lower(), MsgpackCoder)
@@ -0,0 +1,475 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+from inspect import Parameter, Signature, isawaitable, iscoroutinefunction
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import FastAPI, Query, params
+from fastapi.concurrency import run_in_threadpool
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi.routing import APIRoute
+from fastapi_cache import FastAPICache
+from pydantic.fields import FieldInfo
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from core.config import settings
+from core.responses import GatewayJSONResponse, dumps
+from services.oracle import OracleService
+from services.cache.singleflight import flights
+from services.cache.mview import mview_tracker
+from services.cache.local import local_cache
+from services.cache.invalidation import publish_invalidation
+from services.cache.delta import DELTA_PARAM, DeltaHistory, parse_version
+
+logger = logging.getLogger(__name__)
+
+STALE_HEADER = "X-Cache-Stale"
+
+_REQUEST_PARAM = Parameter("__gateway_cache_request", Parameter.KEYWORD_ONLY, annotation=Request)
+_RESPONSE_PARAM = Parameter("__gateway_cache_response", Parameter.KEYWORD_ONLY, annotation=Response)
+# row_key verilen endpoint'lere eklenir; cache anahtarına girmez (keys.normalize_query)
+_DELTA_PARAM = Parameter(
+    DELTA_PARAM,
+    Parameter.KEYWORD_ONLY,
+    annotation=Optional[str],
+    default=Query(None, description="İstemcideki sonuç versiyonu (ETag); verilirse yalnız değişen satırlar döner"),
+)
+
+
+def _locate_param(signature: Signature, dep: Parameter, to_inject: List[Parameter]) -> Parameter:
+    for param in signature.parameters.values():
+        if param.annotation is dep.annotation:
+            return param
+    to_inject.append(dep)
+    return dep
+
+
+def cache_ready() -> bool:
+    try:
+        FastAPICache.get_backend()
+    except AssertionError:
+        return False
+    return FastAPICache.get_enable()
+
+
+def _uncacheable(request: Optional[Request]) -> bool:
+    if not cache_ready():
+        return True
+    if request is None:
+        return False
+    if request.method != "GET":
+        return True
+    return request.headers.get("Cache-Control") == "no-store"
+
+
+def is_error_result(value: Any) -> bool:
+    # OracleService SQL hatalarını exception yerine {"error": ...} olarak döndürür
+    return isinstance(value, dict) and "error" in value
+
+
+def render(value: Any, headers: Optional[Dict[str, str]] = None, body: Optional[bytes] = None) -> Response:
+    # Response olarak dönülen değer FastAPI'nin jsonable_encoder geçişini atlar
+    if isinstance(value, Response):
+        return value
+    if body is not None:
+        return Response(body, media_type=GatewayJSONResponse.media_type, headers=headers)
+    return GatewayJSONResponse(value, headers=headers)
+
+
+def etag_for(raw: bytes) -> str:
+    return f'W/"{hashlib.md5(raw).hexdigest()}"'  # noqa: S324
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığını (liste / '*' / zayıf karşılaştırma) ETag ile karşılaştırır."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+async def invoke_endpoint(func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    """
+    Handler'ı kendi OracleService örnekleriyle çalıştırır. Hesaplama isteğin
+    ömründen bağımsız (single-flight, arka plan yenileme) yürüyebildiği için
+    istek bağımlılığı olan servis yerine yenisi verilir ve burada kapatılır.
+    """
+    owned = []
+    call_kwargs = {}
+    for name, value in kwargs.items():
+        if isinstance(value, OracleService):
+            value = OracleService(result_format=value.result_format)
+            owned.append(value)
+        call_kwargs[name] = value
+    try:
+        if iscoroutinefunction(func):
+            return await func(*args, **call_kwargs)
+        return await run_in_threadpool(func, *args, **call_kwargs)
+    finally:
+        for svc in owned:
+            await svc.close_async()
+
+
+def _decode_entry(key: str, raw: bytes, ttl: Optional[int]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    try:
+        entry = FastAPICache.get_coder().decode(raw)
+    except Exception:
+        logger.warning(f"Cache girdisi çözülemedi: {key}", exc_info=True)
+        return None, None
+
+    local_cache.l2_hits += 1
+    # İçerik ETag'i yazılırken hesaplanır; alanı olmayan eski girdilerde ham bayttan
+    etag = entry.get("etag") or etag_for(raw)
+    if ttl is None:
+        # MGET TTL döndürmez: kalan fiziksel ömür girdinin kendi zamanlarından hesaplanır
+        ttl = max(int(entry["expire"] + settings.CACHE_STALE_TTL - (time.time() - entry["stored_at"])), 1)
+    local_cache.set(key, entry, etag, len(raw), ttl if ttl > 0 else None)
+    return entry, etag
+
+
+async def _read_entry(key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Girdiyi önce L1'den, yoksa Redis'ten okur. Dönüş: (girdi, etag)."""
+    local = local_cache.get(key)
+    if local is not None:
+        local_cache.l1_hits += 1
+        return local.entry, local.etag
+
+    try:
+        ttl, raw = await FastAPICache.get_backend().get_with_ttl(key)
+    except Exception:
+        logger.warning(f"Cache okunamadı: {key}", exc_info=True)
+        return None, None
+    if raw is None:
+        local_cache.misses += 1
+        return None, None
+    return _decode_entry(key, raw, ttl)
+
+
+async def read_entries(keys: Sequence[str]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Birden çok girdiyi okur: L1'de olmayanlar Redis'ten tek MGET ile çekilir.
+    Backend Redis değilse anahtar başına _read_entry kullanılır.
+    """
+    results: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = [(None, None)] * len(keys)
+    missing = []
+    for i, key in enumerate(keys):
+        local = local_cache.get(key)
+        if local is not None:
+            local_cache.l1_hits += 1
+            results[i] = (local.entry, local.etag)
+        else:
+            missing.append(i)
+    if not missing:
+        return results
+
+    redis = getattr(FastAPICache.get_backend(), "redis", None)
+    if redis is None:
+        for i in missing:
+            results[i] = await _read_entry(keys[i])
+        return results
+
+    try:
+        raws = await redis.mget([keys[i] for i in missing])
+    except Exception:
+        logger.warning("Cache toplu okunamadı", exc_info=True)
+        return results
+    for i, raw in zip(missing, raws):
+        if raw is None:
+            local_cache.misses += 1
+        else:
+            results[i] = _decode_entry(keys[i], raw, None)
+    return results
+
+
+class Computed(NamedTuple):
+    """Hesaplanan değer ve JSON gövdesi/ETag'i (hata ve Response değerlerinde None)."""
+    value: Any
+    body: Optional[bytes] = None
+    etag: Optional[str] = None
+
+
+async def compute_and_store(
+    key: str,
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    expire: int,
+) -> Computed:
+    value = await invoke_endpoint(func, args, kwargs)
+    if is_error_result(value) or isinstance(value, Response):
+        # Hatalar cache'lenmez; Response nesneleri (stream vb.) olduğu gibi döner
+        return Computed(value)
+
+    # ETag zarfın değil değerin özeti: yeniden hesaplanan aynı sonuç (ör. verisi
+    # değişmeyen MV yenilemesi) aynı ETag'i alır ve istemcinin kopyası geçerli kalır.
+    # Gövde burada bir kez serileştirilir; yanıt ve delta geçmişi aynı baytları kullanır
+    body = dumps(value)
+    computed = Computed(value, body, etag_for(body))
+    entry = {"stored_at": time.time(), "expire": expire, "value": value, "etag": computed.etag}
+    try:
+        raw = FastAPICache.get_coder().encode(entry)
+        # Fiziksel TTL, mantıksal TTL'den uzun: süresi dolan değer stale olarak sunulabilir
+        physical_ttl = expire + settings.CACHE_STALE_TTL
+        await FastAPICache.get_backend().set(key, raw, physical_ttl)
+    except Exception:
+        logger.warning(f"Cache yazılamadı: {key}", exc_info=True)
+        return computed
+
+    local_cache.set(key, entry, entry["etag"], len(raw), physical_ttl)
+    await publish_invalidation(key)
+    return computed
+
+
+class ResolvedKey(NamedTuple):
+    key: str
+    ttl: int
+    version: Optional[str]
+    fallback_key: Optional[str]
+    # MV versiyonu eklenmeden önceki anahtar: versiyonlar arası (delta geçmişi) ortak
+    scope: str
+
+
+class CachedEndpoint:
+    """@cache ile sarılmış bir handler'ın cache ayarları (warmer ve batch çözümleme de kullanır)."""
+
+    def __init__(self, func: Callable[..., Any], expire: Optional[int], namespace: str, mviews: Sequence[str],
+                 row_key: Sequence[str] = ()):
+        self.func = func
+        self.expire = expire
+        self.namespace = namespace
+        self.mviews = tuple(mviews)
+        self.history = DeltaHistory(row_key) if row_key else None
+
+    async def resolve_key(
+        self,
+        request: Optional[Request],
+        response: Optional[Response],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> ResolvedKey:
+        ttl = self.expire or FastAPICache.get_expire() or 60
+        key = FastAPICache.get_key_builder()(
+            self.func,
+            f"{FastAPICache.get_prefix()}:{self.namespace}",
+            request=request,
+            response=response,
+            args=args,
+            kwargs=kwargs,
+        )
+        if isawaitable(key):
+            key = await key
+
+        scope = key
+        fallback_key = None
+        version = mview_tracker.version_for(self.mviews) if self.mviews else None
+        if version:
+            previous = mview_tracker.previous_version_for(self.mviews)
+            if previous and previous != version:
+                fallback_key = f"{key}:mv={previous}"
+            key = f"{key}:mv={version}"
+            ttl = settings.MVIEW_CACHE_TTL
+        return ResolvedKey(key, ttl, version, fallback_key, scope)
+
+    async def compute(self, resolved: ResolvedKey, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Computed:
+        """compute_and_store; row_key'li endpoint'lerde sonucu delta geçmişine de ekler."""
+        computed = await compute_and_store(resolved.key, self.func, args, kwargs, resolved.ttl)
+        if self.history is not None and computed.etag is not None:
+            await self.history.record(resolved.scope, parse_version(computed.etag), computed.value)
+        return computed
+
+    def default_kwargs(self, request: Optional[Request] = None) -> Optional[Dict[str, Any]]:
+        """
+        İstek olmadan çağırmak için handler argümanları. OracleService parametreleri
+        invoke_endpoint içinde yenisiyle değiştirilir; Request parametrelerine verilen
+        (sentetik) istek geçer, query/path parametreleri varsa o istekten okunur.
+        Varsayılanı olmayan ve istekte de bulunmayan argüman varsa None döner
+        (isteksiz çalıştırılamaz).
+        """
+        query = request.query_params if request is not None else {}
+        path_params = request.path_params if request is not None else {}
+        kwargs = {}
+        for param in get_typed_signature(self.func).parameters.values():
+            if param.annotation is OracleService:
+                kwargs[param.name] = OracleService(result_format=query.get("format", "rows"))
+            elif param.annotation is Request and request is not None:
+                kwargs[param.name] = request
+            elif param.name in path_params:
+                kwargs[param.name] = path_params[param.name]
+            elif param.default is Parameter.empty or isinstance(param.default, params.Depends):
+                return None
+            elif isinstance(param.default, FieldInfo):
+                kwargs[param.name] = query.get(param.default.alias or param.name, param.default.default)
+        return kwargs
+
+    async def warm(self, path: str, min_remaining: float = 0) -> str:
+        """
+        Endpoint'i verilen path için hesaplayıp cache'e yazar. Girdinin kalan ömrü
+        min_remaining'den uzunsa dokunmaz. Dönüş: warmed / fresh / error / skipped.
+        """
+        request = Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+        kwargs = self.default_kwargs(request)
+        if kwargs is None or not cache_ready():
+            return "skipped"
+        resolved = await self.resolve_key(request, None, (), kwargs)
+
+        entry, _ = await _read_entry(resolved.key)
+        if entry is not None and entry["expire"] - (time.time() - entry["stored_at"]) > min_remaining:
+            return "fresh"
+
+        computed = await flights.do(resolved.key, lambda: self.compute(resolved, (), kwargs))
+        return "error" if is_error_result(computed.value) else "warmed"
+
+
+# Sarılmış handler -> cache ayarları
+cached_endpoints: Dict[Callable[..., Any], CachedEndpoint] = {}
+
+
+def cached_routes(app: FastAPI) -> List[Tuple[APIRoute, CachedEndpoint]]:
+    """
+    Uygulamadaki @cache'li route'lar. include_router route'ları tek listeye açar
+    (requirements'taki fastapi sürümü); route listesi taşıyan iç içe öğeler de
+    gezilir ki warmer/batch/push bunları sessizce atlamasın.
+    """
+    result = []
+    stack = list(reversed(app.router.routes))
+    while stack:
+        route = stack.pop()
+        if isinstance(route, APIRoute):
+            spec = cached_endpoints.get(route.endpoint)
+            if spec is not None:
+                result.append((route, spec))
+        else:
+            stack.extend(reversed(getattr(route, "routes", None) or ()))
+    return result
+
+
+def cache(
+    expire: Optional[int] = None,
+    namespace: str = "",
+    mviews: Sequence[str] = (),
+    row_key: Sequence[str] = (),
+) -> Callable:
+    """
+    fastapi_cache.decorator.cache yerine geçen dashboard cache katmanı:
+      * Aynı anahtar için eşzamanlı miss'ler tek Oracle sorgusunda birleşir (single-flight).
+      * Süresi dolan değer hemen döner, yenisi arka planda hesaplanır (stale-while-revalidate).
+      * Oracle hata verirse / havuz doluysa eldeki stale değer işaretlenerek sunulur.
+      * mviews verilirse anahtara MV yenileme versiyonu eklenir; sonuç MV yenilenene
+        kadar (en fazla MVIEW_CACHE_TTL) yaşar. Versiyon bilinmiyorsa expire kullanılır.
+      * Yanıtlar değerin özetinden ETag taşır; If-None-Match eşleşirse 304 döner.
+      * row_key verilirse (tekil satır anahtarı kolonları) ?delta_from=<ETag> ile
+        istemcideki versiyona göre yalnız eklenen/değişen/silinen satırlar döner.
+    """
+
+    def wrapper(func: Callable[..., Any]) -> Callable[..., Any]:
+        spec = CachedEndpoint(func, expire, namespace, mviews, row_key)
+        signature = get_typed_signature(func)
+        # FastAPI tip başına tek Request/Response parametresi doldurur; handler zaten
+        # istiyorsa onunki kullanılır, yoksa gizli parametre eklenir
+        to_inject = []
+        request_param = _locate_param(signature, _REQUEST_PARAM, to_inject)
+        response_param = _locate_param(signature, _RESPONSE_PARAM, to_inject)
+        if spec.history is not None:
+            to_inject.append(_DELTA_PARAM)
+
+        def _take(kwargs: Dict[str, Any], param: Parameter) -> Any:
+            if param in to_inject:
+                return kwargs.pop(param.name, None)
+            return kwargs.get(param.name)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request: Optional[Request] = _take(kwargs, request_param)
+            response: Optional[Response] = _take(kwargs, response_param)
+            delta_from = kwargs.pop(DELTA_PARAM, None) if spec.history is not None else None
+
+            if _uncacheable(request):
+                return render(await invoke_endpoint(func, args, kwargs))
+
+            resolved = await spec.resolve_key(request, response, args, kwargs)
+            key, ttl, version, fallback_key, _ = resolved
+            status_header = FastAPICache.get_cache_status_header()
+
+            async def _respond(value: Any, status: str, etag: Optional[str], max_age: int,
+                               body: Optional[bytes] = None) -> Any:
+                if response is None:
+                    return value
+                if version:
+                    # MV yenilemesi en geç bir poll aralığında fark edilir; istemci daha uzun tutmasın
+                    max_age = min(max_age, settings.MVIEW_POLL_INTERVAL)
+                # API anahtarına bağlı yanıt: paylaşılan proxy'ler değil yalnız istemci tutar.
+                # Süre dolunca istemci ETag ile doğrular; değişmediyse 304 gövdesiz döner
+                headers = {
+                    status_header: status,
+                    "Cache-Control": f"private, max-age={max(max_age, 0)}, "
+                                     f"stale-while-revalidate={settings.CACHE_STALE_TTL}",
+                }
+                if status.startswith("STALE"):
+                    headers[STALE_HEADER] = "true"
+                if etag is not None:
+                    headers["ETag"] = etag
+                response.headers.update(headers)
+                if etag is not None and request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+                    # Değer serileştirilmez; Oracle'a da gidilmemişse istek yalnız cache okumasıdır
+                    return Response(status_code=HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+                if delta_from and etag is not None and spec.history.applicable(value):
+                    value = await spec.history.respond(
+                        resolved.scope, parse_version(delta_from), parse_version(etag), value,
+                    )
+                    body = None
+                return render(value, dict(response.headers), body)
+
+            def _compute():
+                return spec.compute(resolved, args, kwargs)
+
+            entry, etag = await _read_entry(key)
+            force = request is not None and request.headers.get("Cache-Control") == "no-cache"
+
+            if entry is not None and not force:
+                age = time.time() - entry["stored_at"]
+                if age < entry["expire"]:
+                    return await _respond(entry["value"], "HIT", etag, int(entry["expire"] - age))
+                # Süresi dolmuş: eski değeri hemen döndür, yenisini arka planda hesapla
+                flights.launch(key, _compute)
+                return await _respond(entry["value"], "STALE", etag, 0)
+
+            try:
+                computed = await flights.do(key, _compute)
+                value = computed.value
+                error = value["error"] if is_error_result(value) else None
+            except Exception as e:
+                computed, value, error = None, None, e
+
+            if error is not None:
+                if entry is None and fallback_key:
+                    # MV yenilendi ama yeni sonuç hesaplanamadı: önceki versiyonun sonucu
+                    entry, etag = await _read_entry(fallback_key)
+                if entry is None:
+                    if value is None:
+                        raise error
+                    return render(value)
+                logger.warning(f"Oracle hatası, stale cache sunuluyor ({key}): {error}")
+                return await _respond(entry["value"], "STALE-ERROR", etag, 0)
+            if isinstance(value, Response):
+                return value
+            # compute_and_store'un serileştirdiği gövde ve ETag'i yeniden kullanılır
+            return await _respond(value, "MISS", computed.etag, ttl, computed.body)
+
+        inner.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), *to_inject]
+        )
+        cached_endpoints[inner] = spec
+        return inner
+
+    return wrapper
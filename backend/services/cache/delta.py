@@ -0,0 +1,145 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi_cache import FastAPICache
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DELTA_PARAM = "delta_from"
+
+Row = Dict[str, Any]
+
+
+def parse_version(token: str) -> str:
+    """delta_from hem çıplak versiyonu hem de ETag başlığını (W/"...") kabul eder."""
+    token = token.strip()
+    if token.startswith("W/"):
+        token = token[2:]
+    return token.strip('"')
+
+
+class DeltaHistory:
+    """
+    Satır listesi döndüren endpoint'in son sonuç versiyonları. Versiyon, yanıtın
+    ETag özetidir; her versiyonun satırları Redis'te (cache backend'i) ayrı anahtarda,
+    son DELTA_HISTORY_SIZE versiyon da scope anahtarındaki sorted set'te (skor: kayıt
+    zamanı) tutulur. İstemci elindeki versiyonu gönderdiğinde yalnız eklenen/değişen
+    ve silinen satırlar döner.
+    """
+
+    def __init__(self, row_key: Sequence[str]):
+        self.row_key = tuple(row_key)
+
+    @staticmethod
+    def _index_key(scope: str) -> str:
+        return f"{scope}:delta-versions"
+
+    @staticmethod
+    def _version_key(scope: str, version: str) -> str:
+        return f"{scope}:delta={version}"
+
+    def _key_of(self, row: Row) -> Any:
+        if len(self.row_key) == 1:
+            return row.get(self.row_key[0])
+        return tuple(row.get(column) for column in self.row_key)
+
+    def _index(self, rows: List[Row]) -> Optional[Dict[Any, Row]]:
+        indexed = {self._key_of(row): row for row in rows}
+        # Anahtar tekil değilse satırlar eşlenemez; çağıran tam sonuca döner
+        return indexed if len(indexed) == len(rows) else None
+
+    @staticmethod
+    def applicable(value: Any) -> bool:
+        # Yalnız format=rows (sözlük listesi) sonuçları delta ile gönderilebilir
+        return isinstance(value, list) and all(isinstance(row, dict) for row in value[:1])
+
+    async def _versions(self, scope: str) -> List[str]:
+        raw = await FastAPICache.get_backend().get(self._index_key(scope))
+        return FastAPICache.get_coder().decode(raw) if raw else []
+
+    async def record(self, scope: str, version: str, rows: List[Row]) -> None:
+        """Sonucu geçmişe ekler; en eski versiyonlar indeksten ve Redis'ten düşer."""
+        if not self.applicable(rows):
+            return
+        redis = getattr(FastAPICache.get_backend(), "redis", None)
+        try:
+            if redis is None:
+                await self._record_local(scope, version, rows)
+            else:
+                await self._record_redis(redis, scope, version, rows)
+        except Exception:
+            logger.warning(f"Delta geçmişi yazılamadı: {scope}", exc_info=True)
+
+    async def _record_redis(self, redis: Any, scope: str, version: str, rows: List[Row]) -> None:
+        # Aynı anda hesaplayan replikalar birbirinin versiyonunu ezmesin: oku-değiştir-yaz
+        # yerine ZADD + sıraya göre kırpma tek MULTI/EXEC içinde çalışır
+        index_key, ttl = self._index_key(scope), settings.DELTA_HISTORY_TTL
+        if await redis.zscore(index_key, version) is not None:
+            return
+        keep = settings.DELTA_HISTORY_SIZE
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._version_key(scope, version), FastAPICache.get_coder().encode(rows), ex=ttl)
+            pipe.zadd(index_key, {version: time.time()}, nx=True)
+            pipe.zrange(index_key, 0, -keep - 1)
+            pipe.zremrangebyrank(index_key, 0, -keep - 1)
+            pipe.expire(index_key, ttl)
+            _, _, evicted, _, _ = await pipe.execute()
+        if evicted:
+            await redis.delete(*(self._version_key(scope, v.decode() if isinstance(v, bytes) else v) for v in evicted))
+
+    async def _record_local(self, scope: str, version: str, rows: List[Row]) -> None:
+        # Redis dışı backend (in-memory, tek süreç): liste olarak tutulur
+        backend, coder = FastAPICache.get_backend(), FastAPICache.get_coder()
+        ttl = settings.DELTA_HISTORY_TTL
+        versions = await self._versions(scope)
+        if version in versions:
+            return
+        await backend.set(self._version_key(scope, version), coder.encode(rows), ttl)
+        versions = [version, *versions]
+        for evicted in versions[settings.DELTA_HISTORY_SIZE:]:
+            await backend.clear(key=self._version_key(scope, evicted))
+        await backend.set(self._index_key(scope), coder.encode(versions[:settings.DELTA_HISTORY_SIZE]), ttl)
+
+    async def load(self, scope: str, version: str) -> Optional[List[Row]]:
+        try:
+            raw = await FastAPICache.get_backend().get(self._version_key(scope, version))
+            return FastAPICache.get_coder().decode(raw) if raw else None
+        except Exception:
+            logger.warning(f"Delta geçmişi okunamadı: {scope}", exc_info=True)
+            return None
+
+    def diff(self, base: List[Row], rows: List[Row]) -> Optional[Tuple[List[Row], List[Any]]]:
+        """(eklenen/değişen satırlar, silinen satır anahtarları); eşlenemezse None."""
+        before, after = self._index(base), self._index(rows)
+        if before is None or after is None:
+            return None
+        upserts = [row for key, row in after.items() if before.get(key) != row]
+        deletes = [list(key) if isinstance(key, tuple) else key for key in before if key not in after]
+        return upserts, deletes
+
+    async def respond(self, scope: str, base_version: str, version: str, rows: List[Row]) -> Dict[str, Any]:
+        """
+        delta_from isteğinin gövdesi. Taban versiyon geçmişte yoksa (süresi dolmuş,
+        hiç görülmemiş) tam sonuç döner: {"full": true, "rows": [...]}.
+        """
+        changes = None
+        if base_version == version:
+            changes = [], []
+        else:
+            base = await self.load(scope, base_version)
+            if base is not None:
+                changes = self.diff(base, rows)
+        if changes is None:
+            return {"version": version, "base": None, "full": True, "rows": rows}
+        upserts, deletes = changes
+        return {
+            "version": version,
+            "base": base_version,
+            "full": False,
+            "key": list(self.row_key),
+            "upserts": upserts,
+            "deletes": deletes,
+        }
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+from fastapi_cache import FastAPICache
+
+from services.cache.local import local_cache
+
+logger = logging.getLogger(__name__)
+
+# Kendi yayınladığımız mesajları ayırt etmek için replika kimliği
+REPLICA_ID = uuid.uuid4().hex
+
+
+def _redis():
+    try:
+        return getattr(FastAPICache.get_backend(), "redis", None)
+    except AssertionError:
+        return None
+
+
+def _channel() -> str:
+    return f"{FastAPICache.get_prefix()}:invalidate"
+
+
+async def publish_invalidation(key: str) -> None:
+    """Diğer replikalara bu anahtarın L1 kopyasını düşürmelerini bildirir."""
+    redis = _redis()
+    if redis is None:
+        return
+    try:
+        await redis.publish(_channel(), f"{REPLICA_ID}|{key}")
+    except Exception:
+        logger.warning(f"Cache invalidation yayınlanamadı: {key}", exc_info=True)
+
+
+class InvalidationListener:
+    """Redis pub/sub kanalını dinler ve başka replikanın yazdığı anahtarları L1'den siler."""
+
+    def __init__(self, local_cache):
+        self.local_cache = local_cache
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self, redis) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(_channel())
+                async for message in pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    origin, _, key = str(data).partition("|")
+                    if origin != REPLICA_ID:
+                        self.local_cache.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Bağlantı koptuysa mesaj kaçırılmış olabilir: L1'i boşalt ve yeniden bağlan
+                logger.warning(f"Cache invalidation dinleyicisi hata verdi: {e}")
+                self.local_cache.clear()
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    def start(self) -> None:
+        redis = _redis()
+        if self._task is None and redis is not None:
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+invalidation_listener = InvalidationListener(local_cache)
@@ -0,0 +1,56 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core.config import settings
+from services.arrow import negotiate_binary_format
+from services.cache.delta import DELTA_PARAM
+
+# Request yokken (doğrudan çağrı) anahtara sadece bu tiplerdeki argümanlar girer;
+# OracleService gibi inject edilen bağımlılıklar her istekte farklı olduğu için dışarıda kalır.
+_KEY_ARG_TYPES = (str, int, float, bool, type(None))
+
+
+def normalize_query(request: Request) -> str:
+    """
+    Query parametrelerini sıralı ve tekrar üretilebilir bir string'e çevirir.
+    delta_from sonucu değil yalnız gönderim biçimini değiştirdiği için dışarıda kalır.
+    """
+    return urlencode(sorted(
+        (name, value) for name, value in request.query_params.multi_items() if name != DELTA_PARAM
+    ))
+
+
+def gateway_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    fastapi-cache varsayılan key builder'ı handler kwargs'ını hash'ler; kwargs içinde
+    istek başına oluşturulan OracleService olduğu için anahtar her istekte değişir.
+    Burada anahtar: route path + normalize query + şema versiyonu
+    (+ Arrow/Parquet istenmişse ikili format).
+    """
+    if request is not None:
+        target = request.url.path
+        query = normalize_query(request)
+    else:
+        target = f"{func.__module__}.{func.__name__}"
+        query = urlencode(sorted(
+            (k, v) for k, v in (kwargs or {}).items() if isinstance(v, _KEY_ARG_TYPES)
+        ))
+
+    if query:
+        target = f"{target}?{query}"
+    # Arrow/Parquet isteyen istemci JSON girdisini almamalı (Accept ile değişen yanıt)
+    binary_format = negotiate_binary_format(request)
+    if binary_format:
+        target = f"{target}|{binary_format}"
+    return f"{namespace.rstrip(':')}:v{settings.CACHE_SCHEMA_VERSION}:{target}"
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from core.config import settings
+
+
+class LocalEntry(NamedTuple):
+    expires_at: float
+    size: int
+    entry: Dict[str, Any]
+    etag: str
+
+
+class LocalCache:
+    """
+    Redis önünde süreç içi L1 cache: çözülmüş (decode edilmiş) girdileri tutar,
+    böylece sık okunan büyük tablolar için Redis round-trip ve JSON decode atlanır.
+    LRU + TTL; bütçe girdilerin kodlanmış (Redis'teki) boyutu üzerinden hesaplanır.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, LocalEntry]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[LocalEntry]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if item.expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return item
+
+    def set(self, key: str, entry: Dict[str, Any], etag: str, size: int, ttl: Optional[float] = None) -> None:
+        self.delete(key)
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        while self._entries and self._bytes + size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+        self._entries[key] = LocalEntry(time.monotonic() + ttl, size, entry, etag)
+        self._bytes += size
+
+    def delete(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        l1_misses = self.l2_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_hit_ratio": round(self.l1_hits / lookups, 4) if lookups else 0.0,
+            # L1'de bulunamayanların ne kadarı Redis'ten geldi
+            "l2_hit_ratio": round(self.l2_hits / l1_misses, 4) if l1_misses else 0.0,
+        }
+
+
+local_cache = LocalCache(settings.CACHE_L1_MAX_BYTES, settings.CACHE_L1_TTL)
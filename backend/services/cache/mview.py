@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from core.config import settings
+from services.oracle import OracleService
+
+logger = logging.getLogger(__name__)
+
+# Dashboard endpoint'lerinin okuduğu materialized view'lar
+ORG_TREE_MV = "PERSONEL_ORG_AGACI_MV"
+ORG_TREE_MONTHLY_MV = "PERSONEL_ORG_AGACI_AYYIL_MV"
+ENGAGEMENT_MV = "PERSONEL_CALISAN_BAGLILIGI_MV"
+
+TRACKED_MVIEWS = (ORG_TREE_MV, ORG_TREE_MONTHLY_MV, ENGAGEMENT_MV)
+
+
+class MViewVersionTracker:
+    """
+    ALL_MVIEWS.LAST_REFRESH_DATE değerini periyodik olarak okur. MV yenilendiğinde
+    versiyon değişir; cache anahtarına eklenen versiyon sayesinde eski sonuçlar
+    anında devre dışı kalır, MV değişmediği sürece sonuçlar TTL'e takılmadan yaşar.
+    """
+
+    def __init__(self, owner: str, mviews: Sequence[str], interval: int):
+        self.owner = owner
+        self.mviews = tuple(mviews)
+        self.interval = interval
+        self._versions: Dict[str, str] = {}
+        self._previous: Dict[str, str] = {}
+        self._polled_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._listeners: List[Callable[[Set[str]], Awaitable[None]]] = []
+        self._notifications: Set[asyncio.Task] = set()
+
+    def _is_fresh(self) -> bool:
+        # Poll uzun süredir başarısızsa versiyonlara güvenme; TTL tabanlı cache'e dön
+        return self._polled_at is not None and time.monotonic() - self._polled_at < self.interval * 3
+
+    @staticmethod
+    def _join(names: Iterable[str], versions: Dict[str, str]) -> Optional[str]:
+        parts = []
+        for name in sorted(names):
+            version = versions.get(name)
+            if version is None:
+                return None
+            parts.append(version)
+        return ".".join(parts) or None
+
+    def version_for(self, mviews: Iterable[str]) -> Optional[str]:
+        if not self._is_fresh():
+            return None
+        return self._join(mviews, self._versions)
+
+    def previous_version_for(self, mviews: Iterable[str]) -> Optional[str]:
+        """Bir önceki yenilemenin versiyonu (Oracle hatasında son bilinen sonucu bulmak için)."""
+        if not self._is_fresh():
+            return None
+        mviews = list(mviews)
+        merged = {**self._versions, **{k: v for k, v in self._previous.items() if k in mviews}}
+        return self._join(mviews, merged)
+
+    async def poll(self) -> Dict[str, str]:
+        """Yenilenen MV'lerin yeni versiyonlarını döndürür."""
+        binds = {f"m{i}": name for i, name in enumerate(self.mviews)}
+        sql = f"""
+        SELECT MVIEW_NAME, LAST_REFRESH_DATE
+        FROM ALL_MVIEWS
+        WHERE OWNER = :owner
+          AND MVIEW_NAME IN ({", ".join(":" + b for b in binds)})
+        """
+        svc = OracleService()
+        try:
+            rows = await svc.execute_query_async(sql, {"owner": self.owner, **binds})
+        finally:
+            await svc.close_async()
+
+        if not isinstance(rows, list):
+            logger.warning(f"MV versiyonları okunamadı: {rows}")
+            return {}
+
+        changed = {}
+        for row in rows:
+            refreshed = row["LAST_REFRESH_DATE"]
+            version = refreshed.strftime("%Y%m%d%H%M%S") if refreshed else "0"
+            name = row["MVIEW_NAME"]
+            old = self._versions.get(name)
+            if old != version:
+                if old is not None:
+                    self._previous[name] = old
+                    changed[name] = version
+                self._versions[name] = version
+        self._polled_at = time.monotonic()
+        if changed:
+            logger.info(f"MV yenilemesi algılandı: {changed}")
+        return changed
+
+    def add_listener(self, callback: Callable[[Set[str]], Awaitable[None]]) -> None:
+        """MV yenilendiğinde yenilenen MV isimleriyle çağrılır (cache ısıtma, push vb.)."""
+        self._listeners.append(callback)
+
+    def _notify(self, changed: Set[str]) -> None:
+        for callback in self._listeners:
+            task = asyncio.create_task(callback(changed))
+            self._notifications.add(task)
+            task.add_done_callback(self._notifications.discard)
+
+    async def wait_ready(self, timeout: float) -> None:
+        """İlk poll denemesi bitene kadar bekler (başlangıçta versiyonsuz anahtar üretmemek için)."""
+        if self._ready is None:
+            return
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                changed = await self.poll()
+                if changed:
+                    self._notify(set(changed))
+            except Exception as e:
+                logger.warning(f"MV versiyon kontrolü başarısız: {e}")
+            self._ready.set()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            # Event loop içinde oluşturulmalı (Python 3.9'da Event oluşturulduğu loop'a bağlanır)
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+mview_tracker = MViewVersionTracker(settings.MVIEW_OWNER, TRACKED_MVIEWS, settings.MVIEW_POLL_INTERVAL)
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set
+
+from fastapi import FastAPI
+
+from core.config import settings
+from core.responses import dumps
+from services.cache.batch import match_route, resolve_batch
+from services.cache.decorator import etag_for
+from services.cache.delta import parse_version
+from services.cache.mview import mview_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """Bir SSE bağlantısı. Path başına yalnız en son sonuç bekletilir (yavaş istemci birikmez)."""
+
+    def __init__(self, paths: Sequence[str]):
+        self.paths = tuple(dict.fromkeys(paths))
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    def offer(self, item: Dict[str, Any]) -> None:
+        self.pending[item["path"]] = item
+        self._wakeup.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """Bekleyen güncellemeler; timeout dolarsa boş liste (heartbeat zamanı)."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._wakeup.clear()
+        items, self.pending = list(self.pending.values()), {}
+        return items
+
+
+def _event(item: Dict[str, Any]) -> bytes:
+    event = "update" if item["status"] != "ERROR" else "error"
+    head = f"event: {event}\n"
+    if item.get("version"):
+        head += f"id: {item['version']}\n"
+    return head.encode() + b"data: " + dumps(item) + b"\n\n"
+
+
+class PushHub:
+    """
+    Dashboard path'lerine abone olan SSE istemcilerine MV yenilemesinde sonucu iter.
+    Yenileme algılandığında etkilenen ve en az bir abonesi olan her path bir kez
+    çözülür (resolve_batch: cache + single-flight, warmer'la aynı anahtar) ve sonucu
+    değiştiyse tüm abonelerine gönderilir; istemcilerin periyodik poll'u gereksizleşir.
+    """
+
+    def __init__(self, heartbeat: int, max_subscribers: int):
+        self.heartbeat = heartbeat
+        self.max_subscribers = max_subscribers
+        self.pushes = 0
+        self._app: Optional[FastAPI] = None
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._versions: Dict[str, str] = {}
+        self._started = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return len({sub for subs in self._subscribers.values() for sub in subs})
+
+    def _register(self, subscriber: Subscriber) -> None:
+        for path in subscriber.paths:
+            self._subscribers.setdefault(path, set()).add(subscriber)
+
+    def _unregister(self, subscriber: Subscriber) -> None:
+        for path in subscriber.paths:
+            subs = self._subscribers.get(path)
+            if subs is None:
+                continue
+            subs.discard(subscriber)
+            if not subs:
+                del self._subscribers[path]
+                self._versions.pop(path, None)
+
+    async def _resolve(self, paths: Sequence[str]) -> List[Dict[str, Any]]:
+        items = await resolve_batch(self._app, paths)
+        for item in items:
+            if "data" in item:
+                item["version"] = parse_version(etag_for(dumps(item["data"])))
+        return items
+
+    async def on_mview_refresh(self, changed: Set[str]) -> None:
+        paths = []
+        for path in list(self._subscribers):
+            spec, _ = match_route(self._app, path)
+            if spec is not None and changed.intersection(spec.mviews):
+                paths.append(path)
+        if not paths:
+            return
+        for item in await self._resolve(paths):
+            path = item["path"]
+            version = item.get("version")
+            if version is not None and self._versions.get(path) == version:
+                continue  # MV yenilendi ama bu panelin sonucu değişmedi
+            if version is not None:
+                self._versions[path] = version
+            for subscriber in self._subscribers.get(path, ()):
+                subscriber.offer(item)
+                self.pushes += 1
+        logger.info(f"MV yenilemesi {len(paths)} abone path'e iletildi")
+
+    async def stream(self, app: FastAPI, paths: Sequence[str]) -> AsyncIterator[bytes]:
+        """
+        SSE akışı: önce her path'in güncel sonucu (ETag özeti 'version' ile), sonra
+        yalnız değişen sonuçlar. Bağlantı kapanınca (istemci, uygulama kapanışı)
+        abonelik silinir.
+        """
+        self._app = app
+        subscriber = Subscriber(paths)
+        self._register(subscriber)
+        try:
+            # Bağlantı koparsa EventSource bu kadar ms sonra yeniden bağlanır
+            yield f"retry: {self.heartbeat * 1000}\n\n".encode()
+            for item in await self._resolve(paths):
+                if item.get("version") is not None:
+                    self._versions.setdefault(item["path"], item["version"])
+                yield _event(item)
+            while not subscriber.closed:
+                items = await subscriber.next_batch(self.heartbeat)
+                if not items:
+                    # Proxy'ler boşta bağlantıyı kesmesin
+                    yield b": keep-alive\n\n"
+                for item in items:
+                    yield _event(item)
+        finally:
+            self._unregister(subscriber)
+
+    def accepts(self) -> bool:
+        return self.subscriber_count < self.max_subscribers
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscriber_count,
+            "paths": {path: len(subs) for path, subs in self._subscribers.items()},
+            "pushes": self.pushes,
+        }
+
+    def start(self, app: FastAPI) -> None:
+        if not self._started:
+            self._app = app
+            self._started = True
+            mview_tracker.add_listener(self.on_mview_refresh)
+
+    def stop(self) -> None:
+        for subs in list(self._subscribers.values()):
+            for subscriber in list(subs):
+                subscriber.close()
+
+
+push_hub = PushHub(settings.PUSH_HEARTBEAT_INTERVAL, settings.PUSH_MAX_SUBSCRIBERS)
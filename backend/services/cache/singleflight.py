@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı istekleri tek bir çalışmada birleştirir.
+    Çalışma ayrı bir task'ta yürür; bekleyen isteklerden biri iptal edilse bile
+    diğerleri sonucu almaya devam eder.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def _start(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+
+            def _done(t: asyncio.Future) -> None:
+                if self._flights.get(key) is t:
+                    del self._flights[key]
+                # Kimse beklemiyorsa "exception was never retrieved" uyarısını engelle
+                if not t.cancelled() and t.exception() is not None:
+                    logger.warning(f"Cache yenileme hatası ({key}): {t.exception()}")
+
+            task.add_done_callback(_done)
+        return task
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        return await asyncio.shield(self._start(key, factory))
+
+    def launch(self, key: str, factory: Callable[[], Awaitable[Any]]) -> None:
+        """Sonucu beklemeden arka planda çalıştırır (zaten çalışıyorsa tekrar başlatmaz)."""
+        self._start(key, factory)
+
+
+flights = SingleFlight()
@@ -0,0 +1,69 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+
+
+class CacheStats:
+    """Endpoint bazında cache durum sayaçları (HIT/MISS/...). Süreç içi, replika başına tutulur."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, status: str) -> None:
+        with self._lock:
+            self._counters[endpoint][status] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for endpoint, counts in self._counters.items():
+                hits = counts.get("HIT", 0)
+                # STALE ve STALE-ERROR da cache'ten sunulur (Oracle beklenmez)
+                stale = sum(n for status, n in counts.items() if status.startswith("STALE"))
+                total = sum(counts.values())
+                result[endpoint] = {
+                    "hits": hits,
+                    "stale": stale,
+                    "misses": counts.get("MISS", 0),
+                    "total": total,
+                    "hit_ratio": round((hits + stale) / total, 4) if total else 0.0,
+                    "fresh_hit_ratio": round(hits / total, 4) if total else 0.0,
+                    "statuses": dict(counts),
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+cache_stats = CacheStats()
+
+
+class CacheStatsMiddleware:
+    """
+    Saf ASGI middleware: response başlığındaki cache durumunu (X-FastAPI-Cache)
+    okuyup route şablonu bazında sayar. Body'ye dokunmadığı için ek maliyeti yoktur.
+    """
+
+    def __init__(self, app, header_name: str = "X-FastAPI-Cache"):
+        self.app = app
+        self.header_name = header_name.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                for name, value in message.get("headers", []):
+                    if name.lower() == self.header_name:
+                        route = scope.get("route")
+                        endpoint = getattr(route, "path", scope.get("path", ""))
+                        cache_stats.record(endpoint, value.decode().upper())
+                        break
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
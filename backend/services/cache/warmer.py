@@ -0,0 +1,102 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import FastAPI
+
+from core.config import settings
+from services.cache.decorator import CachedEndpoint, cached_routes
+from services.cache.mview import mview_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """
+    Kayıtlı @cache endpoint'lerini Grafana'dan önce hesaplar: uygulama açılışında,
+    MV yenilendiğinde ve periyodik olarak. Paralellik CACHE_WARM_CONCURRENCY ile
+    sınırlıdır; her endpoint için son ısıtma süresi raporlanır.
+    """
+
+    def __init__(self, concurrency: int, interval: int):
+        self.concurrency = concurrency
+        self.interval = interval
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._app: Optional[FastAPI] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def targets(self, mviews: Optional[Set[str]] = None, app: Optional[FastAPI] = None) -> List[Tuple[str, CachedEndpoint]]:
+        """Isıtılabilecek (GET, path parametresiz) cache'li route'lar; app verilmezse start()'taki."""
+        app = app or self._app
+        result = []
+        for route, spec in cached_routes(app) if app else []:
+            if "GET" not in route.methods or route.param_convertors:
+                continue
+            if mviews is not None and not mviews.intersection(spec.mviews):
+                continue
+            result.append((route.path, spec))
+        return result
+
+    async def _warm_one(self, semaphore: asyncio.Semaphore, path: str, spec: CachedEndpoint, min_remaining: float) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                status = await spec.warm(path, min_remaining)
+            except Exception as e:
+                status = "error"
+                logger.warning(f"Cache ısıtma hatası ({path}): {e}")
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        self.stats[path] = {
+            "status": status,
+            "duration_ms": duration_ms,
+            "warmed_at": datetime.datetime.utcnow().isoformat(),
+        }
+        if status == "warmed":
+            logger.info(f"Cache ısıtıldı: {path} ({duration_ms} ms)")
+
+    async def warm(self, targets: Iterable[Tuple[str, CachedEndpoint]], min_remaining: float = 0) -> Dict[str, Dict[str, Any]]:
+        # Aynı anda tek ısıtma turu: MV yenilemesi ile periyodik tur üst üste binmesin
+        # Kilit ilk kullanımda kurulur: CACHE_WARM_ENABLED=false iken (start() yok) elle ısıtma da çalışır
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            started = time.perf_counter()
+            targets = list(targets)
+            await asyncio.gather(*(self._warm_one(semaphore, path, spec, min_remaining) for path, spec in targets))
+            logger.info(f"Cache ısıtma turu: {len(targets)} endpoint, {round(time.perf_counter() - started, 1)} sn")
+        return {path: self.stats[path] for path, _ in targets}
+
+    async def on_mview_refresh(self, changed: Set[str]) -> None:
+        await self.warm(self.targets(changed))
+
+    async def _run(self) -> None:
+        await mview_tracker.wait_ready(timeout=30)
+        while True:
+            # Bir sonraki tura kadar süresi dolacak girdiler yenilenir, diğerlerine dokunulmaz
+            await self.warm(self.targets(), min_remaining=self.interval)
+            if self.interval <= 0:
+                return
+            await asyncio.sleep(self.interval)
+
+    def start(self, app: FastAPI) -> None:
+        if self._task is None:
+            self._app = app
+            mview_tracker.add_listener(self.on_mview_refresh)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+cache_warmer = CacheWarmer(settings.CACHE_WARM_CONCURRENCY, settings.CACHE_WARM_INTERVAL)
@@ -9,6 +9,13 @@ class QueryExecutor(Protocol):
     def close(self) -> None: ...
 
 
+class AsyncQueryExecutor(Protocol):
+    """Async DB executor interface (event loop'u bloklamadan sorgu)."""
+
+    async def execute_query_async(self, sql_query: str, params: Optional[Dict[str, Any]] = None) -> Any: ...
+    async def close_async(self) -> None: ...
+
+
 class SchemaProvider(Protocol):
     """Exposes database schema summary for LLM prompts."""
 
@@ -0,0 +1,49 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from core.config import settings
+from services.db.base import SchemaProvider
+from services.oracle import OracleService
+
+
+class CachedSchemaProvider:
+    """
+    LLM prompt'una giren şema özetini süreç içinde tutar. Kaynak provider yalnız
+    ilk çağrıda ve ttl dolunca (0: süresiz) oluşturulur; istek başına Oracle
+    servisi ya da bağlantı gerekmez.
+    """
+
+    def __init__(self, factory: Callable[[], SchemaProvider], ttl: int):
+        self.factory = factory
+        self.ttl = ttl
+        self._schema: Optional[str] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        if self._schema is None:
+            return False
+        return self.ttl <= 0 or time.monotonic() - self._loaded_at < self.ttl
+
+    def get_schema_info(self) -> str:
+        if self._is_fresh():
+            return self._schema
+        with self._lock:
+            if not self._is_fresh():
+                source = self.factory()
+                try:
+                    self._schema = source.get_schema_info()
+                finally:
+                    # Kaynak bağlantı aldıysa hemen havuza iade edilir
+                    close = getattr(source, "close", None)
+                    if close is not None:
+                        close()
+                self._loaded_at = time.monotonic()
+        return self._schema
+
+    def invalidate(self) -> None:
+        self._schema = None
+
+
+schema_provider = CachedSchemaProvider(OracleService, settings.SCHEMA_CACHE_TTL)
@@ -1,4 +1,10 @@
-from .service import run_agent
+# Ajan (langgraph/langchain) ilk kullanımda yüklenir: sql_cache/result_cache gibi
+# alt modüller bu bağımlılıklar olmadan da içe aktarılabilir (testler, benchmark'lar)
+__all__ = ["run_agent", "arun_agent"]
 
-__all__ = ["run_agent"]
 
+def __getattr__(name):
+    if name in __all__:
+        from . import service
+        return getattr(service, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,12 +2,22 @@ from typing import TypedDict, Union, Optional, List, Dict, Any
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
 import json
+import logging
 import re
+from functools import lru_cache
 from typing import Callable
 
+from langchain_core.runnables import RunnableConfig
+
 from services.llm.model import get_llm
 from services.llm.prompts import build_system_prompt, build_user_content
-from services.db.base import QueryExecutor
+from services.llm.sql_cache import sql_cache
+from services.llm.result_cache import ai_result_cache, is_read_only
+from core.config import settings
+from services.db.base import AsyncQueryExecutor, QueryExecutor
+from services.oracle import OracleService
+
+logger = logging.getLogger(__name__)
 
 
 class AgentState(TypedDict):
@@ -17,25 +27,22 @@ class AgentState(TypedDict):
     query_result: Union[List[Any], Dict[str, Any], str, None]
     error: Optional[str]
     attempts: int
+    # sql_query soru -> SQL önbelleğinden geldiyse True (LLM çağrılmadı)
+    cached: bool
 
 
-def generate_sql_node(state: AgentState) -> Dict[str, Any]:
-    question = state["question"]
-    schema = state["schema"]
-    error = state.get("error")
-
-    system_prompt = build_system_prompt(schema)
-    user_content = build_user_content(question, error)
-
-    messages = [
+def _build_messages(state: AgentState) -> List[Any]:
+    system_prompt = build_system_prompt(state["schema"])
+    user_content = build_user_content(state["question"], state.get("error"))
+    return [
         SystemMessage(content=system_prompt),
         HumanMessage(content=user_content),
     ]
 
+
+def _parse_sql(content: str) -> str:
     try:
-        llm = get_llm()
-        response = llm.invoke(messages)
-        parsed = json.loads(response.content)
+        parsed = json.loads(content)
         raw_sql = parsed.get("sql", "")
 
         # --- ZORLA DÜZELTME (REGEX) ---
@@ -51,42 +58,132 @@ def generate_sql_node(state: AgentState) -> Dict[str, Any]:
         if "TOP " in clean_sql.upper():
             clean_sql = re.sub(r"SELECT\s+TOP\s+\d+\s+", "SELECT ", clean_sql, flags=re.IGNORECASE)
 
-        print(f"DEBUG - Üretilen SQL: {clean_sql}")
+        logger.debug(f"Üretilen SQL: {clean_sql}")
 
     except Exception as e:
-        print(f"LLM Parse Hatası: {e}")
+        logger.exception(f"LLM Parse Hatası: {e}")
         clean_sql = "ERROR_PARSING"
 
+    return clean_sql
+
+
+def lookup_sql_node(state: AgentState) -> Dict[str, Any]:
+    if settings.SQL_CACHE_ENABLED:
+        sql = sql_cache.lookup(state["question"], state["schema"])
+        if sql:
+            logger.debug(f"Önbellekteki SQL kullanılıyor: {sql}")
+            return {"sql_query": sql, "cached": True}
+    return {"cached": False}
+
+
+def route_after_lookup(state: AgentState) -> str:
+    return "execute" if state.get("cached") else "generate"
+
+
+def generate_sql_node(state: AgentState) -> Dict[str, Any]:
+    try:
+        content = get_llm().invoke(_build_messages(state)).content
+    except Exception as e:
+        logger.exception(f"LLM Hatası: {e}")
+        content = ""
+
     return {
-        "sql_query": clean_sql,
+        "sql_query": _parse_sql(content),
         "attempts": state.get("attempts", 0) + 1,
+        "cached": False,
     }
 
 
-def make_execute_sql_node(executor_factory: Callable[[], QueryExecutor]):
-    def execute_sql_node(state: AgentState) -> Dict[str, Any]:
-        sql = state["sql_query"]
-        print(f"--- SQL Çalıştırılıyor: {sql} ---")
+async def agenerate_sql_node(state: AgentState) -> Dict[str, Any]:
+    # Ollama çağrısı thread tutmadan beklenir
+    try:
+        content = (await get_llm().ainvoke(_build_messages(state))).content
+    except Exception as e:
+        logger.exception(f"LLM Hatası: {e}")
+        content = ""
+
+    return {
+        "sql_query": _parse_sql(content),
+        "attempts": state.get("attempts", 0) + 1,
+        "cached": False,
+    }
+
+
+def _query_outcome(state: AgentState, result: Any) -> Dict[str, Any]:
+    if isinstance(result, dict) and "error" in result:
+        return _failure(state, result["error"])
+
+    # Yazma ifadeleri ve satır listesi olmayan sonuçlar (ör. etkilenen satır sayısı) saklanmaz
+    if (
+        settings.SQL_CACHE_ENABLED and not state.get("cached")
+        and isinstance(result, list) and is_read_only(state["sql_query"])
+    ):
+        sql_cache.store(state["question"], state["schema"], state["sql_query"])
+    return {"query_result": result, "error": None}
 
-        if sql == "ERROR_PARSING" or not sql:
-            return {"error": "SQL üretilemedi", "query_result": None}
 
-        executor = executor_factory()
+def _failure(state: AgentState, error: str) -> Dict[str, Any]:
+    if state.get("cached"):
+        # Şema/veri değişmiş olabilir: girdi düşer, retry LLM ile yeniden üretir
+        sql_cache.discard(state["sql_query"])
+    return {"error": error, "query_result": None}
 
-        try:
-            executor.connect()
-            result = executor.execute_query(sql)
-            executor.close()
 
-            if isinstance(result, dict) and "error" in result:
-                return {"error": result["error"], "query_result": None}
+def _executor_factory(config: Optional[RunnableConfig]) -> Callable[[], Any]:
+    # Derlenmiş graf paylaşılır; isteğe özgü executor config["configurable"] ile gelir
+    return ((config or {}).get("configurable") or {}).get("executor_factory", OracleService)
 
-            return {"query_result": result, "error": None}
 
-        except Exception as e:
-            return {"error": str(e), "query_result": None}
+def execute_sql_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    sql = state["sql_query"]
+    logger.debug(f"SQL çalıştırılıyor: {sql}")
 
-    return execute_sql_node
+    if sql == "ERROR_PARSING" or not sql:
+        return {"error": "SQL üretilemedi", "query_result": None}
+
+    # Bağlantı yalnız sorgu süresince tutulur; LLM üretimi ve retry'lar boyunca havuzda kalır
+    executor: QueryExecutor = _executor_factory(config)()
+
+    try:
+        executor.connect()
+        result = executor.execute_query(sql)
+    except Exception as e:
+        return _failure(state, str(e))
+    finally:
+        executor.close()
+
+    return _query_outcome(state, result)
+
+
+async def aexecute_sql_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    sql = state["sql_query"]
+    logger.debug(f"SQL çalıştırılıyor (async): {sql}")
+
+    if sql == "ERROR_PARSING" or not sql:
+        return {"error": "SQL üretilemedi", "query_result": None}
+
+    # Farklı sorulardan üretilen aynı SQL (kanonik özet) Oracle'a tekrar gitmez;
+    # yazma ifadeleri cache'e hiç bakmadan her seferinde çalışır
+    read_only = is_read_only(sql)
+    if read_only:
+        cached = await ai_result_cache.get(sql)
+        if cached is not None:
+            return _query_outcome(state, cached)
+
+    # Async havuzdan alınan bağlantı yalnız sorgu süresince tutulur
+    executor: AsyncQueryExecutor = _executor_factory(config)()
+
+    try:
+        result = await executor.execute_query_async(sql)
+    except Exception as e:
+        return _failure(state, str(e))
+    finally:
+        await executor.close_async()
+
+    outcome = _query_outcome(state, result)
+    if outcome["error"] is None and read_only and isinstance(result, list):
+        await ai_result_cache.set(sql, result)
+    return outcome
 
 
 def should_continue(state: AgentState) -> str:
@@ -102,11 +199,21 @@ def should_continue(state: AgentState) -> str:
     return "retry"
 
 
-def build_app_graph(executor_factory: Callable[[], QueryExecutor]):
+def _compile_graph(generate_node: Callable, execute_node: Callable):
     workflow = StateGraph(AgentState)
-    workflow.add_node("generate_sql", generate_sql_node)
-    workflow.add_node("execute_sql", make_execute_sql_node(executor_factory))
-    workflow.set_entry_point("generate_sql")
+    workflow.add_node("lookup_sql", lookup_sql_node)
+    workflow.add_node("generate_sql", generate_node)
+    workflow.add_node("execute_sql", execute_node)
+    # Tekrar eden soru önbellekteki SQL ile doğrudan çalıştırılır
+    workflow.set_entry_point("lookup_sql")
+    workflow.add_conditional_edges(
+        "lookup_sql",
+        route_after_lookup,
+        {
+            "execute": "execute_sql",
+            "generate": "generate_sql",
+        },
+    )
     workflow.add_edge("generate_sql", "execute_sql")
     workflow.add_conditional_edges(
         "execute_sql",
@@ -118,3 +225,23 @@ def build_app_graph(executor_factory: Callable[[], QueryExecutor]):
     )
     return workflow.compile()
 
+
+def build_app_graph():
+    return _compile_graph(generate_sql_node, execute_sql_node)
+
+
+def build_async_app_graph():
+    """Aynı akış, async düğümlerle: graph.ainvoke ile çalıştırılır."""
+    return _compile_graph(agenerate_sql_node, aexecute_sql_node)
+
+
+# StateGraph kurulumu ve compile() istek başına değil süreç başına bir kez yapılır;
+# executor isteğe göre config üzerinden verildiği için tek graf tüm isteklere yeter
+@lru_cache(maxsize=None)
+def get_app_graph():
+    return build_app_graph()
+
+
+@lru_cache(maxsize=None)
+def get_async_app_graph():
+    return build_async_app_graph()
@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi_cache import FastAPICache
+
+from core.config import settings
+from services.cache.decorator import cache_ready
+from services.cache.mview import TRACKED_MVIEWS, mview_tracker
+
+logger = logging.getLogger(__name__)
+
+# String literal ('' kaçışlı), tırnaklı tanımlayıcı, sayı, kelime, çok karakterli operatör, tek karakter
+_TOKEN = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|\d+(?:\.\d+)?|\w+|<>|!=|<=|>=|\|\||\S""")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?$")
+
+
+def _is_literal(token: str) -> bool:
+    return token.startswith("'") or bool(_NUMBER.match(token))
+
+
+def _sorted_in_lists(tokens: List[str]) -> List[str]:
+    # IN ('B', 'A') ile IN ('A', 'B') aynı sorgudur: yalnız literal listeleri sıralanır
+    result: List[str] = []
+    i = 0
+    while i < len(tokens):
+        result.append(tokens[i])
+        if tokens[i] == "IN" and i + 1 < len(tokens) and tokens[i + 1] == "(":
+            end = tokens.index(")", i + 1) if ")" in tokens[i + 1:] else -1
+            items = tokens[i + 2:end] if end > 0 else []
+            values, separators = items[0::2], items[1::2]
+            if values and all(_is_literal(v) for v in values) and all(s == "," for s in separators):
+                result.append("(")
+                result.append(" , ".join(sorted(values)))
+                result.append(")")
+                i = end + 1
+                continue
+        i += 1
+    return result
+
+
+def canonical_sql(sql: str) -> str:
+    """
+    Aynı sorguyu yazan farklı SQL metinleri için tek biçim: boşluklar tekleşir,
+    literal ve tırnaklı tanımlayıcılar dışındaki her şey büyük harfe çevrilir,
+    sondaki ';' atılır ve IN (...) literal listeleri sıralanır.
+    """
+    tokens = [
+        token if token[0] in "'\"" else token.upper()
+        for token in _TOKEN.findall(sql)
+    ]
+    while tokens and tokens[-1] == ";":
+        tokens.pop()
+    return " ".join(_sorted_in_lists(tokens))
+
+
+def is_read_only(sql: str) -> bool:
+    # Yalnız SELECT/WITH sorgularının sonucu cache'lenebilir; DML/DDL her seferinde çalışmalı
+    tokens = canonical_sql(sql).split(" ", 1)
+    return tokens[0] in ("SELECT", "WITH")
+
+
+def sql_fingerprint(sql: str) -> str:
+    return hashlib.sha1(canonical_sql(sql).encode()).hexdigest()  # noqa: S324
+
+
+def referenced_mviews(sql: str) -> Tuple[str, ...]:
+    canonical = canonical_sql(sql)
+    return tuple(name for name in TRACKED_MVIEWS if re.search(rf"\b{name}\b", canonical))
+
+
+class AIResultCache:
+    """
+    AI ajanının çalıştırdığı SQL sonuçları için Redis cache'i. Anahtar kanonik SQL
+    özetidir; farklı sorulardan aynı SQL üretildiğinde Oracle'a tekrar gidilmez.
+    Sorgunun okuduğu MV'lerin yenileme versiyonu anahtara eklenir (dashboard
+    cache'i gibi): MV yenilenince eski sonuçlar kendiliğinden devre dışı kalır.
+    Kodlanmış hali max_bytes'ı aşan sonuçlar cache'lenmez.
+    """
+
+    def __init__(self, ttl: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.oversize = 0
+
+    def _key(self, sql: str) -> Tuple[str, int]:
+        key = f"{FastAPICache.get_prefix()}:ai:v{settings.CACHE_SCHEMA_VERSION}:{sql_fingerprint(sql)}"
+        mviews = referenced_mviews(sql)
+        version = mview_tracker.version_for(mviews) if mviews else None
+        if version:
+            return f"{key}:mv={version}", settings.MVIEW_CACHE_TTL
+        return key, self.ttl
+
+    async def get(self, sql: str) -> Optional[Any]:
+        if not settings.AI_RESULT_CACHE_ENABLED or not cache_ready():
+            return None
+        key, _ = self._key(sql)
+        try:
+            raw = await FastAPICache.get_backend().get(key)
+        except Exception:
+            logger.warning(f"AI sonuç cache'i okunamadı: {key}", exc_info=True)
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return FastAPICache.get_coder().decode(raw)
+
+    async def set(self, sql: str, result: Any) -> None:
+        if not settings.AI_RESULT_CACHE_ENABLED or not cache_ready():
+            return
+        key, ttl = self._key(sql)
+        try:
+            raw = FastAPICache.get_coder().encode(result)
+            if len(raw) > self.max_bytes:
+                self.oversize += 1
+                return
+            await FastAPICache.get_backend().set(key, raw, ttl)
+            self.stored += 1
+        except Exception:
+            logger.warning(f"AI sonuç cache'i yazılamadı: {key}", exc_info=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "stored": self.stored,
+            "oversize": self.oversize,
+            "max_bytes": self.max_bytes,
+        }
+
+
+ai_result_cache = AIResultCache(settings.AI_RESULT_CACHE_TTL, settings.AI_RESULT_CACHE_MAX_BYTES)
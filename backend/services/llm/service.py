@@ -1,31 +1,52 @@
-from typing import Callable
+from typing import Any, Callable, Dict
 
-from services.llm.graph import AgentState, build_app_graph
-from services.db.base import QueryExecutor
+from services.llm.graph import AgentState, get_app_graph, get_async_app_graph
+from services.db.base import AsyncQueryExecutor, QueryExecutor
 from services.oracle import OracleService
 
 
-def run_agent(
-    user_question: str,
-    schema_info: str,
-    executor_factory: Callable[[], QueryExecutor] = OracleService,
-):
-    inputs: AgentState = {
+def _initial_state(user_question: str, schema_info: str) -> AgentState:
+    return {
         "question": user_question,
         "schema": schema_info,
         "attempts": 0,
         "error": None,
         "sql_query": "",
         "query_result": None,
+        "cached": False,
     }
 
-    graph = build_app_graph(executor_factory)
-    result = graph.invoke(inputs, config={"recursion_limit": 15})
 
+def _config(executor_factory: Callable[[], Any]) -> Dict[str, Any]:
+    return {"recursion_limit": 15, "configurable": {"executor_factory": executor_factory}}
+
+
+def _agent_result(result: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "sql": result.get("sql_query"),
         "data": result.get("query_result"),
         "error": result.get("error"),
         "explanation": f"SQL: {result.get('sql_query')}",
+        "cached": bool(result.get("cached")),
     }
 
+
+def run_agent(
+    user_question: str,
+    schema_info: str,
+    executor_factory: Callable[[], QueryExecutor] = OracleService,
+):
+    result = get_app_graph().invoke(_initial_state(user_question, schema_info), config=_config(executor_factory))
+    return _agent_result(result)
+
+
+async def arun_agent(
+    user_question: str,
+    schema_info: str,
+    executor_factory: Callable[[], AsyncQueryExecutor] = OracleService,
+):
+    # LLM (ChatOllama.ainvoke) ve Oracle (async havuz) beklemeleri thread tutmaz
+    result = await get_async_app_graph().ainvoke(
+        _initial_state(user_question, schema_info), config=_config(executor_factory),
+    )
+    return _agent_result(result)
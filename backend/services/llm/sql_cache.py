@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Yalnız sorunun anlamını değiştirmeyen nezaket/soru ekleri atılır. Bağlaçlar
+# ("ve", "veya", "ya"), sayı/niteleme kelimeleri ("bir", "olan") ve kolon değerleri
+# kalır: "X veya Y" ile "X Y" farklı SQL gerektirir, aynı anahtara düşmemeli.
+STOPWORDS = frozenset({
+    "acaba", "bana", "bize", "lütfen", "mi", "mı", "mu", "mü",
+    "misin", "mısın", "musun", "müsün", "nedir", "nelerdir",
+})
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def turkish_casefold(text: str) -> str:
+    # str.lower() 'I' -> 'i' ve 'İ' -> 'i̇' (birleşik nokta) üretir; Türkçe kurala göre önce eşlenir
+    text = unicodedata.normalize("NFC", text)
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def normalize_question(question: str) -> str:
+    """Türkçe küçük harf + noktalama/boşluk sadeleştirme + stopword ayıklama."""
+    text = _PUNCTUATION.sub(" ", turkish_casefold(question))
+    words = [word for word in _WHITESPACE.split(text) if word and word not in STOPWORDS]
+    return " ".join(words)
+
+
+def schema_fingerprint(schema: str) -> str:
+    return hashlib.md5(schema.encode()).hexdigest()  # noqa: S324
+
+
+class CachedSQL(NamedTuple):
+    sql: str
+    schema: str
+    stored_at: float
+
+
+class SQLCache:
+    """
+    Soru -> başarıyla çalışmış SQL. Normalize edilmiş soru birebir eşleşirse LLM
+    atlanır; similarity > 0 ise scikit-learn TF-IDF (karakter n-gram) kosinüs
+    benzerliği eşiği geçen en yakın soru da kullanılır. Girdiler şema özetine
+    bağlıdır; şema değişirse ya da SQL artık hata veriyorsa girdi düşer.
+    Süreç içi LRU; senkron ve async ajan grafı birlikte kullanır.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, similarity: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedSQL]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._index: Optional[Any] = None  # (vectorizer, matris, anahtarlar)
+
+    def _alive(self, entry: CachedSQL, schema: str) -> bool:
+        if entry.schema != schema:
+            return False
+        return self.ttl <= 0 or time.time() - entry.stored_at < self.ttl
+
+    def _nearest(self, key: str) -> Optional[str]:
+        if self.similarity <= 0 or not self._entries:
+            return None
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.metrics.pairwise import linear_kernel
+        except ImportError:
+            return None
+        if self._index is None:
+            keys = list(self._entries)
+            vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4))
+            self._index = (vectorizer, vectorizer.fit_transform(keys), keys)
+        vectorizer, matrix, keys = self._index
+        # TF-IDF satırları L2 normlu: doğrusal çekirdek = kosinüs benzerliği
+        scores = linear_kernel(vectorizer.transform([key]), matrix)[0]
+        best = int(scores.argmax())
+        return keys[best] if scores[best] >= self.similarity else None
+
+    def lookup(self, question: str, schema: str) -> Optional[str]:
+        key = normalize_question(question)
+        fingerprint = schema_fingerprint(schema)
+        with self._lock:
+            entry = self._entries.get(key)
+            similar = False
+            if entry is None:
+                nearest = self._nearest(key)
+                entry = self._entries.get(nearest) if nearest else None
+                similar = entry is not None
+                key = nearest or key
+            if entry is None or not self._alive(entry, fingerprint):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if similar:
+                self.similar_hits += 1
+            else:
+                self.hits += 1
+        return entry.sql
+
+    def store(self, question: str, schema: str, sql: str) -> None:
+        key = normalize_question(question)
+        if not key:
+            return
+        with self._lock:
+            self._entries[key] = CachedSQL(sql, schema_fingerprint(schema), time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._index = None
+
+    def discard(self, sql: str) -> None:
+        """Önbellekten gelen SQL hata verdiyse onu döndüren tüm girdiler (benzer sorular dahil) düşer."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.sql == sql]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._index = None
+                logger.info(f"Önbellekteki SQL geçersiz, {len(stale)} girdi silindi: {sql}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._index = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.similar_hits) / lookups, 3) if lookups else None,
+            "similarity_threshold": self.similarity,
+        }
+
+
+sql_cache = SQLCache(settings.SQL_CACHE_MAX_ENTRIES, settings.SQL_CACHE_TTL, settings.SQL_CACHE_SIMILARITY)
@@ -1,6 +1,10 @@
 import oracledb
+import pyarrow as pa
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from core.config import settings
 from services.db.base import QueryExecutor, SchemaProvider
@@ -9,6 +13,14 @@ logger = logging.getLogger(__name__)
 
 # Global Bağlantı Havuzu
 _pool = None
+# asyncio sürücüsü (thin mode) için ayrı havuz; kurulamazsa None kalır
+_async_pool = None
+
+# Async havuz yoksa bloklayan Oracle çağrıları bu sınırlı thread havuzunda çalışır.
+# İşçi sayısı pool max ile aynı: fazlası zaten bağlantı beklerdi.
+_executor = ThreadPoolExecutor(max_workers=settings.ORACLE_POOL_MAX, thread_name_prefix="oracle")
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER")
 
 def init_pool():
     global _pool
@@ -19,7 +31,11 @@ def init_pool():
                 user=settings.ORACLE_USER,
                 password=settings.ORACLE_PASSWORD,
                 dsn=settings.ORACLE_DSN,
-                min=2, max=10, increment=1
+                min=settings.ORACLE_POOL_MIN,
+                max=settings.ORACLE_POOL_MAX,
+                increment=settings.ORACLE_POOL_INCREMENT,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=settings.ORACLE_POOL_WAIT_TIMEOUT,
             )
             logger.info("Oracle Connection Pool başarıyla oluşturuldu.")
         except Exception as e:
@@ -36,12 +52,183 @@ def close_pool():
         except Exception as e:
             logger.error(f"Pool kapatma hatası: {e}")
 
+def init_async_pool():
+    """
+    python-oracledb asyncio havuzunu oluşturur (sadece thin mode destekler).
+    Oluşturulamazsa endpoint'ler senkron havuzu thread fallback ile kullanır.
+    """
+    global _async_pool
+    if _async_pool is None:
+        try:
+            logger.info("Oracle Async Connection Pool oluşturuluyor...")
+            _async_pool = oracledb.create_pool_async(
+                user=settings.ORACLE_USER,
+                password=settings.ORACLE_PASSWORD,
+                dsn=settings.ORACLE_DSN,
+                min=settings.ORACLE_POOL_MIN,
+                max=settings.ORACLE_POOL_MAX,
+                increment=settings.ORACLE_POOL_INCREMENT,
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=settings.ORACLE_POOL_WAIT_TIMEOUT,
+            )
+            logger.info("Oracle Async Connection Pool başarıyla oluşturuldu.")
+        except Exception as e:
+            _async_pool = None
+            logger.warning(f"Async pool oluşturulamadı, thread fallback kullanılacak: {e}")
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool:
+        try:
+            await _async_pool.close()
+            _async_pool = None
+            logger.info("Oracle Async Connection Pool kapatıldı.")
+        except Exception as e:
+            logger.error(f"Async pool kapatma hatası: {e}")
+
+async def run_blocking(func, *args, **kwargs):
+    """Bloklayan bir Oracle çağrısını event loop'u kilitlemeden sınırlı thread havuzunda çalıştırır."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+def _is_write(sql_query: str) -> bool:
+    return sql_query.strip().upper().startswith(WRITE_PREFIXES)
+
+# Sonuç formatları:
+#   rows     -> [{KOLON: değer, ...}, ...]  (varsayılan, geriye uyumlu)
+#   columnar -> {"columns": [...], "data": [[kolon değerleri], ...]}
+#   grafana  -> {"schema": {"fields": [...]}, "data": {"values": [...]}}  (Grafana data frame)
+RESULT_FORMATS = ("rows", "columnar", "grafana")
+
+_NUMBER_TYPES = (
+    oracledb.DB_TYPE_NUMBER,
+    oracledb.DB_TYPE_BINARY_DOUBLE,
+    oracledb.DB_TYPE_BINARY_FLOAT,
+    oracledb.DB_TYPE_BINARY_INTEGER,
+)
+_TIME_TYPES = (
+    oracledb.DB_TYPE_DATE,
+    oracledb.DB_TYPE_TIMESTAMP,
+    oracledb.DB_TYPE_TIMESTAMP_TZ,
+    oracledb.DB_TYPE_TIMESTAMP_LTZ,
+)
+
+def _column_names(description) -> List[str]:
+    return [col[0].upper() for col in description] # Kolon adlarını BÜYÜK harf yap
+
+def _grafana_type(type_code) -> str:
+    if type_code in _NUMBER_TYPES:
+        return "number"
+    if type_code in _TIME_TYPES:
+        return "time"
+    return "string"
+
+def _rows_to_dicts(description, rows) -> List[Dict[str, Any]]:
+    columns = _column_names(description)
+    return [dict(zip(columns, row)) for row in rows]
+
+def _rows_to_columns(description, rows) -> List[List[Any]]:
+    # Satır bazlı tuple listesini kolon bazlı listelere çevirir (satır başına dict yok)
+    if not rows:
+        return [[] for _ in description]
+    return [list(col) for col in zip(*rows)]
+
+_STRING_TYPES = (
+    oracledb.DB_TYPE_VARCHAR,
+    oracledb.DB_TYPE_NVARCHAR,
+    oracledb.DB_TYPE_CHAR,
+    oracledb.DB_TYPE_NCHAR,
+    oracledb.DB_TYPE_LONG,
+    oracledb.DB_TYPE_CLOB,
+    oracledb.DB_TYPE_NCLOB,
+)
+
+def _arrow_type(col) -> Optional[pa.DataType]:
+    # cursor.description öğesi: (ad, tip, display_size, internal_size, precision, scale, null_ok)
+    type_code = col[1]
+    if type_code is oracledb.DB_TYPE_NUMBER:
+        precision, scale = (col[4], col[5]) if len(col) > 5 else (None, None)
+        # NUMBER(p,0) tam sayıdır; ölçeksiz/ondalıklı NUMBER float64 (fetch_df_* ile aynı)
+        if scale == 0 and precision and precision <= 18:
+            return pa.int64()
+        return pa.float64()
+    if type_code in (oracledb.DB_TYPE_BINARY_DOUBLE, oracledb.DB_TYPE_BINARY_FLOAT):
+        return pa.float64()
+    if type_code is oracledb.DB_TYPE_BINARY_INTEGER:
+        return pa.int64()
+    if type_code in _TIME_TYPES:
+        return pa.timestamp("us")
+    if type_code in _STRING_TYPES:
+        return pa.string()
+    if type_code in (oracledb.DB_TYPE_RAW, oracledb.DB_TYPE_LONG_RAW, oracledb.DB_TYPE_BLOB):
+        return pa.binary()
+    return None  # Diğer tipler metne çevrilir
+
+def _arrow_schema(description) -> pa.Schema:
+    """Kolon tipleri sürücü metadata'sından: partiler arası (tümü NULL parti vb.) tip kayması olmaz."""
+    return pa.schema([
+        pa.field(name, _arrow_type(col) or pa.string())
+        for name, col in zip(_column_names(description), description)
+    ])
+
+def _arrow_from_rows(description, rows, schema: Optional[pa.Schema] = None) -> pa.Table:
+    # fetch_df_all olmayan sürücüler için: satırları kolonlara çevirip Arrow tablosu kurar.
+    # Tek tabloda tipler değerlerden çıkarılır; parti parti akışta ortak şema verilir
+    if schema is None:
+        return pa.table(dict(zip(_column_names(description), _rows_to_columns(description, rows))))
+    arrays = []
+    for col, field, values in zip(description, schema, _rows_to_columns(description, rows)):
+        if _arrow_type(col) is None:
+            values = [None if v is None else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def _arrow_from_frame(frame) -> pa.Table:
+    # oracledb DataFrame Arrow PyCapsule arayüzünü destekler; kopya yapılmaz
+    table = pa.table(frame)
+    return table.rename_columns([name.upper() for name in table.column_names])
+
+def shape_columns(columns: List[str], data: List[List[Any]], result_format: str = "rows",
+                  field_types: Optional[List[str]] = None):
+    """Kolon bazlı veriyi (kolon adları + kolon değer listeleri) istenen sonuç formatına çevirir."""
+    if result_format == "columnar":
+        return {"columns": columns, "data": data}
+    if result_format == "grafana":
+        field_types = field_types or ["string"] * len(columns)
+        fields = [{"name": name, "type": t} for name, t in zip(columns, field_types)]
+        return {"schema": {"fields": fields}, "data": {"values": data}}
+    return [dict(zip(columns, row)) for row in zip(*data)]
+
+def shape_result(description, rows, result_format: str = "rows"):
+    if result_format == "rows":
+        return _rows_to_dicts(description, rows)
+    return shape_columns(
+        _column_names(description),
+        _rows_to_columns(description, rows),
+        result_format,
+        [_grafana_type(col[1]) for col in description],
+    )
+
 class OracleService(QueryExecutor, SchemaProvider):
-    def __init__(self):
+    """
+    Lazy bağlantı tutamacı: havuzdan bağlantı ilk execute_query çağrısında alınır.
+    Böylece cache hit olan isteklerde havuzdaki slotlara hiç dokunulmaz.
+
+    result_format okuma sorgularının dönüş şeklini belirler (bkz. RESULT_FORMATS);
+    execute_query çağrısında verilen result_format bunu ezer.
+    """
+
+    def __init__(self, result_format: str = "rows"):
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Geçersiz sonuç formatı: {result_format}")
+        self.result_format = result_format
         self.connection = None
+        self.async_connection = None
 
     def connect(self) -> None:
         global _pool
+        if self.connection is not None:
+            return
         if _pool is None:
             init_pool()
         try:
@@ -50,23 +237,84 @@ class OracleService(QueryExecutor, SchemaProvider):
             logger.error(f"Pool hatası: {e}")
             raise e
 
-    def execute_query(self, sql_query: str, params: Optional[Dict[str, Any]] = None):
+    def execute_query(self, sql_query: str, params: Optional[Dict[str, Any]] = None,
+                      result_format: Optional[str] = None):
         if not self.connection:
-            raise Exception("Bağlantı yok!")
+            self.connect()
         cursor = self.connection.cursor()
         try:
             if params is None: params = {}
             cursor.execute(sql_query, params)
             
             # Yazma işlemleri için commit (Genelde SELECT kullanacağız ama dursun)
-            if sql_query.strip().upper().startswith(("INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER")):
+            if _is_write(sql_query):
                 self.connection.commit()
                 return {"status": "success", "rows": cursor.rowcount}
 
             # Okuma işlemleri için sonuç döndür
             if cursor.description:
-                columns = [col[0].upper() for col in cursor.description] # Kolon adlarını BÜYÜK harf yap
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return shape_result(cursor.description, cursor.fetchall(), result_format or self.result_format)
+            return {"status": "success"}
+        except oracledb.Error as e:
+            logger.error(f"SQL Hatası: {e}")
+            return {"error": str(e)}
+        finally:
+            cursor.close()
+
+    def fetch_arrow(self, sql_query: str, params: Optional[Dict[str, Any]] = None):
+        """
+        Okuma sorgusunu satır başına Python nesnesi üretmeden Arrow tablosu olarak
+        döndürür (oracledb fetch_df_all). Hata durumunda {"error": ...} döner.
+        """
+        if not self.connection:
+            self.connect()
+        if params is None: params = {}
+        try:
+            if hasattr(self.connection, "fetch_df_all"):
+                return _arrow_from_frame(self.connection.fetch_df_all(
+                    sql_query, params, arraysize=settings.ORACLE_STREAM_ARRAYSIZE,
+                ))
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(sql_query, params)
+                return _arrow_from_rows(cursor.description, cursor.fetchall())
+            finally:
+                cursor.close()
+        except oracledb.Error as e:
+            logger.error(f"SQL Hatası: {e}")
+            return {"error": str(e)}
+
+    # --- ASYNC YOL (Dashboard endpoint'leri) ---
+
+    async def connect_async(self) -> None:
+        if self.async_connection is not None or self.connection is not None:
+            return
+        if _async_pool is None:
+            # Async sürücü yok: senkron bağlantıyı thread havuzunda al
+            await run_blocking(self.connect)
+            return
+        try:
+            self.async_connection = await _async_pool.acquire()
+        except Exception as e:
+            logger.error(f"Async pool hatası: {e}")
+            raise e
+
+    async def execute_query_async(self, sql_query: str, params: Optional[Dict[str, Any]] = None,
+                                  result_format: Optional[str] = None):
+        await self.connect_async()
+        if self.async_connection is None:
+            return await run_blocking(self.execute_query, sql_query, params, result_format)
+        cursor = self.async_connection.cursor()
+        try:
+            if params is None: params = {}
+            await cursor.execute(sql_query, params)
+
+            if _is_write(sql_query):
+                await self.async_connection.commit()
+                return {"status": "success", "rows": cursor.rowcount}
+
+            if cursor.description:
+                return shape_result(cursor.description, await cursor.fetchall(), result_format or self.result_format)
             return {"status": "success"}
         except oracledb.Error as e:
             logger.error(f"SQL Hatası: {e}")
@@ -74,6 +322,103 @@ class OracleService(QueryExecutor, SchemaProvider):
         finally:
             cursor.close()
 
+    async def iter_query_async(self, sql_query: str, params: Optional[Dict[str, Any]] = None,
+                               arraysize: Optional[int] = None) -> AsyncIterator[Tuple[List[str], List[tuple]]]:
+        """
+        Okuma sorgusunu fetchmany ile arraysize'lık partiler halinde üretir:
+        her parti (kolonlar, satırlar). Tüm sonuç belleğe alınmaz; boş sonuçta
+        kolon başlıkları için tek bir boş parti döner.
+        """
+        async for description, rows in self._iter_rows_async(sql_query, params, arraysize):
+            yield _column_names(description), rows
+
+    async def _iter_rows_async(self, sql_query: str, params: Optional[Dict[str, Any]] = None,
+                               arraysize: Optional[int] = None) -> AsyncIterator[Tuple[Any, List[tuple]]]:
+        # iter_query_async ile aynı; kolon adları yerine cursor.description verir
+        arraysize = arraysize or settings.ORACLE_STREAM_ARRAYSIZE
+        if params is None: params = {}
+        await self.connect_async()
+        if self.async_connection is not None:
+            cursor = self.async_connection.cursor()
+        else:
+            cursor = self.connection.cursor()
+        cursor.arraysize = arraysize
+        cursor.prefetchrows = settings.ORACLE_STREAM_PREFETCHROWS
+        try:
+            if self.async_connection is not None:
+                await cursor.execute(sql_query, params)
+            else:
+                await run_blocking(cursor.execute, sql_query, params)
+            if not cursor.description:
+                return
+            description = cursor.description
+            first = True
+            while True:
+                if self.async_connection is not None:
+                    rows = await cursor.fetchmany()
+                else:
+                    rows = await run_blocking(cursor.fetchmany)
+                if not rows and not first:
+                    break
+                first = False
+                yield description, rows
+                if not rows:
+                    break
+        finally:
+            cursor.close()
+
+    async def fetch_arrow_async(self, sql_query: str, params: Optional[Dict[str, Any]] = None):
+        await self.connect_async()
+        if self.async_connection is None:
+            return await run_blocking(self.fetch_arrow, sql_query, params)
+        if params is None: params = {}
+        try:
+            if hasattr(self.async_connection, "fetch_df_all"):
+                return _arrow_from_frame(await self.async_connection.fetch_df_all(
+                    sql_query, params, arraysize=settings.ORACLE_STREAM_ARRAYSIZE,
+                ))
+            cursor = self.async_connection.cursor()
+            try:
+                await cursor.execute(sql_query, params)
+                return _arrow_from_rows(cursor.description, await cursor.fetchall())
+            finally:
+                cursor.close()
+        except oracledb.Error as e:
+            logger.error(f"SQL Hatası: {e}")
+            return {"error": str(e)}
+
+    async def iter_arrow_async(self, sql_query: str, params: Optional[Dict[str, Any]] = None,
+                               size: Optional[int] = None) -> AsyncIterator[pa.Table]:
+        """
+        Sonucu size satırlık Arrow partileri halinde üretir (oracledb fetch_df_batches).
+        Boş sonuçta da şemayı taşıyan tek bir boş tablo döner.
+        """
+        size = size or settings.ORACLE_STREAM_ARRAYSIZE
+        if params is None: params = {}
+        await self.connect_async()
+        if self.async_connection is not None and hasattr(self.async_connection, "fetch_df_batches"):
+            produced = False
+            async for frame in self.async_connection.fetch_df_batches(sql_query, params, size=size):
+                produced = True
+                yield _arrow_from_frame(frame)
+            if produced:
+                return
+            # Parti gelmedi (boş sonuç): şema satır yolundaki cursor.description'dan kurulur
+        # fetch_df_batches yoksa satır partilerinden Arrow tablosu kurulur; her parti
+        # aynı (description'dan) şemayı kullanır
+        schema = None
+        async for description, rows in self._iter_rows_async(sql_query, params, arraysize=size):
+            schema = schema or _arrow_schema(description)
+            yield _arrow_from_rows(description, rows, schema)
+
+    async def close_async(self) -> None:
+        if self.async_connection:
+            try:
+                await self.async_connection.close() # Havuza iade
+            except Exception: pass
+            self.async_connection = None
+        self.close()
+
     def get_schema_info(self) -> str:
         """
         MANUEL ŞEMA TANIMI:
@@ -0,0 +1,82 @@
+import csv
+import io
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from core.responses import dumps
+from services.oracle import OracleService
+
+logger = logging.getLogger(__name__)
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Akış yarıda kesilirse CSV'nin son satırının ilk hücresi
+CSV_ERROR_MARKER = "#ERROR"
+
+Batch = Tuple[List[str], List[tuple]]
+
+
+async def _owned_batches(sql: str, params: Optional[Dict[str, Any]]) -> AsyncIterator[Batch]:
+    # StreamingResponse, Depends ile gelen servislerin kapanmasından sonra akar;
+    # bu yüzden akış kendi bağlantısını alır ve bitince havuza iade eder.
+    oracle = OracleService()
+    try:
+        async for batch in oracle.iter_query_async(sql, params):
+            yield batch
+    finally:
+        await oracle.close_async()
+
+
+async def _ndjson(batches: AsyncIterator[Batch]) -> AsyncIterator[bytes]:
+    try:
+        async for columns, rows in batches:
+            if rows:
+                yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    except Exception as e:
+        # Başlıklar gönderildiği için status değiştirilemez; hata son satır olarak yazılır
+        logger.error(f"NDJSON stream hatası: {e}")
+        yield dumps({"error": str(e)}) + b"\n"
+
+
+async def _csv(batches: AsyncIterator[Batch]) -> AsyncIterator[str]:
+    header_written = False
+    try:
+        async for columns, rows in batches:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not header_written:
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows(rows)
+            yield buffer.getvalue()
+    except Exception as e:
+        # NDJSON'daki gibi: yarım kalan dosya başarılı sanılmasın, son satıra hata işareti yazılır
+        logger.error(f"CSV stream hatası: {e}")
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow([CSV_ERROR_MARKER, str(e)])
+        yield buffer.getvalue()
+
+
+def stream_query(sql: str, fmt: str = "ndjson", params: Optional[Dict[str, Any]] = None,
+                 filename: Optional[str] = None) -> StreamingResponse:
+    """
+    Sorgu sonucunu NDJSON veya CSV olarak parça parça gönderir. Satırlar
+    fetchmany partileriyle okunduğu için bellek kullanımı satır sayısından
+    bağımsızdır ve ilk baytlar ilk parti gelir gelmez istemciye ulaşır.
+    Cache'lenmez; büyük export'lar için kullanılır.
+    """
+    encoder = _csv if fmt == "csv" else _ndjson
+    headers = {}
+    if filename:
+        extension = "csv" if fmt == "csv" else "ndjson"
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return StreamingResponse(
+        encoder(_owned_batches(sql, params)),
+        media_type=STREAM_MEDIA_TYPES.get(fmt, STREAM_MEDIA_TYPES["ndjson"]),
+        headers=headers,
+    )
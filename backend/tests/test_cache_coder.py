@@ -0,0 +1,31 @@
+import datetime
+from decimal import Decimal
+
+from fastapi_cache.coder import JsonCoder
+
+from core.config import settings
+from services.cache.coder import MsgpackCoder, get_coder_class
+
+
+def test_oracle_types_round_trip():
+    value = {
+        "rows": [{"ID": 1, "MAAS": Decimal("1234.50"), "TARIH": datetime.date(2024, 5, 1)}],
+        "updated_at": datetime.datetime(2024, 5, 1, 8, 30),
+    }
+    assert MsgpackCoder.decode(MsgpackCoder.encode(value)) == value
+
+
+def test_large_entries_are_compressed():
+    value = [{"SEHIR": "ANKARA", "SAYI": i} for i in range(settings.CACHE_COMPRESS_THRESHOLD)]
+    encoded = MsgpackCoder.encode(value)
+    assert encoded[:1] == b"\x01"
+    assert MsgpackCoder.decode(encoded) == value
+
+
+def test_legacy_json_entries_are_readable():
+    assert MsgpackCoder.decode(JsonCoder.encode([{"A": 1}])) == [{"A": 1}]
+
+
+def test_get_coder_class():
+    assert get_coder_class("JSON") is JsonCoder
+    assert get_coder_class("bilinmeyen") is MsgpackCoder
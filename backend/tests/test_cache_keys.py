@@ -0,0 +1,48 @@
+from starlette.requests import Request
+
+from core.config import settings
+from services.cache.keys import gateway_key_builder
+
+
+def _request(path, query="", accept="application/json"):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(b"accept", accept.encode())],
+    })
+
+
+def _key(request):
+    return gateway_key_builder(lambda: None, "gateway", request=request)
+
+
+def test_query_order_does_not_change_key():
+    assert _key(_request("/dataset/kpi", "sehir=ANKARA&yil=2024")) == _key(
+        _request("/dataset/kpi", "yil=2024&sehir=ANKARA")
+    )
+    assert _key(_request("/dataset/kpi", "sehir=ANKARA")) == (
+        f"gateway:v{settings.CACHE_SCHEMA_VERSION}:/dataset/kpi?sehir=ANKARA"
+    )
+
+
+def test_delta_from_is_excluded():
+    assert _key(_request("/dataset/kpi", "sehir=ANKARA&delta_from=abc")) == _key(
+        _request("/dataset/kpi", "sehir=ANKARA")
+    )
+
+
+def test_binary_format_gets_own_key():
+    plain = _key(_request("/dataset/kpi"))
+    arrow = _key(_request("/dataset/kpi", accept="application/vnd.apache.arrow.stream"))
+    assert arrow != plain
+    assert arrow.endswith("|arrow")
+
+
+def test_direct_call_skips_injected_arguments():
+    def report(sehir, oracle):
+        pass
+
+    key = gateway_key_builder(report, "gateway", kwargs={"sehir": "ANKARA", "oracle": object()})
+    assert key.endswith(f"{report.__module__}.report?sehir=ANKARA")
@@ -0,0 +1,26 @@
+from services.llm.result_cache import canonical_sql, is_read_only, sql_fingerprint
+
+
+def test_in_lists_are_sorted():
+    assert canonical_sql("SELECT * FROM T WHERE SEHIR IN ('IZMIR', 'ANKARA')") == canonical_sql(
+        "select * from t where sehir in ('ANKARA','IZMIR');"
+    )
+    assert canonical_sql("SELECT 1 FROM T WHERE ID IN (3, 1, 2)") == "SELECT 1 FROM T WHERE ID IN ( 1 , 2 , 3 )"
+
+
+def test_literals_keep_their_case():
+    assert sql_fingerprint("SELECT * FROM T WHERE SEHIR = 'Ankara'") != sql_fingerprint(
+        "SELECT * FROM T WHERE SEHIR = 'ANKARA'"
+    )
+
+
+def test_subquery_in_list_is_left_alone():
+    sql = "SELECT * FROM T WHERE ID IN (SELECT ID FROM U)"
+    assert canonical_sql(sql) == "SELECT * FROM T WHERE ID IN ( SELECT ID FROM U )"
+
+
+def test_is_read_only():
+    assert is_read_only("  select count(*) from t")
+    assert is_read_only("WITH x AS (SELECT 1 FROM DUAL) SELECT * FROM x")
+    assert not is_read_only("UPDATE T SET A = 1")
+    assert not is_read_only("delete from t")
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from services.cache.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def main():
+        results = await asyncio.gather(*(flights.do("k", compute) for _ in range(5)))
+        assert not flights.in_flight("k")
+        return results
+
+    assert asyncio.run(main()) == [1] * 5
+    assert calls == 1
+
+
+def test_error_reaches_every_waiter_and_is_not_kept():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("ORA-12541")
+
+    async def main():
+        results = await asyncio.gather(flights.do("k", fail), flights.do("k", fail), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # Hata sonrası anahtar serbest: sonraki çağrı yeniden çalışır
+        with pytest.raises(RuntimeError):
+            await flights.do("k", fail)
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    flights = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def main():
+        first = asyncio.ensure_future(flights.do("k", compute))
+        second = asyncio.ensure_future(flights.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "ok"
@@ -0,0 +1,18 @@
+from services.llm.sql_cache import SQLCache, normalize_question
+
+SCHEMA = "PERSONEL_ORG_AGACI_MV (CALISAN_ID, SEHIR, CINSIYET)"
+
+
+def test_filler_words_are_ignored():
+    assert normalize_question("Lütfen Ankara'daki çalışan sayısı nedir?") == normalize_question(
+        "ankara daki çalışan sayısı"
+    )
+
+
+def test_conjunctions_keep_questions_apart():
+    assert normalize_question("Ankara veya İzmir çalışan sayısı") != normalize_question("Ankara İzmir çalışan sayısı")
+
+    cache = SQLCache(max_entries=10, ttl=0, similarity=0)
+    cache.store("Ankara veya İzmir çalışan sayısı", SCHEMA, "SELECT 1")
+    assert cache.lookup("Ankara İzmir çalışan sayısı", SCHEMA) is None
+    assert cache.lookup("ankara veya izmir çalışan sayısı?", SCHEMA) == "SELECT 1"